@@ -0,0 +1,41 @@
+# Generated by Django 5.2.2 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+from unified_requests.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('complaints', '0002_remove_complaint_latitude_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'updated_at'], name='complaint_status_upd_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(fields=['assigned_to', '-submitted_at'], name='complaint_assignee_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(fields=['submitted_by', '-submitted_at'], name='complaint_submitter_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'resolved_at'], name='complaint_status_res_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['updated_at'], name='complaint_open_upd_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['assigned_to', '-submitted_at'], name='complaint_open_asg_idx'),
+        ),
+    ]
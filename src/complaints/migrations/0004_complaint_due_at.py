@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-17 00:20
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+
+from unified_requests.operations import AddIndexConcurrentlyOnPostgres
+
+
+def set_default_due_at(apps, schema_editor):
+    # No SLA policy exists yet, so every request gets the default; recompute_sla_due_dates applies new policies
+    Complaint = apps.get_model('complaints', 'Complaint')
+    hours = getattr(settings, 'REQUEST_SLA_DEFAULT_HOURS', 48)
+    Complaint.objects.update(due_at=models.F('submitted_at') + datetime.timedelta(hours=hours))
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('complaints', '0003_complaint_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='due_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the request becomes overdue, set from its SLA policy on save.', null=True),
+        ),
+        migrations.RunPython(set_default_due_at, migrations.RunPython.noop),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['due_at'], name='complaint_open_due_idx'),
+        ),
+    ]
@@ -2,7 +2,7 @@
 from django.db import models
 from django.conf import settings
 from django.urls import reverse
-from unified_requests.constants import STATUS_CHOICES 
+from unified_requests.constants import STATUS_CHOICES, OPEN_REQUEST_CONDITION 
 
 class ComplaintCategory(models.Model):
     """
@@ -129,6 +129,12 @@ class Complaint(models.Model):
 
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    due_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the request becomes overdue, set from its SLA policy on save."
+    )
 
     request_type_slug = models.CharField(max_length=50, default='complaint', editable=False)
 
@@ -142,6 +148,21 @@ class Complaint(models.Model):
         verbose_name = "Complaint"
         verbose_name_plural = "Complaints"
         ordering = ['-submitted_at'] # Order newest first
+        indexes = [
+            # Status filters by last update
+            models.Index(fields=['status', 'updated_at'], name='complaint_status_upd_idx'),
+            # Staff dashboard: requests assigned to someone, newest first
+            models.Index(fields=['assigned_to', '-submitted_at'], name='complaint_assignee_idx'),
+            # User dashboard: a submitter's requests, newest first
+            models.Index(fields=['submitted_by', '-submitted_at'], name='complaint_submitter_idx'),
+            # Statistics: resolved requests by resolution date
+            models.Index(fields=['status', 'resolved_at'], name='complaint_status_res_idx'),
+            # Partial indexes over the open requests only (new, in progress), a small share of each table
+            models.Index(fields=['updated_at'], name='complaint_open_upd_idx', condition=OPEN_REQUEST_CONDITION),
+            models.Index(fields=['assigned_to', '-submitted_at'], name='complaint_open_asg_idx', condition=OPEN_REQUEST_CONDITION),
+            # Overdue scan (check_overdue_requests) and the time remaining sort of the staff list
+            models.Index(fields=['due_at'], name='complaint_open_due_idx', condition=OPEN_REQUEST_CONDITION),
+        ]
 
     def __str__(self):
         return f"Complaint #{self.id}: {self.subject} ({self.get_status_display()})"
@@ -4,23 +4,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+# Initialize Django before importing code that uses models (consumers, auth middleware)
+django_asgi_app = get_asgi_application()
 
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
 
-# --- IMPORTANT: If you *later* add Django Channels ---
-# You would modify this file to include ProtocolTypeRouter, URLRouter, etc.
-# For example, if you had an 'abode' app with a 'routing.py' for WebSockets:
-#
-# from channels.auth import AuthMiddlewareStack
-# from channels.routing import ProtocolTypeRouter, URLRouter
-# from channels.security.websocket import AllowedHostsOriginValidator
-# import abode.routing # Assuming your app 'abode' has a routing.py
-#
-# application = ProtocolTypeRouter(
-#     {
-#         "http": get_asgi_application(),
-#         "websocket": AllowedHostsOriginValidator(
-#             AuthMiddlewareStack(URLRouter(abode.routing.websocket_urlpatterns))
-#         ),
-#     }
-# )
\ No newline at end of file
+import support_dashboard.routing
+
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        # Live support dashboard updates (see support_dashboard/consumers.py)
+        "websocket": AllowedHostsOriginValidator(
+            AuthMiddlewareStack(URLRouter(support_dashboard.routing.websocket_urlpatterns))
+        ),
+    }
+)
@@ -156,6 +156,19 @@ ADMIN_EMAIL_FOR_NOTIFICATIONS = 'SFRP_Admi@tup.sfrp.edu.ph'
 ADMINS = [('SFRP Admin', 'sfrpAdmin@tup.sfrp.edu.ph')]
 PROJECT_NAME = "SFRP-TUP HelpLine"
 NOTIFICATIONS_SEND_EMAILS = config('NOTIFICATIONS_SEND_EMAILS', default=True, cast=bool)
+# Notification emails are written to the notifications outbox and sent by the flush_email_outbox task,
+# up to BATCH_SIZE per SMTP connection, FLUSH_DELAY seconds after the first queued email (so bursts share a batch).
+# Failed sends are retried with exponential backoff, MAX_ATTEMPTS times in total.
+NOTIFICATIONS_OUTBOX_BATCH_SIZE = config('NOTIFICATIONS_OUTBOX_BATCH_SIZE', default=100, cast=int)
+NOTIFICATIONS_OUTBOX_FLUSH_DELAY = config('NOTIFICATIONS_OUTBOX_FLUSH_DELAY', default=5, cast=int)
+NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS = config('NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+# Overdue requests are emailed as one digest per assignee and run; unassigned ones go to the triage list.
+# With NOTIFICATIONS_OVERDUE_DIGEST off, every staff member gets one email per overdue request instead.
+NOTIFICATIONS_OVERDUE_DIGEST = config('NOTIFICATIONS_OVERDUE_DIGEST', default=True, cast=bool)
+NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS = config('NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS', default=ADMIN_EMAIL_FOR_NOTIFICATIONS, cast=Csv())
+# Status changes of a request within this many seconds of its first change are emailed to the submitter as one
+# notification of the net change (none if the request is back at its starting status).
+NOTIFICATIONS_STATUS_COALESCE_SECONDS = config('NOTIFICATIONS_STATUS_COALESCE_SECONDS', default=60, cast=int)
 
 CELERY_BROKER_URL = config('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND')
@@ -165,6 +178,74 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Riyadh'
 CELERY_ENABLE_UTC = True
 # The CELERY_BEAT_SCHEDULE is managed dynamically by django-celery-beat in the admin panel.
+# The entries below are added to it when beat starts: tasks that must run even if nobody schedules them.
+CELERY_BEAT_SCHEDULE = {
+    # Keeps the RequestDailyStat rollup behind the dashboard trend chart current
+    'update-request-daily-stats': {
+        'task': 'support_dashboard.tasks.update_request_daily_stats',
+        'schedule': 600.0,
+    },
+    # Sends emails whose retry backoff expired, and any whose on-commit flush wasn't queued
+    'flush-email-outbox': {
+        'task': 'notifications.tasks.flush_email_outbox',
+        'schedule': 60.0,
+    },
+    # Sends coalesced status notifications whose window closed, should their on-commit run not be queued
+    'flush-status-notifications': {
+        'task': 'notifications.tasks.flush_status_notifications',
+        'schedule': 60.0,
+    },
+}
+
+# --- SUPPORT DASHBOARD
+# Assign new submissions to the eligible staff member with the fewest open requests of that type.
+# Eligibility is set per staff member and request type on the Staff Workloads admin page.
+SUPPORT_DASHBOARD_AUTO_ASSIGN = config('SUPPORT_DASHBOARD_AUTO_ASSIGN', default=False, cast=bool)
+
+# --- REQUEST ARCHIVE
+# Resolved, closed and rejected requests not updated for this many days are moved to the archive tables
+# by the archive_finished_requests task / archive_requests command.
+REQUEST_ARCHIVE_AFTER_DAYS = config('REQUEST_ARCHIVE_AFTER_DAYS', default=365, cast=int)
+
+# --- REQUEST SLA
+# Hours from submission until a request is overdue when no SLA policy (admin) matches its type, priority and category.
+REQUEST_SLA_DEFAULT_HOURS = config('REQUEST_SLA_DEFAULT_HOURS', default=48, cast=int)
+
+# --- CACHE
+# Local memory by default. Set CACHE_REDIS_URL (e.g. redis://localhost:6379/1) to share the cache
+# between worker processes, so the support dashboard cache invalidation reaches all of them.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# --- CHANNELS (live support dashboard updates)
+# In-memory layer for a single process (development, tests). Set CHANNEL_REDIS_URL
+# (e.g. redis://localhost:6379/2) when several ASGI processes serve the dashboard.
+CHANNEL_REDIS_URL = config('CHANNEL_REDIS_URL', default='')
+if CHANNEL_REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [CHANNEL_REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
 
 # --- SESSION HANDLING/SETTINGS
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
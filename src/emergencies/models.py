@@ -2,7 +2,7 @@
 from django.db import models
 from django.conf import settings
 from abode.models import TimeStampModel
-from unified_requests.constants import STATUS_CHOICES
+from unified_requests.constants import STATUS_CHOICES, OPEN_REQUEST_CONDITION
 
 class EmergencyType(models.Model):
     """
@@ -99,6 +99,12 @@ class EmergencyReport(models.Model):
 
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    due_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the request becomes overdue, set from its SLA policy on save."
+    )
 
     request_type_slug = models.CharField(max_length=50, default='emergency', editable=False)
 
@@ -111,6 +117,21 @@ class EmergencyReport(models.Model):
         verbose_name = "Emergency Report"
         verbose_name_plural = "Emergency Reports"
         ordering = ['-submitted_at']
+        indexes = [
+            # Status filters by last update
+            models.Index(fields=['status', 'updated_at'], name='emergency_status_upd_idx'),
+            # Staff dashboard: requests assigned to someone, newest first
+            models.Index(fields=['assigned_to', '-submitted_at'], name='emergency_assignee_idx'),
+            # User dashboard: a submitter's requests, newest first
+            models.Index(fields=['submitted_by', '-submitted_at'], name='emergency_submitter_idx'),
+            # Statistics: resolved requests by resolution date
+            models.Index(fields=['status', 'resolved_at'], name='emergency_status_res_idx'),
+            # Partial indexes over the open requests only (new, in progress), a small share of each table
+            models.Index(fields=['updated_at'], name='emergency_open_upd_idx', condition=OPEN_REQUEST_CONDITION),
+            models.Index(fields=['assigned_to', '-submitted_at'], name='emergency_open_asg_idx', condition=OPEN_REQUEST_CONDITION),
+            # Overdue scan (check_overdue_requests) and the time remaining sort of the staff list
+            models.Index(fields=['due_at'], name='emergency_open_due_idx', condition=OPEN_REQUEST_CONDITION),
+        ]
 
     def __str__(self):
         return f"Emergency #{self.id}: {self.emergency_type.name} at {self.location}"
@@ -1,3 +1,20 @@
 from django.contrib import admin
+from django.utils import timezone
 
-# Register your models here.
+from .models import OutboxEmail
+from .outbox import schedule_outbox_flush
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'created_at', 'sent_at', 'next_attempt_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
+    actions = ['retry_now']
+
+    @admin.action(description="Retry the selected emails now")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        schedule_outbox_flush()
+        self.message_user(request, f"{updated} email(s) queued for sending.")
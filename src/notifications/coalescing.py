@@ -0,0 +1,136 @@
+# notifications/coalescing.py
+import datetime
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from unified_requests.indexing import INDEXED_REQUEST_MODELS
+
+from .models import PendingStatusNotification
+from .utils import send_request_status_update_email
+
+# Set while a flush_status_notifications run is queued, so a burst of changes queues a single run
+STATUS_FLUSH_QUEUED_KEY = 'notifications:status_flush_queued'
+
+
+def get_coalesce_window():
+    return datetime.timedelta(seconds=getattr(settings, 'NOTIFICATIONS_STATUS_COALESCE_SECONDS', 60))
+
+
+def queue_status_notifications(status_changes):
+    """
+    Records status changes ([request_type, pk, old_status, new_status] items, support dashboard request types)
+    instead of emailing the submitter right away. Changes of a request within its coalescing window are
+    merged into one pending row, from the status before the first change to the latest one; the email
+    goes out once NOTIFICATIONS_STATUS_COALESCE_SECONDS have passed since the first change.
+    Call it in the transaction that saves the changes.
+    """
+    if not status_changes:
+        return
+    # Net change and number of changes per request, in the order the changes were made
+    net_changes = {}
+    for request_type, pk, old_status, new_status in status_changes:
+        from_status, _, change_count = net_changes.get((request_type, pk), (old_status, None, 0))
+        net_changes[(request_type, pk)] = (from_status, new_status, change_count + 1)
+
+    with transaction.atomic():
+        pending_rows = {}
+        for request_type in {request_type for request_type, _ in net_changes}:
+            pks = [pk for key_type, pk in net_changes if key_type == request_type]
+            for pending in PendingStatusNotification.objects.filter(
+                request_type=request_type, request_id__in=pks,
+            ).select_for_update():
+                pending_rows[(request_type, pending.request_id)] = pending
+
+        now = timezone.now()
+        new_rows = []
+        changed_rows = []
+        for (request_type, pk), (from_status, to_status, change_count) in net_changes.items():
+            pending = pending_rows.get((request_type, pk))
+            if pending is None:
+                new_rows.append(PendingStatusNotification(
+                    request_type=request_type, request_id=pk, from_status=from_status, to_status=to_status,
+                    change_count=change_count, first_changed_at=now, send_after=now + get_coalesce_window(),
+                ))
+            else:
+                # The window keeps its start, so a request changed all day is still notified once per window
+                pending.to_status = to_status
+                pending.change_count = F('change_count') + change_count
+                changed_rows.append(pending)
+
+        # A concurrent first change of the same request may insert its row meanwhile (there was nothing to lock);
+        # that row then keeps its window and takes the latest status
+        if connection.features.supports_update_conflicts_with_target:
+            conflict_options = {'unique_fields': ['request_type', 'request_id']}
+        else:
+            conflict_options = {}
+        PendingStatusNotification.objects.bulk_create(
+            new_rows, batch_size=500, update_conflicts=True, update_fields=['to_status'], **conflict_options,
+        )
+        PendingStatusNotification.objects.bulk_update(changed_rows, ['to_status', 'change_count'], batch_size=500)
+        transaction.on_commit(schedule_status_flush)
+
+
+def queue_status_notification(request_type, pk, old_status, new_status):
+    queue_status_notifications([[request_type, pk, old_status, new_status]])
+
+
+def schedule_status_flush(countdown=None):
+    """
+    Queues a flush_status_notifications run when the coalescing window of the latest changes closes,
+    unless one is already queued. The queued flag only dedupes within one cache: with the local memory
+    default, a worker can't clear the flag a web process set, so the periodic flush_status_notifications
+    run (CELERY_BEAT_SCHEDULE) sends what is missed.
+    """
+    from .tasks import flush_status_notifications
+
+    if countdown is None:
+        countdown = get_coalesce_window().total_seconds()
+    countdown = max(int(countdown), 0)
+    # Expires on its own if the run never happens, so pending notifications can't get stuck
+    if cache.add(STATUS_FLUSH_QUEUED_KEY, True, timeout=countdown + 60):
+        flush_status_notifications.apply_async(countdown=countdown)
+
+
+def send_due_status_notifications():
+    """
+    Emails the net status change of every request whose coalescing window closed, and queues the next run
+    for the rows still waiting. Requests back at their starting status, and requests that no longer exist,
+    are dropped without an email. Returns the number of sent notifications.
+    """
+    cache.delete(STATUS_FLUSH_QUEUED_KEY)
+    sent = 0
+    with transaction.atomic():
+        due_rows = list(
+            PendingStatusNotification.objects
+            .filter(send_after__lte=timezone.now())
+            .select_for_update(skip_locked=True)
+        )
+        pks_by_type = {}
+        for pending in due_rows:
+            if pending.from_status != pending.to_status:
+                pks_by_type.setdefault(pending.request_type, set()).add(pending.request_id)
+
+        requests_by_key = {}
+        for request_type, pks in pks_by_type.items():
+            Model, _ = INDEXED_REQUEST_MODELS[request_type]
+            for req in Model.objects.filter(pk__in=pks).select_related('submitted_by'):
+                req.request_type_slug = request_type # Slug used by the support dashboard URLs in the emails
+                requests_by_key[(request_type, req.pk)] = req
+
+        for pending in due_rows:
+            req = requests_by_key.get((pending.request_type, pending.request_id))
+            if req is not None:
+                # Written to the email outbox in this transaction
+                send_request_status_update_email(req, pending.from_status, pending.to_status)
+                sent += 1
+        PendingStatusNotification.objects.filter(pk__in=[pending.pk for pending in due_rows]).delete()
+
+    next_send_after = PendingStatusNotification.objects.aggregate(next_send_after=Min('send_after'))['next_send_after']
+    if next_send_after is not None:
+        transaction.on_commit(partial(schedule_status_flush, (next_send_after - timezone.now()).total_seconds()))
+    return sent
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.2 on 2026-10-17 02:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingStatusNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(max_length=20)),
+                ('request_id', models.IntegerField()),
+                ('from_status', models.CharField(max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('change_count', models.PositiveIntegerField(default=1)),
+                ('first_changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('send_after', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('request_type', 'request_id'), name='unique_pending_status_notification')],
+                'indexes': [models.Index(fields=['send_after'], name='pending_status_send_idx')],
+            },
+        ),
+    ]
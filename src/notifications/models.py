@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 # Model to keep track of overdue notifications sent to prevent spamming
@@ -14,3 +15,61 @@ class OverdueNotificationLog(models.Model):
 
     def __str__(self):
         return f"Overdue notification for {self.request_type} #{self.request_id} at {self.notified_at}"
+
+
+OUTBOX_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('sent', 'Sent'),
+    ('failed', 'Failed'),
+]
+
+
+# Email written in the transaction of the change it notifies about and sent later by the outbox flusher
+class OutboxEmail(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True, default='')
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list) # List of recipient addresses
+    status = models.CharField(max_length=10, choices=OUTBOX_STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+        ordering = ['-created_at']
+        indexes = [
+            # Flusher: pending emails due for a (re)try, oldest first
+            models.Index(
+                fields=['next_attempt_at', 'id'], name='outbox_pending_idx', condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.get_status_display()})"
+
+
+# Status change of a request waiting for its coalescing window to close (see notifications.coalescing)
+class PendingStatusNotification(models.Model):
+    request_type = models.CharField(max_length=20) # Support dashboard request type, e.g. 'complaint', 'service'
+    request_id = models.IntegerField()
+    from_status = models.CharField(max_length=20) # Status before the first change of the window
+    to_status = models.CharField(max_length=20) # Status after the latest change
+    change_count = models.PositiveIntegerField(default=1)
+    first_changed_at = models.DateTimeField(default=timezone.now)
+    send_after = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['request_type', 'request_id'], name='unique_pending_status_notification'),
+        ]
+        indexes = [
+            models.Index(fields=['send_after'], name='pending_status_send_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.request_type} #{self.request_id}: {self.from_status} -> {self.to_status} ({self.change_count} changes)"
@@ -0,0 +1,138 @@
+# notifications/outbox.py
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# Set while a flush_email_outbox run is queued, so a burst of emails queues a single run
+OUTBOX_FLUSH_QUEUED_KEY = 'notifications:outbox_flush_queued'
+
+# First retry delay, doubled after each failed attempt
+OUTBOX_RETRY_BASE_SECONDS = 60
+
+
+def queue_email(subject, body, to, html_body='', from_email=None):
+    """
+    Writes an email to the outbox in the current transaction; it is only sent if the transaction commits.
+    A flush of the outbox is queued on commit.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject[:255],
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+    transaction.on_commit(schedule_outbox_flush)
+    return email
+
+
+def queue_email_message(message):
+    """
+    Writes an EmailMultiAlternatives (or EmailMessage) to the outbox instead of sending it.
+    """
+    html_body = next(
+        (content for content, mimetype in getattr(message, 'alternatives', []) if mimetype == 'text/html'), '',
+    )
+    return queue_email(message.subject, message.body, message.to, html_body=html_body, from_email=message.from_email)
+
+
+def schedule_outbox_flush():
+    """
+    Queues a flush_email_outbox run NOTIFICATIONS_OUTBOX_FLUSH_DELAY seconds from now, unless one is already queued.
+    The queued flag only dedupes within one cache: with the local memory default, a worker can't clear the flag
+    a web process set, so the periodic flush_email_outbox run (CELERY_BEAT_SCHEDULE) sends what is missed.
+    """
+    from .tasks import flush_email_outbox
+
+    delay = getattr(settings, 'NOTIFICATIONS_OUTBOX_FLUSH_DELAY', 5)
+    # Expires on its own if the run never happens, so the outbox can't get stuck
+    if cache.add(OUTBOX_FLUSH_QUEUED_KEY, True, timeout=delay + 60):
+        flush_email_outbox.apply_async(countdown=delay)
+
+
+def _record_failure(email, error, now, max_attempts):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+    else:
+        email.next_attempt_at = now + datetime.timedelta(seconds=OUTBOX_RETRY_BASE_SECONDS * 2 ** (email.attempts - 1))
+
+
+def send_outbox_batch(emails):
+    """
+    Sends the given outbox emails through one mail server connection and records the outcome of each:
+    sent, retried later with exponential backoff, or failed after NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS.
+    Returns the number of sent emails.
+    """
+    now = timezone.now()
+    max_attempts = getattr(settings, 'NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning("Could not connect to the mail server, %s outbox email(s) will be retried: %s", len(emails), e)
+        for email in emails:
+            _record_failure(email, e, now, max_attempts)
+    else:
+        try:
+            for email in emails:
+                message = EmailMultiAlternatives(
+                    email.subject, email.body, email.from_email, email.to, connection=connection,
+                )
+                if email.html_body:
+                    message.attach_alternative(email.html_body, "text/html")
+                # One message per call, so a rejected recipient only fails its own email
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    logger.warning("Error sending outbox email #%s: %s", email.pk, e)
+                    _record_failure(email, e, now, max_attempts)
+                else:
+                    email.attempts += 1
+                    email.status = 'sent'
+                    email.sent_at = now
+                    email.last_error = ''
+                    sent += 1
+        finally:
+            connection.close()
+
+    OutboxEmail.objects.bulk_update(emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+    return sent
+
+
+def flush_outbox(batch_size=None):
+    """
+    Sends the pending outbox emails that are due, batch_size (NOTIFICATIONS_OUTBOX_BATCH_SIZE) per mail
+    server connection. Rows are locked with SKIP LOCKED, so concurrent flushes never send an email twice.
+    Returns the number of sent emails.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'NOTIFICATIONS_OUTBOX_BATCH_SIZE', 100)
+    # Emails committed from now on queue a new run
+    cache.delete(OUTBOX_FLUSH_QUEUED_KEY)
+
+    sent = 0
+    while True:
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects
+                .filter(status='pending', next_attempt_at__lte=timezone.now())
+                .order_by('next_attempt_at', 'id')
+                .select_for_update(skip_locked=True)[:batch_size]
+            )
+            if emails:
+                sent += send_outbox_batch(emails)
+        # Retried emails are due later, so a short batch means the outbox is drained
+        if len(emails) < batch_size:
+            return sent
@@ -1,114 +1,276 @@
 # notifications/tasks.py
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Exists, OuterRef
 from celery import shared_task
 from django.utils import timezone
-from datetime import timedelta
-from django.core.mail import send_mail
+from collections import defaultdict
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 
 from .models import OverdueNotificationLog
+from .coalescing import send_due_status_notifications
+from .outbox import flush_outbox, queue_email
+from .utils import send_new_request_submission_notifications, send_request_assignment_email
 
 # Import all your request models
 from complaints.models import Complaint
 from services.models import ServiceRequest
 from inquiries.models import Inquiry
 from emergencies.models import EmergencyReport
+from unified_requests.constants import OPEN_STATUSES
+from unified_requests.indexing import INDEXED_REQUEST_MODELS
 
 User = get_user_model()    
 
-@shared_task
-def check_overdue_requests():
+# Request type stored in OverdueNotificationLog -> (support dashboard request type, model)
+OVERDUE_REQUEST_MODELS = {
+    'complaint': ('complaint', Complaint),
+    'service_request': ('service', ServiceRequest),
+    'inquiry': ('inquiry', Inquiry),
+    'emergency': ('emergency', EmergencyReport),
+}
+
+
+def get_newly_overdue_requests(request_type, Model, now):
     """
-    Celery task to check for overdue requests and send notifications to staff.
-    A request is considered overdue if its status is not 'resolved', 'closed', or 'rejected'
-    and it hasn't been updated for 48 hours.
+    Returns the open requests of one model past their due date that weren't notified since their last update,
+    as one anti-join query: a range scan of the open due_at index with NOT EXISTS on the notification log.
+    """
+    notified_since_update = OverdueNotificationLog.objects.filter(
+        request_type=request_type,
+        request_id=OuterRef('pk'),
+        notified_at__gte=OuterRef('updated_at'),
+    )
+    return (
+        Model.objects
+        .filter(status__in=OPEN_STATUSES, due_at__lt=now)
+        .filter(~Exists(notified_since_update))
+        .only('pk', 'subject', 'status', 'updated_at', 'due_at', 'assigned_to_id')
+        .order_by('pk')
+    )
+
+
+def log_overdue_notifications(log_entries):
+    """
+    Writes the notification log rows of one run in bulk. A request notified before gets its notified_at
+    moved forward (there is one row per request), so it isn't notified again until it is next updated.
+    """
+    if not log_entries:
+        return
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options = {'unique_fields': ['request_type', 'request_id']}
+    else:
+        conflict_options = {}
+    OverdueNotificationLog.objects.bulk_create(
+        log_entries, batch_size=500, update_conflicts=True, update_fields=['notified_at'], **conflict_options,
+    )
+
+
+def send_overdue_request_emails(overdue_requests):
+    """
+    Broadcast mode: one email per overdue request to every active staff member.
+    Returns the number of queued emails.
     """
-    overdue_threshold = timezone.now() - timedelta(hours=48)
-    not_final_statuses = ['new', 'in_progress'] # Define statuses that require action
+    admin_emails = list(User.objects.filter(is_staff=True, is_active=True).values_list('email', flat=True))
+    admin_emails = [email for email in admin_emails if email] # Remove empty emails
+    if not admin_emails:
+        print("No active staff users with emails found to notify.")
+        return 0
 
-    request_models = {
-        'complaint': Complaint,
-        'service_request': ServiceRequest,
-        'inquiry': Inquiry,
-        'emergency': EmergencyReport,
-    }
+    for req_data in overdue_requests:
+        subject = f"Urgent: Overdue {req_data['type']} #{req_data['pk']} - {req_data['subject']}"
+        html_message = render_to_string(
+            'notifications/overdue_notification_email.html',
+            {'request_data': req_data, 'admin_link': settings.BASE_URL + '/admin/'}
+        )
+        plain_message = f"Request Type: {req_data['type']}\n" \
+                        f"ID: {req_data['pk']}\n" \
+                        f"Subject: {req_data['subject']}\n" \
+                        f"Last Updated: {req_data['last_updated']}\n" \
+                        f"Due: {req_data['due_at']}\n" \
+                        f"Status: {req_data['status']}\n" \
+                        f"View Details: {req_data['link']}"
+        # Queued in the outbox; the flusher sends the whole run's emails over one connection
+        queue_email(subject, plain_message, admin_emails, html_body=html_message) # Send to all admins
+    return len(overdue_requests)
+
+
+def send_overdue_digests(overdue_requests):
+    """
+    Digest mode: one email per recipient listing all of their newly overdue requests. Requests go to their
+    assignee; unassigned ones, and those whose assignee is inactive or has no email, go to the
+    NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS list. Returns (number of queued emails, emailed requests);
+    the triage requests are left out of the latter when no triage emails are configured.
+    """
+    assignee_ids = {req_data['assigned_to_id'] for req_data in overdue_requests if req_data['assigned_to_id']}
+    assignee_emails = dict(
+        User.objects.filter(pk__in=assignee_ids, is_active=True).exclude(email='').values_list('pk', 'email')
+    )
+    triage_emails = tuple(email for email in getattr(settings, 'NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS', []) if email)
 
-    overdue_requests_to_notify = []
+    requests_by_recipients = defaultdict(list)
+    for req_data in overdue_requests:
+        assignee_email = assignee_emails.get(req_data['assigned_to_id'])
+        requests_by_recipients[(assignee_email,) if assignee_email else triage_emails].append(req_data)
+    if () in requests_by_recipients:
+        print(f"No triage emails configured, {len(requests_by_recipients.pop(()))} unassigned overdue requests not emailed.")
 
-    for request_type, Model in request_models.items():
-        # Get requests that are in a non-final status and haven't been updated recently
-        potential_overdue_requests = Model.objects.filter(
-            status__in=not_final_statuses,
-            updated_at__lt=overdue_threshold
+    emailed_requests = []
+    for recipients, digest_requests in requests_by_recipients.items():
+        is_triage = recipients == triage_emails
+        subject = f"Overdue Requests: {len(digest_requests)} {'unassigned ' if is_triage else ''}request(s) need attention"
+        html_message = render_to_string('notifications/overdue_digest_email.html', {
+            'overdue_requests': digest_requests,
+            'is_triage': is_triage,
+            'dashboard_link': settings.BASE_URL + reverse('support_dashboard:request_list'),
+        })
+        plain_message = "\n".join(
+            f"{req_data['type']} #{req_data['pk']} - {req_data['subject']} "
+            f"({req_data['status']}, due {timezone.localtime(req_data['due_at']):%b %d, %Y %H:%M}): {req_data['link']}"
+            for req_data in digest_requests
         )
+        queue_email(subject, plain_message, recipients, html_body=html_message)
+        emailed_requests.extend(digest_requests)
+    return len(requests_by_recipients), emailed_requests
+
 
-        for req in potential_overdue_requests:
-            # Check if this specific request has already been notified as overdue
-            # since its last update
-            last_notification = OverdueNotificationLog.objects.filter(
-                request_type=request_type,
-                request_id=req.pk
-            ).order_by('-notified_at').first()
-
-            if last_notification is None or last_notification.notified_at < req.updated_at:
-                # If no previous notification, or if the request was updated AFTER
-                # the last notification (meaning it became overdue again)
-                overdue_requests_to_notify.append({
+@shared_task
+def check_overdue_requests():
+    """
+    Celery task to check for overdue requests and send notifications to staff.
+    A request is considered overdue if its status is not 'resolved', 'closed', or 'rejected'
+    and its SLA due date (due_at, see unified_requests.sla) has passed.
+    Each overdue request is notified once, and again only after it was updated: the work done
+    depends on the number of newly overdue requests, not on the size of the backlog.
+    With NOTIFICATIONS_OVERDUE_DIGEST, each assignee (and the triage list) gets one digest email per run;
+    otherwise every staff member gets one email per request.
+    Returns the number of notified requests.
+    """
+    now = timezone.now()
+    overdue_requests = []
+    # The emails and the log rows are committed together, so a failed run neither loses nor repeats notifications
+    with transaction.atomic():
+        for request_type, (dashboard_type, Model) in OVERDUE_REQUEST_MODELS.items():
+            for req in get_newly_overdue_requests(request_type, Model, now).iterator(chunk_size=500):
+                overdue_requests.append({
                     'type': request_type.replace('_', ' ').title(),
+                    'log_type': request_type, # Request type stored in OverdueNotificationLog
                     'pk': req.pk,
                     'subject': getattr(req, 'subject', f"Request #{req.pk}"), # Use subject if exists, else ID
-                    'link': settings.BASE_URL + f"/notifications/{request_type.replace('_', '-')}/{req.pk}/",
+                    'link': settings.BASE_URL + reverse(
+                        'support_dashboard:request_detail', kwargs={'request_type': dashboard_type, 'pk': req.pk},
+                    ),
                     'last_updated': req.updated_at,
+                    'due_at': req.due_at,
                     'status': req.get_status_display(),
-                    'full_obj': req # Keep full object for logging later
+                    'assigned_to_id': req.assigned_to_id,
                 })
 
-    if overdue_requests_to_notify:
-        admin_emails = list(User.objects.filter(is_staff=True, is_active=True).values_list('email', flat=True))
-        admin_emails = [email for email in admin_emails if email] # Remove empty emails
-
-        if not admin_emails:
-            print("No active staff users with emails found to notify.")
-            return
-
-        print(f"Found {len(overdue_requests_to_notify)} overdue requests. Notifying admins.")
-
-        for req_data in overdue_requests_to_notify:
-            subject = f"Urgent: Overdue {req_data['type']} #{req_data['pk']} - {req_data['subject']}"
-            html_message = render_to_string(
-                'notifications/overdue_notification_email.html',
-                {'request_data': req_data, 'admin_link': settings.BASE_URL + '/admin/'}
-            )
-            plain_message = f"Request Type: {req_data['type']}\n" \
-                            f"ID: {req_data['pk']}\n" \
-                            f"Subject: {req_data['subject']}\n" \
-                            f"Last Updated: {req_data['last_updated']}\n" \
-                            f"Status: {req_data['status']}\n" \
-                            f"View Details: {req_data['link']}"
-            # --- Settings flags 
-            if getattr(settings, 'NOTIFICATIONS_SEND_EMAILS', False):
-                try:
-                    send_mail(
-                        subject,
-                        plain_message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        admin_emails, # Send to all admins
-                        html_message=html_message,
-                        fail_silently=False,
-                    )
-                    print(f"Notification sent for {req_data['type']} #{req_data['pk']}")
-                except Exception as e:
-                    print(f"Error sending email for {req_data['type']} #{req_data['pk']}: {e}")
-            else:
-                print(f"DEBUG: Email sending is disabled. Would have sent email for {req_data['type']} #{req_data['pk']}")
-
-                # Log that the notification was sent (or would have been sent) for this request
-                OverdueNotificationLog.objects.create(
-                    request_type=req_data['full_obj'].request_type_slug,
-                    request_id=req_data['full_obj'].pk
-                )
-    else:
-        print("No overdue requests found.")
\ No newline at end of file
+        if not overdue_requests:
+            print("No overdue requests found.")
+            return 0
+
+        # --- Settings flags
+        notified_requests = overdue_requests
+        if not getattr(settings, 'NOTIFICATIONS_SEND_EMAILS', False):
+            print(f"DEBUG: Email sending is disabled. Would have notified {len(overdue_requests)} overdue requests.")
+        elif getattr(settings, 'NOTIFICATIONS_OVERDUE_DIGEST', True):
+            email_count, notified_requests = send_overdue_digests(overdue_requests)
+            print(f"Found {len(overdue_requests)} overdue requests. Queued {email_count} digest emails.")
+        elif not send_overdue_request_emails(overdue_requests):
+            # Nobody to notify; keep the requests for the next run
+            return 0
+
+        # Logged whether or not emails are enabled, so the requests aren't picked up again next run.
+        # Requests nobody was emailed about aren't logged, so they are reported once someone can be
+        log_overdue_notifications([
+            OverdueNotificationLog(request_type=req_data['log_type'], request_id=req_data['pk'])
+            for req_data in notified_requests
+        ])
+    return len(notified_requests)
+
+def load_request_for_notification(request_type, pk):
+    """
+    Loads a request with the users its emails are addressed to, or None if it no longer exists.
+    """
+    Model, _ = INDEXED_REQUEST_MODELS[request_type]
+    req = Model.objects.select_related('submitted_by', 'assigned_to').filter(pk=pk).first()
+    if req is not None:
+        req.request_type_slug = request_type # Slug used by the support dashboard URLs in the emails
+    return req
+
+
+@shared_task
+def send_request_submission_notifications(request_type, pk):
+    """
+    Sends the submission confirmation (submitter) and new request alert (admin) emails of a new request.
+    Queued with transaction.on_commit() by the submit view, so the request exists when the task runs.
+    """
+    req = load_request_for_notification(request_type, pk)
+    if req is not None:
+        send_new_request_submission_notifications(req)
+
+
+@shared_task
+def send_request_assignment_notification(request_type, pk):
+    """
+    Sends the assignment email of one request to the staff member it is assigned to when the task runs.
+    """
+    req = load_request_for_notification(request_type, pk)
+    if req is not None:
+        send_request_assignment_email(req)
+
+
+@shared_task
+def flush_email_outbox(batch_size=None):
+    """
+    Sends the pending outbox emails (see notifications.outbox), one mail server connection per batch.
+    Queued a few seconds after emails are committed, and run every minute by the CELERY_BEAT_SCHEDULE
+    entry so failed sends are retried when their backoff expires.
+    """
+    return flush_outbox(batch_size)
+
+
+@shared_task
+def flush_status_notifications():
+    """
+    Sends the coalesced status update emails whose window closed (see notifications.coalescing).
+    Queued when status changes are committed, and again by itself while changes are waiting;
+    also run every minute by the CELERY_BEAT_SCHEDULE entry.
+    """
+    return send_due_status_notifications()
+
+
+@shared_task
+def send_bulk_request_notifications(assignments):
+    """
+    Sends the assignment emails of a dashboard bulk action in one task.
+    'assignments' holds [request_type, pk] items, with the support dashboard's request type slugs.
+    Requests are loaded with one query per request type. (The status changes of the action are
+    coalesced by notifications.coalescing.)
+    """
+    pks_by_type = {}
+    for request_type, pk in assignments:
+        pks_by_type.setdefault(request_type, set()).add(pk)
+
+    requests_by_key = {}
+    for request_type, pks in pks_by_type.items():
+        Model, _ = INDEXED_REQUEST_MODELS[request_type]
+        for req in Model.objects.filter(pk__in=pks).select_related('submitted_by', 'assigned_to'):
+            req.request_type_slug = request_type # Slug used by the support dashboard URLs in the emails
+            requests_by_key[(request_type, req.pk)] = req
+
+    sent = 0
+    for request_type, pk in assignments:
+        req = requests_by_key.get((request_type, pk))
+        if req is None:
+            continue
+        try:
+            send_request_assignment_email(req)
+            sent += 1
+        except Exception as e:
+            print(f"Error sending assignment email for {request_type} #{pk}: {e}")
+    return sent
@@ -1,3 +1,157 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from complaints.models import Complaint
+
+from .coalescing import queue_status_notifications, send_due_status_notifications
+from .models import OutboxEmail, OverdueNotificationLog, PendingStatusNotification
+from .outbox import flush_outbox, queue_email
+from .tasks import check_overdue_requests, send_request_assignment_notification
+
+User = get_user_model()
+
+
+class RequestNotificationTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.submitter = User.objects.create_user(username='student', email='student@example.com', password='pw')
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+        cls.complaint = Complaint.objects.create(
+            subject='Broken chair', description='Room 101', submitted_by=cls.submitter, assigned_to=cls.staff,
+        )
+
+    def test_task_loads_the_request_and_sends_its_email(self):
+        send_request_assignment_notification('complaint', self.complaint.pk)
+        self.assertEqual(mail.outbox, []) # Only written to the outbox so far
+        flush_outbox()
+
+        self.assertEqual([message.to for message in mail.outbox], [['staff@example.com']])
+
+    def test_deleted_request_sends_nothing(self):
+        send_request_assignment_notification('complaint', 0)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_rapid_status_changes_send_one_email(self):
+        self.client.force_login(self.staff)
+        url = reverse('support_dashboard:request_detail', kwargs={'request_type': 'complaint', 'pk': self.complaint.pk})
+        for status in ('in_progress', 'resolved'):
+            self.client.post(url, {'update_status': '1', 'status': status})
+
+        pending = PendingStatusNotification.objects.get()
+        self.assertEqual((pending.from_status, pending.to_status, pending.change_count), ('new', 'resolved', 2))
+        self.assertEqual(send_due_status_notifications(), 0) # Window still open
+
+        PendingStatusNotification.objects.update(send_after=timezone.now())
+        self.assertEqual(send_due_status_notifications(), 1)
+        self.assertFalse(PendingStatusNotification.objects.exists())
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ['student@example.com'])
+        self.assertIn('Resolved', email.subject)
+
+    def test_changes_back_to_the_starting_status_send_nothing(self):
+        queue_status_notifications([
+            ['complaint', self.complaint.pk, 'new', 'in_progress'],
+            ['complaint', self.complaint.pk, 'in_progress', 'new'],
+        ])
+        PendingStatusNotification.objects.update(send_after=timezone.now())
+
+        self.assertEqual(send_due_status_notifications(), 0)
+        self.assertFalse(OutboxEmail.objects.exists())
+        self.assertFalse(PendingStatusNotification.objects.exists())
+
+
+@override_settings(NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS=2)
+class EmailOutboxTests(TestCase):
+    def test_batches_share_one_connection(self):
+        for number in range(5):
+            queue_email(f"Notice {number}", "Body", [f"user{number}@example.com"], html_body="<p>Body</p>")
+
+        with mock.patch('notifications.outbox.get_connection', wraps=get_connection) as connections:
+            self.assertEqual(flush_outbox(batch_size=2), 5)
+
+        self.assertEqual(connections.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>Body</p>")
+        self.assertFalse(OutboxEmail.objects.exclude(status='sent').exists())
+
+    def test_failed_send_is_retried_then_given_up(self):
+        email = queue_email("Notice", "Body", ["user@example.com"])
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = OSError("Connection reset")
+
+        with mock.patch('notifications.outbox.get_connection', return_value=connection):
+            self.assertEqual(flush_outbox(), 0)
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('pending', 1))
+            self.assertIn("Connection reset", email.last_error)
+
+            self.assertEqual(flush_outbox(), 0) # Not due again yet
+            OutboxEmail.objects.update(next_attempt_at=email.created_at)
+            flush_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+
+
+@override_settings(NOTIFICATIONS_SEND_EMAILS=True, NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS=['triage@example.com'])
+class OverdueCheckTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+        cls.overdue = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        cls.closed = Complaint.objects.create(subject='Leak', description='Lab 3', status='closed')
+        cls.on_time = Complaint.objects.create(subject='Noisy hallway', description='Floor 2')
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        Complaint.objects.filter(pk__in=[cls.overdue.pk, cls.closed.pk]).update(due_at=yesterday, updated_at=yesterday)
+
+    def test_overdue_requests_are_notified_once_until_updated(self):
+        self.assertEqual(check_overdue_requests(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+        self.assertEqual(check_overdue_requests(), 0)
+
+        Complaint.objects.filter(pk=self.overdue.pk).update(updated_at=timezone.now())
+        self.assertEqual(check_overdue_requests(), 1)
+        log = OverdueNotificationLog.objects.get()
+        self.assertEqual((log.request_type, log.request_id), ('complaint', self.overdue.pk))
+
+    @override_settings(NOTIFICATIONS_SEND_EMAILS=False)
+    def test_disabled_emails_still_log(self):
+        self.assertEqual(check_overdue_requests(), 1)
+        self.assertFalse(OutboxEmail.objects.exists())
+        self.assertEqual(check_overdue_requests(), 0)
+
+    def test_digest_per_assignee_and_triage(self):
+        assigned = Complaint.objects.bulk_create([
+            Complaint(subject=f'Broken chair {number}', description='Room 101', assigned_to=self.staff)
+            for number in range(2)
+        ])
+        Complaint.objects.filter(pk__in=[complaint.pk for complaint in assigned]).update(
+            due_at=timezone.now() - datetime.timedelta(hours=1),
+        )
+
+        self.assertEqual(check_overdue_requests(), 3)
+        emails = {tuple(email.to): email for email in OutboxEmail.objects.all()}
+        self.assertEqual(set(emails), {('staff@example.com',), ('triage@example.com',)})
+        self.assertIn('2 request(s)', emails[('staff@example.com',)].subject)
+        self.assertIn('Broken chair 1', emails[('staff@example.com',)].html_body)
+        self.assertIn('1 unassigned request(s)', emails[('triage@example.com',)].subject)
+
+    def test_unassigned_requests_wait_for_a_triage_list(self):
+        with override_settings(NOTIFICATIONS_OVERDUE_TRIAGE_EMAILS=[]):
+            self.assertEqual(check_overdue_requests(), 0)
+        self.assertFalse(OverdueNotificationLog.objects.exists())
+
+        self.assertEqual(check_overdue_requests(), 1)
+        self.assertEqual(OutboxEmail.objects.get().to, ['triage@example.com'])
+
+    @override_settings(NOTIFICATIONS_OVERDUE_DIGEST=False)
+    def test_broadcast_mode_emails_each_request_to_all_staff(self):
+        self.assertEqual(check_overdue_requests(), 1)
+        self.assertEqual(OutboxEmail.objects.get().to, ['staff@example.com'])
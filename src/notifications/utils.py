@@ -17,6 +17,9 @@ from emergencies.models import EmergencyReport
 # Need to import ContentType for dynamically generating admin URLs
 from django.contrib.contenttypes.models import ContentType
 
+# Emails go through the outbox, which sends them in batches over one connection
+from .outbox import queue_email_message
+
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
@@ -82,7 +85,7 @@ def send_request_status_update_email(request_obj, old_status, new_status):
         [recipient_email]
     )
     user_msg.attach_alternative(user_html_content, "text/html")
-    user_msg.send()
+    queue_email_message(user_msg)
 
 # Send email to sfaff/support when request has been assigned to the group.
 def send_request_assignment_email(request_obj):
@@ -119,7 +122,7 @@ def send_request_assignment_email(request_obj):
         [recipient_email]
     )
     msg.attach_alternative(html_content, "text/html")
-    msg.send()
+    queue_email_message(msg)
 
 # FUNCTION for initial submission notifications
 def send_new_request_submission_notifications(request_obj):
@@ -182,7 +185,7 @@ def send_new_request_submission_notifications(request_obj):
             [recipient_email]
         )
         user_msg.attach_alternative(user_html_content, "text/html")
-        user_msg.send()
+        queue_email_message(user_msg)
 
     # --- Email to Admin/Support (New Request Alert) ---
     # Need to define ADMIN_EMAIL_FOR_NOTIFICATIONS in the settings.py
@@ -217,4 +220,4 @@ def send_new_request_submission_notifications(request_obj):
             [admin_recipient_email]
         )
         admin_msg.attach_alternative(admin_html_content, "text/html")
-        admin_msg.send()
\ No newline at end of file
+        queue_email_message(admin_msg)
\ No newline at end of file
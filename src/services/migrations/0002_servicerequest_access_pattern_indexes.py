@@ -0,0 +1,41 @@
+# Generated by Django 5.2.2 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+from unified_requests.operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(fields=['status', 'updated_at'], name='service_status_upd_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(fields=['assigned_to', '-submitted_at'], name='service_assignee_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(fields=['submitted_by', '-submitted_at'], name='service_submitter_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(fields=['status', 'resolved_at'], name='service_status_res_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['updated_at'], name='service_open_upd_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='servicerequest',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['assigned_to', '-submitted_at'], name='service_open_asg_idx'),
+        ),
+    ]
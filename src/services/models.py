@@ -2,7 +2,7 @@
 from django.db import models
 from django.conf import settings
 from abode.models import TimeStampModel
-from unified_requests.constants import STATUS_CHOICES
+from unified_requests.constants import STATUS_CHOICES, OPEN_REQUEST_CONDITION
 
 class ServiceType(models.Model):
     """
@@ -125,6 +125,12 @@ class ServiceRequest(models.Model):
     
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    due_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the request becomes overdue, set from its SLA policy on save."
+    )
 
     request_type_slug = models.CharField(max_length=50, default='service_request', editable=False)
 
@@ -137,6 +143,21 @@ class ServiceRequest(models.Model):
         verbose_name = "Service Request"
         verbose_name_plural = "Service Requests"
         ordering = ['-submitted_at']
+        indexes = [
+            # Status filters by last update
+            models.Index(fields=['status', 'updated_at'], name='service_status_upd_idx'),
+            # Staff dashboard: requests assigned to someone, newest first
+            models.Index(fields=['assigned_to', '-submitted_at'], name='service_assignee_idx'),
+            # User dashboard: a submitter's requests, newest first
+            models.Index(fields=['submitted_by', '-submitted_at'], name='service_submitter_idx'),
+            # Statistics: resolved requests by resolution date
+            models.Index(fields=['status', 'resolved_at'], name='service_status_res_idx'),
+            # Partial indexes over the open requests only (new, in progress), a small share of each table
+            models.Index(fields=['updated_at'], name='service_open_upd_idx', condition=OPEN_REQUEST_CONDITION),
+            models.Index(fields=['assigned_to', '-submitted_at'], name='service_open_asg_idx', condition=OPEN_REQUEST_CONDITION),
+            # Overdue scan (check_overdue_requests) and the time remaining sort of the staff list
+            models.Index(fields=['due_at'], name='service_open_due_idx', condition=OPEN_REQUEST_CONDITION),
+        ]
 
     def __str__(self):
         return f"Service Request #{self.id}: {self.subject} ({self.get_status_display()})"
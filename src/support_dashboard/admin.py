@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import StaffWorkload
 
-# Register your models here.
+
+@admin.register(StaffWorkload)
+class StaffWorkloadAdmin(admin.ModelAdmin):
+    """
+    Open-request counters per staff member and request type. The counts are maintained by signals;
+    only the auto-assignment eligibility is edited here.
+    """
+    list_display = ('staff', 'request_type', 'open_count', 'auto_assign', 'last_assigned_at')
+    list_editable = ('auto_assign',)
+    list_filter = ('request_type', 'auto_assign')
+    search_fields = ('staff__username', 'staff__first_name', 'staff__last_name')
+    readonly_fields = ('open_count', 'last_assigned_at')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SupportDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'support_dashboard'
+
+    def ready(self):
+        # Invalidate the cached dashboard data when requests change
+        from . import signals  # noqa: F401
@@ -0,0 +1,143 @@
+# support_dashboard/bulk.py
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from unified_requests.history import build_request_events
+from unified_requests.indexing import INDEXED_REQUEST_MODELS, bulk_sync_request_index
+from unified_requests.models import RequestEvent
+from unified_requests.sla import compute_due_at, get_sla_policies
+from notifications.coalescing import queue_status_notifications
+
+from .caching import invalidate_request_caches
+from .filters import REQUEST_MODEL_MAP, scope_queryset_for_user
+from .live import broadcast_request_event, serialize_request_row
+from .signals import queue_saved_view_refresh
+from .trends import mark_rollup_dates_dirty
+from .workload import adjust_staff_workload, get_workload_changes
+
+
+@dataclass
+class BulkActionResult:
+    """
+    Outcome of apply_bulk_action(); the change lists are JSON-friendly so they can be handed to Celery.
+    """
+    updated_count: int = 0
+    skipped_count: int = 0 # Selected requests that don't exist or aren't visible to the user
+    status_changes: list = field(default_factory=list) # [request_type, pk, old_status, new_status]
+    assignments: list = field(default_factory=list) # [request_type, pk] newly assigned to someone
+
+
+def apply_status(request_obj, status):
+    """
+    Sets the status with the same resolved_at rules as the request detail page.
+    """
+    request_obj.status = status
+    # Set resolved_at when status becomes 'resolved'
+    if status == 'resolved' and request_obj.resolved_at is None:
+        request_obj.resolved_at = timezone.now()
+    # Clear resolved_at if status changes from 'resolved' to another status
+    elif status != 'resolved' and request_obj.resolved_at is not None:
+        request_obj.resolved_at = None
+
+
+def apply_bulk_action(user, selected, status=None, assigned_to=None, unassign=False, priority=None):
+    """
+    Applies a status, assignment and/or priority change to the selected requests
+    ({request_type: {pk, ...}}) in one transaction, with one locking SELECT and one bulk_update per model.
+    bulk_update() skips the save signals, so the request index, the request history, the SLA due dates,
+    the staff workload counters, the dashboard cache and the live dashboards are updated here.
+    Priority is only applied to request types that have one.
+    """
+    result = BulkActionResult()
+    now = timezone.now()
+    touched_assignees = set()
+    live_events = [] # (request_type, request_obj, previous assignee id) for the open dashboards
+    sla_policies = get_sla_policies() if priority else None
+
+    with transaction.atomic():
+        for request_type, pks in selected.items():
+            model_class = REQUEST_MODEL_MAP[request_type]
+            _, category_field = INDEXED_REQUEST_MODELS[request_type]
+            has_priority = any(model_field.name == 'priority' for model_field in model_class._meta.fields)
+
+            queryset = model_class.objects.filter(pk__in=pks).select_related(category_field, 'assigned_to')
+            request_objs = list(scope_queryset_for_user(queryset, user).select_for_update(of=('self',)))
+            result.skipped_count += len(pks) - len(request_objs)
+
+            update_fields = set()
+            changed_objs = []
+            workload_changes = Counter()
+            events = []
+            previous_resolved_ats = [] # Resolution days the rollup must drop the reopened requests from
+            for request_obj in request_objs:
+                changed = False
+                previous_assignee_id = request_obj.assigned_to_id
+                previous_status = request_obj.status
+                if status and request_obj.status != status:
+                    result.status_changes.append([request_type, request_obj.pk, request_obj.status, status])
+                    previous_resolved_at = request_obj.resolved_at
+                    apply_status(request_obj, status)
+                    if previous_resolved_at and request_obj.resolved_at != previous_resolved_at:
+                        previous_resolved_ats.append(previous_resolved_at)
+                    update_fields.update({'status', 'resolved_at'})
+                    changed = True
+                new_assignee = None if unassign else (assigned_to or request_obj.assigned_to)
+                new_assignee_id = new_assignee.pk if new_assignee else None
+                if new_assignee_id != request_obj.assigned_to_id:
+                    touched_assignees.update({request_obj.assigned_to_id, new_assignee_id})
+                    request_obj.assigned_to = new_assignee
+                    update_fields.add('assigned_to')
+                    if new_assignee_id:
+                        result.assignments.append([request_type, request_obj.pk])
+                    changed = True
+                if priority and has_priority and request_obj.priority != priority:
+                    request_obj.priority = priority
+                    request_obj.due_at = compute_due_at(request_type, request_obj, sla_policies)
+                    update_fields.update({'priority', 'due_at'})
+                    changed = True
+                if changed:
+                    # auto_now isn't applied by bulk_update()
+                    request_obj.updated_at = now
+                    touched_assignees.add(request_obj.assigned_to_id)
+                    changed_objs.append(request_obj)
+                    live_events.append((request_type, request_obj, previous_assignee_id))
+                    workload_changes.update(get_workload_changes(
+                        previous_assignee_id, previous_status, request_obj.assigned_to_id, request_obj.status,
+                    ))
+                    events.extend(build_request_events(
+                        request_type, request_obj.pk,
+                        previous_status, previous_assignee_id, request_obj.status, request_obj.assigned_to_id,
+                        actor_id=user.pk, occurred_at=now,
+                    ))
+
+            if changed_objs:
+                mark_rollup_dates_dirty(*previous_resolved_ats)
+                model_class.objects.bulk_update(changed_objs, [*update_fields, 'updated_at'], batch_size=500)
+                bulk_sync_request_index(request_type, changed_objs)
+                RequestEvent.objects.bulk_create(events, batch_size=500)
+                # One counter UPDATE per affected staff member rather than one per request
+                adjust_staff_workload(request_type, {
+                    staff_id: delta for staff_id, delta in workload_changes.items() if delta
+                })
+                result.updated_count += len(changed_objs)
+
+        # Submitter emails are coalesced with the other changes made to the same requests
+        queue_status_notifications(result.status_changes)
+
+        if result.updated_count:
+            transaction.on_commit(lambda: invalidate_request_caches(*touched_assignees))
+            # One saved view recount per changed request type instead of one per request
+            for request_type in {request_type for request_type, _, _ in live_events}:
+                queue_saved_view_refresh(request_type, *touched_assignees)
+            for request_type, request_obj, previous_assignee_id in live_events:
+                row = serialize_request_row(request_type, request_obj)
+                event = 'assigned' if request_obj.assigned_to_id != previous_assignee_id else 'updated'
+                transaction.on_commit(partial(
+                    broadcast_request_event, event, row, request_obj.assigned_to_id, previous_assignee_id,
+                ))
+
+    return result
@@ -0,0 +1,116 @@
+# support_dashboard/caching.py
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache
+
+# Entries also expire on their own, which bounds staleness when a per-process cache (LocMemCache)
+# is used with several worker processes; with a shared cache (Redis) invalidation is exact.
+DASHBOARD_CACHE_TIMEOUT = 300
+
+CACHE_KEY_PREFIX = 'support_dashboard'
+# Bumped on every request change: superusers see everything
+GLOBAL_VERSION_KEY = f'{CACHE_KEY_PREFIX}:version:all'
+# Bumped when the RequestDailyStat rollup is refreshed (trend only)
+ROLLUP_VERSION_KEY = f'{CACHE_KEY_PREFIX}:version:rollup'
+
+
+def get_assignee_version_key(user_id):
+    # Bumped when a request assigned (or previously assigned) to this staff member changes
+    return f'{CACHE_KEY_PREFIX}:version:assignee:{user_id}'
+
+
+def get_scope(user):
+    """
+    Returns (scope name, version key) of what the user sees on the dashboard:
+    staff see their assigned requests, superusers everything.
+    """
+    if user.is_staff and not user.is_superuser:
+        return f'assignee:{user.pk}', get_assignee_version_key(user.pk)
+    return 'all', GLOBAL_VERSION_KEY
+
+
+def _new_version():
+    # Never reuses an old number when a version key is evicted, so stale entries can't come back
+    return time.time_ns()
+
+
+def get_versions(keys):
+    """
+    Returns the current value of each version key, creating missing ones.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+async def aget_versions(keys):
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, _new_version(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return versions
+
+
+def bump_versions(*keys):
+    """
+    Invalidates every cache entry built on the given version keys.
+    """
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing key: a fresh version is just as good as an increment
+            cache.add(key, _new_version(), timeout=None)
+
+
+def invalidate_request_caches(*assignee_ids):
+    """
+    Called when a request changes: drops the superuser entries and those of the given assignees.
+    """
+    bump_versions(GLOBAL_VERSION_KEY, *(get_assignee_version_key(user_id) for user_id in set(assignee_ids) if user_id))
+
+
+def _version_keys(user, extra_version_keys):
+    scope, version_key = get_scope(user)
+    return scope, [version_key, *extra_version_keys]
+
+
+def _build_cache_key(kind, scope, params, keys, versions):
+    # The date is part of the key because 'today' counters roll over at midnight
+    raw = "|".join(str(part) for part in (
+        sorted(params.items()), datetime.date.today(), *(versions[key] for key in keys),
+    ))
+    return f'{CACHE_KEY_PREFIX}:{kind}:{scope}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def get_cached_dashboard_data(kind, user, params, compute, extra_version_keys=()):
+    """
+    Returns compute() cached under (kind, viewer scope, params hash, current versions).
+    A hit costs two cache reads: the versions and the entry.
+    """
+    scope, keys = _version_keys(user, extra_version_keys)
+    key = _build_cache_key(kind, scope, params, keys, get_versions(keys))
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_cached_dashboard_data(kind, user, params, acompute, extra_version_keys=()):
+    """
+    Async variant of get_cached_dashboard_data(); 'acompute' is a coroutine function.
+    """
+    scope, keys = _version_keys(user, extra_version_keys)
+    key = _build_cache_key(kind, scope, params, keys, await aget_versions(keys))
+    data = await cache.aget(key)
+    if data is None:
+        data = await acompute()
+        await cache.aset(key, data, DASHBOARD_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,42 @@
+# support_dashboard/concurrency.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.db import close_old_connections
+
+# Upper bound of dashboard queries running at the same time, across all requests of the process.
+# Each worker thread holds its own database connection, so this is also the number of extra connections.
+DASHBOARD_QUERY_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=DASHBOARD_QUERY_WORKERS, thread_name_prefix='dashboard-query')
+
+
+def _run_with_connection_cleanup(func):
+    # Worker threads don't go through the request cycle, so apply CONN_MAX_AGE / broken connection cleanup here
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+async def run_in_dashboard_pool(func, *args, **kwargs):
+    """
+    Runs a blocking (ORM) callable in the bounded dashboard thread pool and awaits its result.
+    Unlike sync_to_async(thread_sensitive=True), calls don't queue behind each other on one thread.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _run_with_connection_cleanup, partial(func, *args, **kwargs))
+
+
+async def gather_per_model(func, model_names, *args, **kwargs):
+    """
+    Calls func(model_name, *args, **kwargs) for every model concurrently in the pool.
+    Returns a dict of model name -> result, in the order of model_names.
+    """
+    model_names = list(model_names)
+    results = await asyncio.gather(*(
+        run_in_dashboard_pool(func, model_name, *args, **kwargs) for model_name in model_names
+    ))
+    return dict(zip(model_names, results))
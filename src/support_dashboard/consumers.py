@@ -0,0 +1,27 @@
+# support_dashboard/consumers.py
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .live import get_dashboard_groups
+
+
+class DashboardConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Websocket of an open support dashboard. Staff receive the events of the requests assigned to them,
+    superusers those of every request; the page patches its rows and counters from them.
+    """
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated or not user.is_staff:
+            await self.close()
+            return
+        self.groups_joined = get_dashboard_groups(user)
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        for group in getattr(self, 'groups_joined', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def request_event(self, message):
+        await self.send_json({'event': message['event'], 'request': message['request']})
@@ -0,0 +1,94 @@
+# support_dashboard/export.py
+import csv
+import heapq
+
+from unified_requests.constants import STATUS_CHOICES, REQUEST_TYPE_CHOICES
+
+from .pagination import TYPE_RANKS
+from .rows import get_assignee_name
+
+EXPORT_CHUNK_SIZE = 2000 # Rows fetched per database round trip while streaming
+
+# Name of the category-like foreign key of each request model
+CATEGORY_FIELDS = {
+    'complaint': 'category',
+    'service': 'service_type',
+    'inquiry': 'category',
+    'emergency': 'emergency_type',
+}
+
+EXPORT_HEADER = [
+    'Type', 'ID', 'Subject', 'Status', 'Priority', 'Category', 'Assigned To',
+    'Submitted At', 'Updated At', 'Resolved At',
+]
+
+STATUS_DISPLAY = dict(STATUS_CHOICES)
+TYPE_DISPLAY = dict(REQUEST_TYPE_CHOICES)
+
+# Leading characters that make Excel / Sheets read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """
+    File-like object whose write() hands back the value, so csv.writer can format one row at a time.
+    """
+    def write(self, value):
+        return value
+
+
+def escape_csv_text(value):
+    """
+    Prefixes user-entered text that a spreadsheet would evaluate as a formula (e.g. "=HYPERLINK(...)")
+    with a quote, so it is shown as text.
+    """
+    if value and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _export_rows(model_name, queryset):
+    """
+    Yields (sort_key, csv_row) for one model, newest first, reading plain values in chunks.
+    """
+    category_field = CATEGORY_FIELDS[model_name]
+    has_priority = any(field.name == 'priority' for field in queryset.model._meta.fields)
+    fields = [
+        'pk', 'subject', 'status', 'submitted_at', 'updated_at', 'resolved_at', f'{category_field}__name',
+        'assigned_to_id', 'assigned_to__username', 'assigned_to__first_name', 'assigned_to__last_name',
+    ]
+    if has_priority:
+        fields.append('priority')
+
+    rank = TYPE_RANKS[model_name]
+    type_label = TYPE_DISPLAY[model_name]
+    values = queryset.order_by('-submitted_at', '-pk').values(*fields)
+    for row in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        assignee = get_assignee_name(
+            row['assigned_to__username'], row['assigned_to__first_name'], row['assigned_to__last_name']
+        ) if row['assigned_to_id'] else ''
+        yield (row['submitted_at'], rank, row['pk']), [
+            type_label,
+            row['pk'],
+            escape_csv_text(row['subject']),
+            STATUS_DISPLAY.get(row['status'], row['status']),
+            row.get('priority') or '',
+            escape_csv_text(row[f'{category_field}__name'] or ''),
+            escape_csv_text(assignee),
+            row['submitted_at'].isoformat() if row['submitted_at'] else '',
+            row['updated_at'].isoformat() if row['updated_at'] else '',
+            row['resolved_at'].isoformat() if row['resolved_at'] else '',
+        ]
+
+
+def stream_requests_csv(querysets):
+    """
+    Yields the CSV lines of the filtered requests of every model, newest first.
+    Each model is read with a server-side chunked iterator and the streams are merged lazily,
+    so memory use doesn't depend on the number of exported rows.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    streams = [_export_rows(model_name, queryset) for model_name, queryset in querysets.items()]
+    for _, row in heapq.merge(*streams, key=lambda item: item[0], reverse=True):
+        yield writer.writerow(row)
@@ -0,0 +1,116 @@
+# support_dashboard/filters.py
+from django.db.models import FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Import models from request types respective apps
+from complaints.models import Complaint
+from services.models import ServiceRequest
+from inquiries.models import Inquiry
+from emergencies.models import EmergencyReport
+
+from unified_requests.search import rank_request_index, search_request_index
+
+# Request type slug -> model, in the order the dashboard lists them
+REQUEST_MODEL_MAP = {
+    'complaint': Complaint,
+    'service': ServiceRequest,
+    'inquiry': Inquiry,
+    'emergency': EmergencyReport,
+}
+
+
+def scope_queryset_for_user(queryset, user):
+    """
+    Restricts a request queryset to what the given staff user may see.
+    Superusers see everything; other staff only see requests assigned to them.
+    """
+    if user.is_staff and not user.is_superuser:
+        queryset = queryset.filter(assigned_to=user)
+    return queryset
+
+
+def build_request_filter_q(cleaned_data):
+    """
+    Translates the cleaned data of a RequestFilterForm into a single Q expression
+    that can be applied to any of the four request models.
+    The 'request_type' field is not part of the Q; it selects which models get queried.
+    The 'q' search is not part of it either; it goes through the full-text index (see get_search_conditions).
+    """
+    conditions = Q()
+
+    status = cleaned_data.get('status')
+    if status:
+        conditions &= Q(status=status)
+
+    assigned_to = cleaned_data.get('assigned_to')
+    if assigned_to:
+        conditions &= Q(assigned_to=assigned_to)
+
+    if cleaned_data.get('show_unassigned'):
+        conditions &= Q(assigned_to__isnull=True)
+
+    submitted_after = cleaned_data.get('submitted_after')
+    if submitted_after:
+        conditions &= Q(submitted_at__date__gte=submitted_after)
+
+    submitted_before = cleaned_data.get('submitted_before')
+    if submitted_before:
+        conditions &= Q(submitted_at__date__lte=submitted_before)
+
+    return conditions
+
+
+def get_search_conditions(q, request_types):
+    """
+    Returns request type slug -> Q matching the requests found by the 'q' search in the full-text
+    request index (or the request whose ID was typed). The matches stay a subquery, so every one
+    of them is listed and counted.
+    """
+    matches = search_request_index(q)
+    conditions = {}
+    for request_type in request_types:
+        condition = Q(pk__in=matches.filter(request_type=request_type).values('request_id'))
+        if q.strip().isdigit():
+            condition |= Q(pk=int(q))
+        conditions[request_type] = condition
+    return conditions
+
+
+def annotate_search_rank(queryset, request_type, q):
+    """
+    Annotates a request queryset with search_rank, the relevance of each request to the 'q' search,
+    read from the request index (0 for a request only matched by its typed ID).
+    """
+    ranks = rank_request_index(q).filter(request_type=request_type, request_id=OuterRef('pk'))
+    return queryset.annotate(search_rank=Coalesce(
+        Subquery(ranks.values('search_rank')[:1]), Value(0.0), output_field=FloatField(),
+    ))
+
+
+def get_filtered_querysets(user, filter_form):
+    """
+    Returns an ordered dict-like mapping of request type slug -> filtered queryset.
+    Only the models selected by the form's 'request_type' are included, so a
+    type filter never touches the other tables. An invalid form applies no filters.
+    With a search sorted by relevance, the querysets are annotated with search_rank.
+    """
+    cleaned_data = filter_form.cleaned_data if filter_form.is_valid() else {}
+    request_type = cleaned_data.get('request_type')
+    conditions = build_request_filter_q(cleaned_data)
+    model_map = {
+        model_name: model_class for model_name, model_class in REQUEST_MODEL_MAP.items()
+        if not request_type or model_name == request_type
+    }
+
+    q = cleaned_data.get('q')
+    search_conditions = get_search_conditions(q, list(model_map)) if q else {}
+
+    querysets = {}
+    for model_name, model_class in model_map.items():
+        queryset = scope_queryset_for_user(model_class.objects.all(), user)
+        if model_name in search_conditions:
+            queryset = queryset.filter(search_conditions[model_name])
+            if cleaned_data.get('sort') == 'relevance':
+                queryset = annotate_search_rank(queryset, model_name, q)
+        querysets[model_name] = queryset.filter(conditions)
+    return querysets
@@ -3,12 +3,13 @@ from django import forms
 from django.contrib.auth import get_user_model # To get the User model dynamically
 from django.forms.widgets import DateInput
 from django.contrib.auth.models import Group # Import Group model
+from django.http import QueryDict
 
 # Import your unified STATUS_CHOICES
 from unified_requests.constants import STATUS_CHOICES
 
 # Import your category models
-from complaints.models import ComplaintCategory
+from complaints.models import Complaint, ComplaintCategory
 from services.models import ServiceType
 from inquiries.models import InquiryCategory
 from emergencies.models import EmergencyType
@@ -81,6 +82,11 @@ class RequestFilterForm(forms.Form):
         initial=False,
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
+    sort = forms.ChoiceField(
+        choices=[('', 'Newest first'), ('due', 'Least time remaining'), ('relevance', 'Best match (search)')],
+        required=False,
+        label='Sort By'
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -90,6 +96,120 @@ class RequestFilterForm(forms.Form):
             elif isinstance(field.widget, forms.CheckboxInput):
                 field.widget.attrs.update({'class': 'form-check-input'})
 
+    def clean_sort(self):
+        # The relevance order comes from the search, so without one the list is sorted newest first
+        sort = self.cleaned_data.get('sort', '')
+        if sort == 'relevance' and not self.cleaned_data.get('q'):
+            return ''
+        return sort
+
+# Upper bound of requests changed by one bulk action
+BULK_ACTION_MAX_REQUESTS = 500
+
+class RequestBulkActionForm(forms.Form):
+    """
+    Status / assignment / priority change applied to several requests of mixed types at once.
+    Selected requests are posted as 'selected' values of the form "<request_type>:<pk>".
+    Empty fields mean "leave unchanged".
+    """
+    selected = forms.Field(widget=forms.MultipleHiddenInput, label='Selected Requests')
+    status = forms.ChoiceField(
+        choices=[('', 'Status: no change')] + list(STATUS_CHOICES),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    assigned_to = forms.ModelChoiceField(
+        queryset=User.objects.filter(is_staff=True).order_by('first_name', 'last_name'),
+        required=False,
+        empty_label="Assignment: no change",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    unassign = forms.BooleanField(
+        required=False,
+        label='Unassign',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    priority = forms.ChoiceField(
+        # Only complaints and service requests have a priority; other selected types are left unchanged
+        choices=[('', 'Priority: no change')] + list(Complaint.PRIORITY_CHOICES),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
+    def clean_selected(self):
+        values = self.cleaned_data.get('selected') or []
+        if isinstance(values, str):
+            values = [values]
+        selected = {}
+        for value in values:
+            request_type, _, pk = str(value).partition(':')
+            if request_type not in dict(REQUEST_TYPE_CHOICES) or not request_type or not pk.isdigit():
+                raise forms.ValidationError("Invalid request selection.")
+            selected.setdefault(request_type, set()).add(int(pk))
+        count = sum(len(pks) for pks in selected.values())
+        if not count:
+            raise forms.ValidationError("Select at least one request.")
+        if count > BULK_ACTION_MAX_REQUESTS:
+            raise forms.ValidationError(f"Select at most {BULK_ACTION_MAX_REQUESTS} requests at a time.")
+        return selected
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('unassign') and cleaned_data.get('assigned_to'):
+            raise forms.ValidationError("Choose either a staff member or 'Unassign', not both.")
+        if not (cleaned_data.get('status') or cleaned_data.get('assigned_to')
+                or cleaned_data.get('unassign') or cleaned_data.get('priority')):
+            raise forms.ValidationError("Choose a status, assignment or priority to apply.")
+        return cleaned_data
+
+class SavedFilterViewForm(forms.Form):
+    """
+    Saves the RequestFilterForm parameters of the current list page ('query', its query string)
+    under a name. Saving an existing name replaces that view's filters.
+    """
+    name = forms.CharField(
+        max_length=100,
+        label='View Name',
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g. My in-progress emergencies'})
+    )
+    query = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean_query(self):
+        filter_form = RequestFilterForm(QueryDict(self.cleaned_data.get('query') or ''))
+        if not filter_form.is_valid():
+            raise forms.ValidationError("The current filters are not valid.")
+        # Keep the raw parameter values, so the saved view links back to the same list page
+        filters = {
+            field_name: filter_form.data[field_name] for field_name in filter_form.fields
+            if filter_form.cleaned_data.get(field_name) and filter_form.data.get(field_name)
+        }
+        if not filters:
+            raise forms.ValidationError("Apply at least one filter before saving a view.")
+        return filters
+
+# Granularities supported by the dashboard trend endpoint
+TREND_GRANULARITY_CHOICES = (
+    ('day', 'Daily'),
+    ('week', 'Weekly'),
+    ('month', 'Monthly'),
+    ('year', 'Yearly'),
+)
+
+class DashboardChartForm(forms.Form):
+    """
+    Query parameters of the dashboard statistics and trend JSON endpoints.
+    """
+    days = forms.IntegerField(required=False, min_value=1, max_value=3650, label='Range (days)')
+    granularity = forms.ChoiceField(choices=TREND_GRANULARITY_CHOICES, required=False, label='Granularity')
+    request_type = forms.ChoiceField(choices=REQUEST_TYPE_CHOICES, required=False, label='Request Type')
+    delta = forms.BooleanField(required=False, label='Delta-encode series')
+
+    def clean_days(self):
+        return self.cleaned_data.get('days') or 365
+
+    def clean_granularity(self):
+        return self.cleaned_data.get('granularity') or 'day'
+
 # --- ModelForms for Request Type/Category Management ---
 class ComplaintCategoryForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,77 @@
+# support_dashboard/live.py
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.urls import reverse
+
+from unified_requests.constants import STATUS_CHOICES
+
+from .rows import get_assignee_name
+
+logger = logging.getLogger(__name__)
+
+STATUS_DISPLAY = dict(STATUS_CHOICES)
+
+# Channel layer groups of open dashboards: superusers watch everything, staff their own assignments
+ALL_REQUESTS_GROUP = 'support_dashboard.all'
+
+
+def get_assignee_group(user_id):
+    return f'support_dashboard.assignee.{user_id}'
+
+
+def get_dashboard_groups(user):
+    """
+    Returns the groups a dashboard websocket of this user joins, mirroring scope_queryset_for_user().
+    """
+    if user.is_staff and not user.is_superuser:
+        return [get_assignee_group(user.pk)]
+    return [ALL_REQUESTS_GROUP]
+
+
+def serialize_request_row(request_type, request_obj):
+    """
+    Returns the columns of a request list row as JSON-friendly values.
+    """
+    assignee = request_obj.assigned_to if request_obj.assigned_to_id else None
+    return {
+        'key': f'{request_type}:{request_obj.pk}',
+        'type': request_type,
+        'pk': request_obj.pk,
+        'subject': request_obj.subject,
+        'status': request_obj.status,
+        'status_display': STATUS_DISPLAY.get(request_obj.status, request_obj.status),
+        'assigned_to_id': request_obj.assigned_to_id,
+        'assignee_name': get_assignee_name(assignee.username, assignee.first_name, assignee.last_name) if assignee else None,
+        'submitted_at': request_obj.submitted_at.isoformat() if request_obj.submitted_at else None,
+        'due_at': request_obj.due_at.isoformat() if request_obj.due_at else None,
+        'url': reverse('support_dashboard:request_detail', kwargs={'request_type': request_type, 'pk': request_obj.pk}),
+    }
+
+
+def broadcast_request_event(event, row, assignee_id=None, previous_assignee_id=None):
+    """
+    Pushes a request event ('created', 'updated', 'assigned' or 'deleted') to the open dashboards that
+    can see the request. When the assignee changed, the previous assignee gets a 'removed' event instead.
+    Failures are logged and never break the write that triggered them.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    messages = [(ALL_REQUESTS_GROUP, event)]
+    if assignee_id:
+        messages.append((get_assignee_group(assignee_id), event))
+    if previous_assignee_id and previous_assignee_id != assignee_id:
+        messages.append((get_assignee_group(previous_assignee_id), 'removed'))
+
+    for group, group_event in messages:
+        try:
+            async_to_sync(channel_layer.group_send)(group, {
+                'type': 'request.event',
+                'event': group_event,
+                'request': row,
+            })
+        except Exception as e:
+            logger.warning(f"Could not push dashboard event for {row['key']} to {group}: {e}")
@@ -0,0 +1,39 @@
+# support_dashboard/management/commands/backfill_request_daily_stats.py
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from support_dashboard.trends import refresh_request_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Backfills the RequestDailyStat rollup used by the dashboard trend chart."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help="Number of days of history to rebuild, ending today (default: 365).",
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=31,
+            help="Number of days recomputed per transaction (default: 31).",
+        )
+
+    def handle(self, *args, **options):
+        today = datetime.date.today()
+        start_date = today - datetime.timedelta(days=options['days'] - 1)
+        chunk = datetime.timedelta(days=options['chunk_days'])
+
+        total_rows = 0
+        while start_date <= today:
+            end_date = min(start_date + chunk - datetime.timedelta(days=1), today)
+            rows = refresh_request_daily_stats(start_date, end_date)
+            total_rows += rows
+            self.stdout.write(f"{start_date} .. {end_date}: {rows} row(s)")
+            start_date = end_date + datetime.timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Request daily stats backfilled: {total_rows} row(s)."))
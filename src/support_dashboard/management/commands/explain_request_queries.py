@@ -0,0 +1,90 @@
+# support_dashboard/management/commands/explain_request_queries.py
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from unified_requests.constants import OPEN_STATUSES
+from support_dashboard.filters import REQUEST_MODEL_MAP
+
+
+class RollbackIndexes(Exception):
+    """Raised to roll back the temporarily dropped indexes."""
+
+
+def get_hot_queries(model_class, staff_user, submitter):
+    """
+    Returns [(label, queryset)] of the queries the access pattern indexes are meant for.
+    """
+    now = timezone.now()
+    return [
+        ("overdue scan", model_class.objects.filter(status__in=OPEN_STATUSES, due_at__lt=now)),
+        ("least time remaining", model_class.objects.filter(
+            status__in=OPEN_STATUSES, due_at__isnull=False,
+        ).order_by('due_at', 'pk')[:25]),
+        ("staff dashboard", model_class.objects.filter(assigned_to=staff_user).order_by('-submitted_at')[:25]),
+        ("open for staff", model_class.objects.filter(
+            assigned_to=staff_user, status__in=OPEN_STATUSES,
+        ).order_by('-submitted_at')[:25]),
+        ("user dashboard", model_class.objects.filter(submitted_by=submitter).order_by('-submitted_at')[:25]),
+        ("resolved today", model_class.objects.filter(
+            status='resolved', resolved_at__gte=now.replace(hour=0, minute=0, second=0, microsecond=0),
+        )),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the query plan and run time of the hot request queries. With --compare, the access "
+        "pattern indexes are first dropped inside a transaction that is rolled back, to show the plans "
+        "without them. --compare locks the request tables while it runs; use it on a copy of the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help="Also show the plans without the access pattern indexes (before/after).",
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help="Pass ANALYZE to EXPLAIN on PostgreSQL, which runs the queries.",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        # Any staff member / submitter; the plans only depend on the shape of the query
+        staff_user = User.objects.filter(is_staff=True).first()
+        submitter = User.objects.filter(is_staff=False).first() or staff_user
+        explain_options = {'analyze': True} if options['analyze'] and connection.vendor == 'postgresql' else {}
+
+        if options['compare']:
+            # The dropped indexes come back with the rollback, which needs transactional DDL
+            if connection.vendor not in ('postgresql', 'sqlite'):
+                raise CommandError("--compare is only supported on PostgreSQL and SQLite.")
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    for model_class in REQUEST_MODEL_MAP.values():
+                        for index in model_class._meta.indexes:
+                            cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+                    self.stdout.write(self.style.MIGRATE_HEADING("Before (without access pattern indexes)"))
+                    self.explain_all(staff_user, submitter, explain_options)
+                    raise RollbackIndexes
+            except RollbackIndexes:
+                pass
+            self.stdout.write(self.style.MIGRATE_HEADING("After (with access pattern indexes)"))
+
+        self.explain_all(staff_user, submitter, explain_options)
+
+    def explain_all(self, staff_user, submitter, explain_options):
+        for request_type, model_class in REQUEST_MODEL_MAP.items():
+            for label, queryset in get_hot_queries(model_class, staff_user, submitter):
+                started = time.perf_counter()
+                list(queryset)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.stdout.write(self.style.SQL_KEYWORD(f"{request_type} / {label}: {elapsed_ms:.1f} ms"))
+                self.stdout.write(queryset.explain(**explain_options))
+                self.stdout.write("")
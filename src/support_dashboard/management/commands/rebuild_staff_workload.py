@@ -0,0 +1,12 @@
+# support_dashboard/management/commands/rebuild_staff_workload.py
+from django.core.management.base import BaseCommand
+
+from support_dashboard.workload import rebuild_staff_workload
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-staff open workload counters used for auto-assignment from the request tables."
+
+    def handle(self, *args, **options):
+        rows = rebuild_staff_workload()
+        self.stdout.write(self.style.SUCCESS(f"Staff workload rebuilt: {rows} counter row(s)."))
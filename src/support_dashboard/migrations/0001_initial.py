@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-16 20:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('new_count', models.PositiveIntegerField(default=0)),
+                ('resolved_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assignee', models.ForeignKey(blank=True, help_text='Staff member the counted requests are assigned to (empty for unassigned requests).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Request Daily Statistic',
+                'verbose_name_plural': 'Request Daily Statistics',
+                'ordering': ['date', 'request_type'],
+                'indexes': [models.Index(fields=['date', 'request_type'], name='daily_stat_date_type_idx'), models.Index(fields=['assignee', 'date'], name='daily_stat_assignee_date_idx')],
+            },
+        ),
+    ]
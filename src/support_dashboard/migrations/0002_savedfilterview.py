@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-16 21:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support_dashboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedFilterView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('filters', models.JSONField(blank=True, default=dict, help_text='Non-empty RequestFilterForm parameters, e.g. {"status": "in_progress", "request_type": "emergency"}.')),
+                ('request_type', models.CharField(blank=True, choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('counts', models.JSONField(blank=True, default=dict, help_text='Matching requests per request type slug.')),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('counts_refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_filter_views', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Saved Filter View',
+                'verbose_name_plural': 'Saved Filter Views',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['request_type', 'owner'], name='saved_view_type_owner_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'name'), name='saved_view_owner_name_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.2 on 2026-10-16 22:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support_dashboard', '0002_savedfilterview'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('open_count', models.PositiveIntegerField(default=0)),
+                ('auto_assign', models.BooleanField(default=False, help_text='Assign new requests of this type to this staff member when they have the lightest workload.')),
+                ('last_assigned_at', models.DateTimeField(blank=True, help_text='Last automatic assignment; staff with equal workloads take turns.', null=True)),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workloads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Staff Workload',
+                'verbose_name_plural': 'Staff Workloads',
+                'ordering': ['staff', 'request_type'],
+                'indexes': [models.Index(fields=['request_type', 'auto_assign', 'open_count', 'last_assigned_at'], name='staff_workload_pick_idx')],
+                'constraints': [models.UniqueConstraint(fields=('staff', 'request_type'), name='staff_workload_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support_dashboard', '0003_staffworkload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestDailyStatDirtyDate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Request Daily Statistic Dirty Date',
+                'verbose_name_plural': 'Request Daily Statistic Dirty Dates',
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -1,3 +1,146 @@
+# support_dashboard/models.py
 from django.db import models
+from django.conf import settings
+from django.utils.http import urlencode
+from unified_requests.constants import REQUEST_TYPE_CHOICES
 
-# Create your models here.
+
+class RequestDailyStat(models.Model):
+    """
+    Daily rollup of new and resolved requests per request type and assignee.
+    Maintained by the 'update_request_daily_stats' Celery task and backfilled with the
+    'backfill_request_daily_stats' management command, so the trend chart reads at most
+    days x types x assignees precomputed rows instead of scanning the request tables.
+    """
+    date = models.DateField()
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='request_daily_stats',
+        help_text="Staff member the counted requests are assigned to (empty for unassigned requests)."
+    )
+    new_count = models.PositiveIntegerField(default=0)
+    resolved_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Request Daily Statistic"
+        verbose_name_plural = "Request Daily Statistics"
+        ordering = ['date', 'request_type']
+        indexes = [
+            models.Index(fields=['date', 'request_type'], name='daily_stat_date_type_idx'),
+            models.Index(fields=['assignee', 'date'], name='daily_stat_assignee_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.request_type} (assignee #{self.assignee_id}): +{self.new_count} / {self.resolved_count} resolved"
+
+
+class RequestDailyStatDirtyDate(models.Model):
+    """
+    Day whose RequestDailyStat rows still count a deleted request. Deleted rows leave no updated_at
+    behind, so the request delete signal records their days here and the next rollup run recomputes them.
+    """
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Request Daily Statistic Dirty Date"
+        verbose_name_plural = "Request Daily Statistic Dirty Dates"
+        ordering = ['date']
+
+    def __str__(self):
+        return str(self.date)
+
+
+class SavedFilterView(models.Model):
+    """
+    Named RequestFilterForm combination of a staff member (e.g. "My in-progress emergencies"), shown in
+    the dashboard sidebar with a badge count. The counts are materialized per request type and refreshed
+    for the affected views when a request changes (see support_dashboard.saved_views), so rendering the
+    sidebar never runs the filters.
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='saved_filter_views',
+    )
+    name = models.CharField(max_length=100)
+    filters = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Non-empty RequestFilterForm parameters, e.g. {\"status\": \"in_progress\", \"request_type\": \"emergency\"}."
+    )
+    # Copy of filters['request_type'] so the views affected by a change can be selected in SQL
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES, blank=True)
+    counts = models.JSONField(default=dict, blank=True, help_text="Matching requests per request type slug.")
+    total_count = models.PositiveIntegerField(default=0)
+    counts_refreshed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Saved Filter View"
+        verbose_name_plural = "Saved Filter Views"
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'name'], name='saved_view_owner_name_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['request_type', 'owner'], name='saved_view_type_owner_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.owner}): {self.total_count}"
+
+    def save(self, *args, **kwargs):
+        self.request_type = self.filters.get('request_type', '')
+        super().save(*args, **kwargs)
+
+    def get_query_string(self):
+        return urlencode(self.filters)
+
+
+class StaffWorkload(models.Model):
+    """
+    Number of open (new or in progress) requests of one type assigned to a staff member.
+    Kept current by the request signals and bulk actions (see support_dashboard.workload) and rebuilt
+    with the 'rebuild_staff_workload' management command. Rows with auto_assign enabled take part in
+    the least-loaded auto-assignment of new submissions.
+    """
+    staff = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='workloads',
+    )
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    open_count = models.PositiveIntegerField(default=0)
+    auto_assign = models.BooleanField(
+        default=False,
+        help_text="Assign new requests of this type to this staff member when they have the lightest workload."
+    )
+    last_assigned_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last automatic assignment; staff with equal workloads take turns."
+    )
+
+    class Meta:
+        verbose_name = "Staff Workload"
+        verbose_name_plural = "Staff Workloads"
+        ordering = ['staff', 'request_type']
+        constraints = [
+            models.UniqueConstraint(fields=['staff', 'request_type'], name='staff_workload_unique'),
+        ]
+        indexes = [
+            # Least-loaded pick: the first entry of this index for the request type
+            models.Index(
+                fields=['request_type', 'auto_assign', 'open_count', 'last_assigned_at'],
+                name='staff_workload_pick_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.staff} - {self.get_request_type_display()}: {self.open_count} open"
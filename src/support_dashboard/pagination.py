@@ -0,0 +1,183 @@
+# support_dashboard/pagination.py
+import base64
+import binascii
+import datetime
+import heapq
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+
+from .concurrency import gather_per_model
+from .filters import REQUEST_MODEL_MAP
+
+# Rank of each request type, used to break ties between rows of different
+# models that share the same submitted_at timestamp.
+TYPE_RANKS = {model_name: rank for rank, model_name in enumerate(REQUEST_MODEL_MAP)}
+
+# Sort option of the request list -> (sort field, descending). Rows are ordered by (field, type rank, pk).
+SORT_ORDERS = {
+    '': ('submitted_at', True), # Newest first
+    'due': ('due_at', False), # Least time remaining first; requests without a due date are left out
+    'relevance': ('search_rank', True), # Best match first; annotated on searches only, see filters.annotate_search_rank
+}
+
+# Sort field -> parser of its cursor values; timestamps otherwise
+CURSOR_VALUE_PARSERS = {
+    'search_rank': float,
+}
+
+
+def encode_cursor(key):
+    """
+    Encodes a (sort field value, type_rank, pk) sort key into an opaque, URL-safe cursor.
+    """
+    value, rank, pk = key
+    value = value.isoformat() if isinstance(value, datetime.datetime) else repr(value)
+    raw = f"{value}|{rank}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, field='submitted_at'):
+    """
+    Decodes a cursor produced by encode_cursor() for the given sort field. Returns None for missing or
+    tampered cursors, which makes the paginator fall back to the first page.
+    """
+    if not cursor:
+        return None
+    parse_value = CURSOR_VALUE_PARSERS.get(field, datetime.datetime.fromisoformat)
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, rank, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return (parse_value(value), int(rank), int(pk))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def _cursor_q(rank, cursor, direction, field='submitted_at'):
+    """
+    Builds the keyset condition for one model so that only rows with a sort key strictly
+    below ('lt') or above ('gt') the cursor match.
+    """
+    value, cursor_rank, cursor_pk = cursor
+    if direction == 'lt':
+        if rank < cursor_rank:
+            return Q(**{f'{field}__lte': value})
+        if rank > cursor_rank:
+            return Q(**{f'{field}__lt': value})
+        return Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': cursor_pk})
+
+    if rank > cursor_rank:
+        return Q(**{f'{field}__gte': value})
+    if rank < cursor_rank:
+        return Q(**{f'{field}__gt': value})
+    return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': cursor_pk})
+
+
+def _keyed_stream(model_name, rows, field='submitted_at'):
+    """
+    Yields (sort_key, obj) pairs for one model, tagging each object with its request type slug.
+    """
+    rank = TYPE_RANKS[model_name]
+    for obj in rows:
+        obj.request_type_slug = model_name
+        yield (getattr(obj, field), rank, obj.pk), obj
+
+
+class KeysetPage:
+    """
+    One page of the unified request list, in the order of one of the SORT_ORDERS.
+    Cursors point at the first/last row of the page; no COUNT query is ever run.
+    """
+    def __init__(self, items, has_next, has_previous):
+        self.object_list = [obj for _, obj in items]
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = encode_cursor(items[-1][0]) if items and has_next else None
+        self.previous_cursor = encode_cursor(items[0][0]) if items and has_previous else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def get_page_querysets(querysets, page_size, after=None, before=None, sort=''):
+    """
+    Applies the keyset condition, ordering and page_size + 1 limit to every request queryset.
+    Returns (limited querysets by model name, backwards, after_key); nothing is evaluated yet.
+    """
+    field, descending = SORT_ORDERS.get(sort, SORT_ORDERS[''])
+    after_key = decode_cursor(after, field)
+    before_key = decode_cursor(before, field) if after_key is None else None
+    backwards = before_key is not None
+    # Walking towards smaller sort keys: forwards on a descending sort, backwards on an ascending one
+    direction = 'lt' if descending != backwards else 'gt'
+    ordering = (f'-{field}', '-pk') if direction == 'lt' else (field, 'pk')
+    cursor_key = before_key if backwards else after_key
+
+    limited = {}
+    for model_name, queryset in querysets.items():
+        rank = TYPE_RANKS[model_name]
+        try:
+            nullable = queryset.model._meta.get_field(field).null
+        except FieldDoesNotExist:
+            nullable = False # Annotation, e.g. the coalesced search_rank
+        if nullable:
+            queryset = queryset.filter(**{f'{field}__isnull': False})
+        if cursor_key is not None:
+            queryset = queryset.filter(_cursor_q(rank, cursor_key, direction, field))
+        limited[model_name] = queryset.order_by(*ordering)[:page_size + 1]
+    return limited, backwards, after_key
+
+
+def merge_page(rows_by_model, page_size, backwards, after_key, sort=''):
+    """
+    Merges the per-model row streams of get_page_querysets() into a KeysetPage.
+    """
+    field, descending = SORT_ORDERS.get(sort, SORT_ORDERS[''])
+    streams = [_keyed_stream(model_name, rows, field) for model_name, rows in rows_by_model.items()]
+    merged = heapq.merge(*streams, key=lambda item: item[0], reverse=descending != backwards)
+    items = list(islice(merged, page_size + 1))
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    if backwards:
+        items.reverse()
+        return KeysetPage(items, has_next=True, has_previous=has_more)
+    return KeysetPage(items, has_next=has_more, has_previous=after_key is not None)
+
+
+def paginate_requests(querysets, page_size, after=None, before=None, row_factory=None, sort=''):
+    """
+    Returns a KeysetPage over several request querysets ordered by (submitted_at, type, pk) descending,
+    or by another of the SORT_ORDERS (e.g. 'due': due_at ascending, for the time remaining).
+
+    Each queryset is ordered and limited to page_size + 1 rows in SQL and the per-model streams are
+    merged lazily with heapq.merge, so a page costs at most (page_size + 1) * len(querysets) rows.
+    'after' continues to the next page, 'before' goes back to the previous one.
+    'row_factory(model_name, queryset)' optionally turns each limited queryset into lighter row objects
+    (anything with pk, the sort field and a settable request_type_slug); model instances are used otherwise.
+    """
+    limited, backwards, after_key = get_page_querysets(querysets, page_size, after, before, sort)
+    rows_by_model = {
+        model_name: row_factory(model_name, queryset) if row_factory is not None else queryset
+        for model_name, queryset in limited.items()
+    }
+    return merge_page(rows_by_model, page_size, backwards, after_key, sort)
+
+
+async def apaginate_requests(querysets, page_size, after=None, before=None, row_factory=None, sort=''):
+    """
+    Async variant of paginate_requests(): the per-model page queries run concurrently
+    in the dashboard thread pool before the rows are merged.
+    """
+    limited, backwards, after_key = get_page_querysets(querysets, page_size, after, before, sort)
+
+    def fetch_rows(model_name):
+        queryset = limited[model_name]
+        return list(row_factory(model_name, queryset) if row_factory is not None else queryset)
+
+    rows_by_model = await gather_per_model(fetch_rows, limited)
+    return merge_page(rows_by_model, page_size, backwards, after_key, sort)
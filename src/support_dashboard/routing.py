@@ -0,0 +1,8 @@
+# support_dashboard/routing.py
+from django.urls import path
+
+from .consumers import DashboardConsumer
+
+websocket_urlpatterns = [
+    path('ws/support-dashboard/', DashboardConsumer.as_asgi()),
+]
@@ -0,0 +1,80 @@
+# support_dashboard/rows.py
+from django.utils import timezone
+
+from unified_requests.constants import STATUS_CHOICES, OPEN_STATUSES
+
+STATUS_DISPLAY = dict(STATUS_CHOICES)
+
+# Columns the staff request table displays; the assignee's name is joined in the same query
+REQUEST_ROW_FIELDS = (
+    'pk',
+    'subject',
+    'status',
+    'submitted_at',
+    'due_at',
+    'assigned_to_id',
+    'assigned_to__username',
+    'assigned_to__first_name',
+    'assigned_to__last_name',
+)
+
+
+class RequestRow:
+    """
+    Lightweight, read-only row of the staff request table.
+    Carries only the displayed columns, so the large TextFields are never loaded
+    and the template never touches a related object.
+    """
+    __slots__ = (
+        'pk', 'request_type_slug', 'subject', 'status', 'submitted_at', 'due_at', 'assigned_to_id', 'assignee_name',
+        'search_rank',
+    )
+
+    def __init__(self, pk, request_type_slug, subject, status, submitted_at, due_at, assigned_to_id, assignee_name,
+                 search_rank=None):
+        self.pk = pk
+        self.request_type_slug = request_type_slug
+        self.subject = subject
+        self.status = status
+        self.submitted_at = submitted_at
+        self.due_at = due_at
+        self.assigned_to_id = assigned_to_id
+        self.assignee_name = assignee_name
+        self.search_rank = search_rank # Sort key of the relevance order, when the list is sorted by it
+
+    def get_status_display(self):
+        return STATUS_DISPLAY.get(self.status, self.status)
+
+    def is_open(self):
+        return self.status in OPEN_STATUSES
+
+    def is_overdue(self):
+        # Checked when the page is rendered, so cached pages stay accurate
+        return self.is_open() and self.due_at is not None and self.due_at < timezone.now()
+
+
+def get_assignee_name(username, first_name, last_name):
+    # Same as get_full_name|default:username on the user instance
+    return f"{first_name or ''} {last_name or ''}".strip() or username
+
+
+def project_request_rows(request_type, queryset):
+    """
+    Yields a RequestRow per request of the queryset, reading only REQUEST_ROW_FIELDS (and search_rank,
+    when annotated) in a single query.
+    """
+    rank_fields = ('search_rank',) if 'search_rank' in queryset.query.annotations else ()
+    for pk, subject, status, submitted_at, due_at, assigned_to_id, username, first_name, last_name, *search_rank in (
+        queryset.values_list(*REQUEST_ROW_FIELDS, *rank_fields)
+    ):
+        yield RequestRow(
+            pk=pk,
+            request_type_slug=request_type,
+            subject=subject,
+            status=status,
+            submitted_at=submitted_at,
+            due_at=due_at,
+            assigned_to_id=assigned_to_id,
+            assignee_name=get_assignee_name(username, first_name, last_name) if assigned_to_id else None,
+            search_rank=search_rank[0] if search_rank else None,
+        )
@@ -0,0 +1,75 @@
+# support_dashboard/saved_views.py
+from django.db.models import Q
+from django.utils import timezone
+
+from .filters import get_filtered_querysets
+from .forms import RequestFilterForm
+from .models import SavedFilterView
+
+
+def count_saved_view(saved_view, request_types=None):
+    """
+    Recounts a saved view for the given request types (all of them by default) with the owner's
+    dashboard scope, one COUNT query per type, and stores the result. The other types keep their counts.
+    Filters that no longer validate (e.g. a deleted assignee) count as matching nothing rather than everything.
+    """
+    filter_form = RequestFilterForm(saved_view.filters)
+    if filter_form.is_valid():
+        querysets = get_filtered_querysets(saved_view.owner, filter_form)
+        counts = {
+            request_type: (
+                queryset.count() if request_types is None or request_type in request_types
+                else saved_view.counts.get(request_type, 0)
+            )
+            for request_type, queryset in querysets.items()
+        }
+    else:
+        counts = {}
+
+    saved_view.counts = counts
+    saved_view.total_count = sum(counts.values())
+    saved_view.counts_refreshed_at = timezone.now()
+    # update() so a concurrent rename or delete isn't overwritten
+    SavedFilterView.objects.filter(pk=saved_view.pk).update(
+        counts=saved_view.counts,
+        total_count=saved_view.total_count,
+        counts_refreshed_at=saved_view.counts_refreshed_at,
+    )
+    return saved_view
+
+
+def get_affected_saved_views(request_type, assignee_ids=()):
+    """
+    Returns the saved views whose count can change when a request of this type, assigned now or before
+    to the given staff members, changes: views of all types or of this one, owned by a superuser
+    (who sees everything) or by one of those assignees (other staff only see their own requests).
+    """
+    owners = Q(owner__is_superuser=True)
+    assignee_ids = [user_id for user_id in assignee_ids if user_id]
+    if assignee_ids:
+        owners |= Q(owner_id__in=assignee_ids)
+    return (
+        SavedFilterView.objects
+        .filter(owners, owner__is_staff=True, request_type__in=['', request_type])
+        .select_related('owner')
+    )
+
+
+def refresh_saved_view_counts(request_type=None, assignee_ids=()):
+    """
+    Recounts the saved views affected by a change (see get_affected_saved_views()), only for that
+    request type. Without a request type every saved view of every staff member is recounted in full.
+    Returns the number of views refreshed.
+    """
+    if request_type is None:
+        saved_views = SavedFilterView.objects.filter(owner__is_staff=True).select_related('owner')
+        request_types = None
+    else:
+        saved_views = get_affected_saved_views(request_type, assignee_ids)
+        request_types = [request_type]
+
+    refreshed = 0
+    for saved_view in saved_views.iterator():
+        count_saved_view(saved_view, request_types)
+        refreshed += 1
+    return refreshed
@@ -0,0 +1,106 @@
+# support_dashboard/signals.py
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from complaints.models import Complaint
+from services.models import ServiceRequest
+from inquiries.models import Inquiry
+from emergencies.models import EmergencyReport
+
+from unified_requests.archiving import is_archiving, requests_archived
+from unified_requests.indexing import get_request_type_for_model
+
+from .caching import invalidate_request_caches
+from .live import broadcast_request_event, serialize_request_row
+from .tasks import refresh_saved_filter_view_counts
+from .trends import mark_rollup_dates_dirty
+from .workload import adjust_staff_workload, get_workload_changes
+
+
+def queue_saved_view_refresh(request_type, *assignee_ids):
+    # Recounted by a worker after the commit, so the save itself only pays for queueing the task
+    assignee_ids = sorted({user_id for user_id in assignee_ids if user_id})
+    transaction.on_commit(lambda: refresh_saved_filter_view_counts.delay(request_type, assignee_ids))
+
+
+@receiver(post_init, sender=Complaint)
+@receiver(post_init, sender=ServiceRequest)
+@receiver(post_init, sender=Inquiry)
+@receiver(post_init, sender=EmergencyReport)
+def remember_loaded_assignee(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred assigned_to_id or status doesn't trigger a query
+    instance._dashboard_loaded_assignee_id = instance.__dict__.get('assigned_to_id')
+    instance._dashboard_loaded_status = instance.__dict__.get('status')
+    instance._dashboard_loaded_resolved_at = instance.__dict__.get('resolved_at')
+
+
+@receiver(post_save, sender=Complaint)
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_save, sender=Inquiry)
+@receiver(post_save, sender=EmergencyReport)
+def update_dashboards_on_save(sender, instance, created=False, raw=False, **kwargs):
+    previous_assignee_id = getattr(instance, '_dashboard_loaded_assignee_id', None)
+    previous_status = None if created else getattr(instance, '_dashboard_loaded_status', None)
+    previous_resolved_at = getattr(instance, '_dashboard_loaded_resolved_at', None)
+    # Both the old and the new assignee's dashboards change on reassignment. Bumped once committed,
+    # so a concurrent reader can't cache the old data under the new version
+    transaction.on_commit(partial(invalidate_request_caches, instance.assigned_to_id, previous_assignee_id))
+    instance._dashboard_loaded_assignee_id = instance.assigned_to_id
+    instance._dashboard_loaded_status = instance.status
+    instance._dashboard_loaded_resolved_at = instance.resolved_at
+    if raw:
+        return
+    if previous_resolved_at and previous_resolved_at != instance.resolved_at:
+        # Reopened (or re-resolved): the old resolution day is no longer found by the rollup's updated_at scan
+        mark_rollup_dates_dirty(previous_resolved_at)
+
+    request_type = get_request_type_for_model(sender)
+    adjust_staff_workload(request_type, get_workload_changes(
+        previous_assignee_id, previous_status, instance.assigned_to_id, instance.status,
+    ))
+    queue_saved_view_refresh(request_type, instance.assigned_to_id, previous_assignee_id)
+
+    if created:
+        event = 'created'
+    elif instance.assigned_to_id != previous_assignee_id:
+        event = 'assigned'
+    else:
+        event = 'updated'
+    # Serialized now, pushed once the change is visible to the dashboards' own queries
+    row = serialize_request_row(request_type, instance)
+    assignee_id = instance.assigned_to_id
+    transaction.on_commit(lambda: broadcast_request_event(event, row, assignee_id, previous_assignee_id))
+
+
+@receiver(post_delete, sender=Complaint)
+@receiver(post_delete, sender=ServiceRequest)
+@receiver(post_delete, sender=Inquiry)
+@receiver(post_delete, sender=EmergencyReport)
+def update_dashboards_on_delete(sender, instance, **kwargs):
+    # Archival deletes finished requests in chunks; see update_dashboards_on_archive()
+    if is_archiving():
+        return
+    previous_assignee_id = getattr(instance, '_dashboard_loaded_assignee_id', None)
+    transaction.on_commit(partial(invalidate_request_caches, instance.assigned_to_id, previous_assignee_id))
+    request_type = get_request_type_for_model(sender)
+    # The stored row is what counted, so the loaded values are the ones to take back
+    adjust_staff_workload(request_type, get_workload_changes(
+        previous_assignee_id, getattr(instance, '_dashboard_loaded_status', None), None, None,
+    ))
+    queue_saved_view_refresh(request_type, instance.assigned_to_id, previous_assignee_id)
+    # The daily rollup still counts the request on its submission and resolution days
+    mark_rollup_dates_dirty(instance.submitted_at, instance.resolved_at)
+    # The pk is cleared once the deletion finishes, so serialize before on_commit
+    row = serialize_request_row(request_type, instance)
+    assignee_id = instance.assigned_to_id
+    transaction.on_commit(lambda: broadcast_request_event('deleted', row, assignee_id))
+
+
+@receiver(requests_archived)
+def update_dashboards_on_archive(sender, request_type, request_ids, assignee_ids, **kwargs):
+    # Finished requests don't count towards workloads; the lists, stats and saved view counts still change
+    transaction.on_commit(partial(invalidate_request_caches, *assignee_ids))
+    queue_saved_view_refresh(request_type, *assignee_ids)
@@ -0,0 +1,117 @@
+# support_dashboard/statistics.py
+import datetime
+from dataclasses import dataclass, field, asdict
+
+from django.db.models import Count, Max, Q
+
+from unified_requests.constants import STATUS_CHOICES
+from unified_requests.models import UnifiedRequestIndex
+
+from .concurrency import gather_per_model
+from .filters import REQUEST_MODEL_MAP, scope_queryset_for_user
+
+
+@dataclass
+class DashboardStats:
+    """
+    Summary counters shown on the support dashboard cards and charts.
+    """
+    total_requests: int = 0
+    status_counts: dict = field(default_factory=dict)
+    type_counts: dict = field(default_factory=dict)
+    new_today: int = 0
+    resolved_today: int = 0
+
+    def as_dict(self):
+        # Plain dict for json_script / JsonResponse
+        return asdict(self)
+
+
+def get_statistics_aggregates(today):
+    """
+    Returns the conditional aggregates that compute every dashboard counter of one model in a single query.
+    """
+    aggregates = {
+        'total': Count('pk'),
+        'new_today': Count('pk', filter=Q(submitted_at__date=today)),
+        # Only count if status is 'resolved' AND resolved_at date is today
+        'resolved_today': Count('pk', filter=Q(status='resolved', resolved_at__date=today)),
+    }
+    for status_value, _ in STATUS_CHOICES:
+        if status_value:
+            aggregates[f'status_{status_value}'] = Count('pk', filter=Q(status=status_value))
+    return aggregates
+
+
+def add_model_statistics(stats, model_name, counts):
+    """
+    Folds the aggregate() result of one model into the running DashboardStats.
+    """
+    stats.total_requests += counts['total']
+    stats.type_counts[model_name] += counts['total']
+    stats.new_today += counts['new_today']
+    stats.resolved_today += counts['resolved_today']
+    for status_value in stats.status_counts:
+        stats.status_counts[status_value] += counts[f'status_{status_value}']
+
+
+def get_model_statistics(model_name, user, today):
+    """
+    Runs the single aggregate() query of one request model, scoped to the user.
+    """
+    queryset = scope_queryset_for_user(REQUEST_MODEL_MAP[model_name].objects.all(), user)
+    return queryset.aggregate(**get_statistics_aggregates(today))
+
+
+def _empty_stats(model_names):
+    return DashboardStats(
+        status_counts={value: 0 for value, _ in STATUS_CHOICES if value},
+        type_counts={model_name: 0 for model_name in model_names},
+    )
+
+
+def _selected_models(request_types):
+    return [model_name for model_name in REQUEST_MODEL_MAP if not request_types or model_name in request_types]
+
+
+def get_dashboard_statistics(user, today=None, request_types=None):
+    """
+    Computes the dashboard counters with one aggregate() query per request model,
+    respecting the staff/superuser visibility rules.
+    'request_types' optionally limits the counters to some request type slugs.
+    """
+    today = today or datetime.date.today()
+    model_names = _selected_models(request_types)
+    stats = _empty_stats(model_names)
+    for model_name in model_names:
+        add_model_statistics(stats, model_name, get_model_statistics(model_name, user, today))
+    return stats
+
+
+async def aget_dashboard_statistics(user, today=None, request_types=None):
+    """
+    Async variant of get_dashboard_statistics(): the per-model aggregates run concurrently
+    in the dashboard thread pool, so the latency is that of the slowest one.
+    """
+    today = today or datetime.date.today()
+    model_names = _selected_models(request_types)
+    stats = _empty_stats(model_names)
+    counts = await gather_per_model(get_model_statistics, model_names, user, today)
+    for model_name in model_names:
+        add_model_statistics(stats, model_name, counts[model_name])
+    return stats
+
+
+def get_dashboard_data_version(user, request_types=None):
+    """
+    Returns (last_modified, row_count) of the requests visible to the user, from the cross-type request index.
+    Any create, update or delete changes one of the two, so they make a cheap validator for
+    ETag / Last-Modified on the dashboard JSON endpoints. One indexed query.
+    """
+    entries = UnifiedRequestIndex.objects.all()
+    if user.is_staff and not user.is_superuser:
+        entries = entries.filter(assigned_to=user)
+    if request_types:
+        entries = entries.filter(request_type__in=request_types)
+    version = entries.aggregate(last_modified=Max('updated_at'), row_count=Count('pk'))
+    return version['last_modified'], version['row_count']
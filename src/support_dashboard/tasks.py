@@ -0,0 +1,30 @@
+# support_dashboard/tasks.py
+from celery import shared_task
+
+from .trends import update_request_daily_stats as refresh_rollup
+from .saved_views import refresh_saved_view_counts
+
+
+@shared_task
+def update_request_daily_stats():
+    """
+    Celery beat task that keeps the RequestDailyStat rollup behind the dashboard trend chart current.
+    Only yesterday, today and the days touched by requests changed since the last run are recomputed.
+    Run every 10 minutes by the CELERY_BEAT_SCHEDULE entry in the settings.
+    """
+    refreshed_days = refresh_rollup()
+    print(f"Request daily stats refreshed for {refreshed_days} day(s).")
+    return refreshed_days
+
+
+@shared_task
+def refresh_saved_filter_view_counts(request_type=None, assignee_ids=None):
+    """
+    Recounts the sidebar badges of the saved filter views affected by a change to a request of this type
+    assigned (now or before) to the given staff members. Queued by the request signals and bulk actions
+    once their transaction commits. Without arguments every saved view is recounted, e.g. from a nightly
+    schedule in the django-celery-beat admin panel.
+    """
+    refreshed_views = refresh_saved_view_counts(request_type, assignee_ids or ())
+    print(f"Saved filter view counts refreshed for {refreshed_views} view(s).")
+    return refreshed_views
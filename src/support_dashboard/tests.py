@@ -1,3 +1,428 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from complaints.models import Complaint, ComplaintCategory
+from services.models import ServiceRequest
+from inquiries.models import Inquiry
+from emergencies.models import EmergencyReport
+
+from notifications.coalescing import queue_status_notification
+from notifications.models import PendingStatusNotification
+from unified_requests.history import get_request_timeline
+from unified_requests.indexing import rebuild_request_index
+from unified_requests.models import SLAPolicy, UnifiedRequestIndex
+
+from .bulk import apply_bulk_action, apply_status
+from .caching import GLOBAL_VERSION_KEY, get_assignee_version_key, get_versions, invalidate_request_caches
+from .export import stream_requests_csv
+from .filters import get_filtered_querysets
+from .forms import RequestFilterForm
+from .models import RequestDailyStat, RequestDailyStatDirtyDate, SavedFilterView, StaffWorkload
+from .pagination import paginate_requests
+from .rows import project_request_rows
+from .saved_views import count_saved_view, get_affected_saved_views
+from .statistics import DashboardStats, get_dashboard_statistics
+from .trends import refresh_request_daily_stats, update_request_daily_stats
+from .workload import choose_auto_assignee, rebuild_staff_workload
+
+User = get_user_model()
+
+
+class DashboardStatisticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+
+        Complaint.objects.create(subject='Broken chair', description='Room 101', assigned_to=cls.staff)
+        Complaint.objects.create(subject='Noisy hallway', description='Floor 2', status='in_progress')
+        ServiceRequest.objects.create(subject='Transcript', description='Copy of grades', status='closed')
+        Inquiry.objects.create(subject='Enrollment', description='When?', assigned_to=cls.staff)
+        EmergencyReport.objects.create(subject='Smoke', description='Lab 3', location='Building A')
+
+    def test_one_query_per_request_model(self):
+        with self.assertNumQueries(4):
+            stats = get_dashboard_statistics(self.superuser)
+
+        self.assertIsInstance(stats, DashboardStats)
+        self.assertEqual(stats.total_requests, 5)
+        self.assertEqual(stats.new_today, 5)
+        self.assertEqual(stats.status_counts['new'], 3)
+        self.assertEqual(stats.status_counts['in_progress'], 1)
+        self.assertEqual(stats.status_counts['closed'], 1)
+        self.assertEqual(stats.type_counts, {'complaint': 2, 'service': 1, 'inquiry': 1, 'emergency': 1})
+
+    def test_staff_only_counts_assigned_requests(self):
+        with self.assertNumQueries(4):
+            stats = get_dashboard_statistics(self.staff)
+
+        self.assertEqual(stats.total_requests, 2)
+        self.assertEqual(stats.type_counts['complaint'], 1)
+        self.assertEqual(stats.type_counts['inquiry'], 1)
+
+
+class DashboardCacheTests(TestCase):
+    def test_versions_are_bumped_once_the_change_commits(self):
+        version = get_versions([GLOBAL_VERSION_KEY])[GLOBAL_VERSION_KEY]
+        with self.captureOnCommitCallbacks() as callbacks:
+            Complaint.objects.create(subject='Broken chair', description='Room 101')
+        self.assertEqual(get_versions([GLOBAL_VERSION_KEY])[GLOBAL_VERSION_KEY], version)
+
+        # Only the invalidation; the other callbacks queue Celery tasks
+        for callback in callbacks:
+            if getattr(callback, 'func', None) is invalidate_request_caches:
+                callback()
+        self.assertNotEqual(get_versions([GLOBAL_VERSION_KEY])[GLOBAL_VERSION_KEY], version)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(3):
+            Complaint.objects.create(subject=f'Broken chair {number}', description='Room 101')
+            ServiceRequest.objects.create(subject=f'Transcript {number}', description='Copy of grades')
+            Inquiry.objects.create(subject=f'Enrollment {number}', description='When?')
+            EmergencyReport.objects.create(subject=f'Smoke {number}', description='Lab 3', location='Building A')
+        # Every row shares one timestamp, so the order only comes from the type rank and pk tie-breakers
+        same_time = timezone.now()
+        for model_class in (Complaint, ServiceRequest, Inquiry, EmergencyReport):
+            model_class.objects.update(submitted_at=same_time)
+
+    def get_querysets(self):
+        return {
+            'complaint': Complaint.objects.all(),
+            'service': ServiceRequest.objects.all(),
+            'inquiry': Inquiry.objects.all(),
+            'emergency': EmergencyReport.objects.all(),
+        }
+
+    def get_keys(self, page):
+        return [(obj.request_type_slug, obj.pk) for obj in page]
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        pages = [paginate_requests(self.get_querysets(), 5)]
+        while pages[-1].has_next:
+            pages.append(paginate_requests(self.get_querysets(), 5, after=pages[-1].next_cursor))
+
+        keys = [key for page in pages for key in self.get_keys(page)]
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual(len(keys), len(set(keys)))
+        expected = {
+            (model_name, pk)
+            for model_name, queryset in self.get_querysets().items()
+            for pk in queryset.values_list('pk', flat=True)
+        }
+        self.assertEqual(set(keys), expected)
+
+        # Going back from the last page gives the page before it again
+        previous = paginate_requests(self.get_querysets(), 5, before=pages[-1].previous_cursor)
+        self.assertEqual(self.get_keys(previous), self.get_keys(pages[1]))
+
+    def test_malformed_cursor_falls_back_to_the_first_page(self):
+        first_page = paginate_requests(self.get_querysets(), 5)
+        for cursor in ('not-a-cursor', 'bm90fGF8Y3Vyc29y', '%%%'):
+            page = paginate_requests(self.get_querysets(), 5, after=cursor)
+            self.assertEqual(self.get_keys(page), self.get_keys(first_page))
+            self.assertFalse(page.has_previous)
+
+
+class RequestSearchTests(TestCase):
+    def test_every_match_is_listed(self):
+        # More matches than the search used to return
+        Complaint.objects.bulk_create([
+            Complaint(subject=f'Broken chair {number}', description='Room 101') for number in range(1001)
+        ])
+        Complaint.objects.create(subject='Leak', description='Lab 3')
+        rebuild_request_index(['complaint'])
+        superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+
+        querysets = get_filtered_querysets(superuser, RequestFilterForm({'q': 'broken chair', 'request_type': 'complaint'}))
+        self.assertEqual(querysets['complaint'].count(), 1001)
+
+    def test_relevance_sort_puts_the_best_match_first(self):
+        best = Complaint.objects.create(subject='Chair', description='Chair leg broken, chair wobbles, chair squeaks')
+        other = Complaint.objects.create(
+            subject='Leak', description='Water dripping from the ceiling of lab 3 onto the desk near the chair',
+        )
+        Complaint.objects.create(subject='Noisy hallway', description='Floor 2')
+        superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+
+        filter_form = RequestFilterForm({'q': 'chair', 'sort': 'relevance'})
+        pages = [paginate_requests(get_filtered_querysets(superuser, filter_form), 1, row_factory=project_request_rows, sort='relevance')]
+        pages.append(paginate_requests(
+            get_filtered_querysets(superuser, filter_form), 1,
+            after=pages[0].next_cursor, row_factory=project_request_rows, sort='relevance',
+        ))
+        self.assertEqual([row.pk for page in pages for row in page], [best.pk, other.pk])
+        self.assertFalse(pages[1].has_next)
+
+        # Without a search there is nothing to rank by
+        filter_form = RequestFilterForm({'sort': 'relevance'})
+        self.assertTrue(filter_form.is_valid())
+        self.assertEqual(filter_form.cleaned_data['sort'], '')
+
+
+class RequestExportTests(TestCase):
+    def test_formula_like_text_is_escaped(self):
+        category = ComplaintCategory.objects.create(name='@SUM(A1:A9)')
+        Complaint.objects.create(subject='=HYPERLINK("http://example.com","Open")', description='x', category=category)
+        Complaint.objects.create(subject='Broken chair - Room 101', description='x')
+
+        lines = list(stream_requests_csv({'complaint': Complaint.objects.all()}))
+        self.assertIn("'=HYPERLINK", lines[2])
+        self.assertIn("'@SUM(A1:A9)", lines[2])
+        self.assertIn(',Broken chair - Room 101,', lines[1])
+
+
+class RequestDailyStatTests(TestCase):
+    def test_deleted_request_is_taken_out_of_the_rollup(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        last_week = timezone.now() - datetime.timedelta(days=7)
+        Complaint.objects.filter(pk=complaint.pk).update(submitted_at=last_week, updated_at=last_week)
+        day = timezone.localdate(last_week)
+        refresh_request_daily_stats(day, day)
+        self.assertEqual(RequestDailyStat.objects.get(date=day).new_count, 1)
+
+        Complaint.objects.get(pk=complaint.pk).delete()
+        update_request_daily_stats()
+
+        self.assertFalse(RequestDailyStat.objects.filter(date=day).exists())
+        self.assertFalse(RequestDailyStatDirtyDate.objects.exists())
+
+
+    def test_reopened_request_is_taken_out_of_its_resolution_day(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        submitted_at = timezone.now() - datetime.timedelta(days=10)
+        resolved_at = timezone.now() - datetime.timedelta(days=7)
+        Complaint.objects.filter(pk=complaint.pk).update(
+            status='resolved', submitted_at=submitted_at, resolved_at=resolved_at, updated_at=resolved_at,
+        )
+        resolution_day = timezone.localdate(resolved_at)
+        refresh_request_daily_stats(timezone.localdate(submitted_at), resolution_day)
+        self.assertEqual(RequestDailyStat.objects.get(date=resolution_day).resolved_count, 1)
+
+        complaint = Complaint.objects.get(pk=complaint.pk)
+        complaint.status = 'in_progress'
+        complaint.resolved_at = None
+        complaint.save()
+        update_request_daily_stats()
+
+        self.assertFalse(RequestDailyStat.objects.filter(date=resolution_day, resolved_count__gt=0).exists())
+
+
+class SavedFilterViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+        cls.other_staff = User.objects.create_user(username='other', email='other@example.com', password='pw', is_staff=True)
+
+        Complaint.objects.create(subject='Broken chair', description='Room 101', assigned_to=cls.staff, status='in_progress')
+        Complaint.objects.create(subject='Noisy hallway', description='Floor 2')
+        EmergencyReport.objects.create(subject='Smoke', description='Lab 3', location='Building A', status='in_progress')
+
+    def test_counts_are_materialized_per_request_type(self):
+        saved_view = SavedFilterView.objects.create(owner=self.superuser, name='In progress', filters={'status': 'in_progress'})
+        count_saved_view(saved_view)
+
+        saved_view.refresh_from_db()
+        self.assertEqual(saved_view.total_count, 2)
+        self.assertEqual(saved_view.counts, {'complaint': 1, 'service': 0, 'inquiry': 0, 'emergency': 1})
+
+    def test_staff_view_only_counts_own_requests(self):
+        saved_view = SavedFilterView.objects.create(
+            owner=self.staff, name='My complaints', filters={'request_type': 'complaint'},
+        )
+        with self.assertNumQueries(2):
+            count_saved_view(saved_view)
+        self.assertEqual(saved_view.request_type, 'complaint')
+        self.assertEqual(saved_view.counts, {'complaint': 1})
+
+    def test_affected_views_match_type_and_scope(self):
+        all_types = SavedFilterView.objects.create(owner=self.superuser, name='New', filters={'status': 'new'})
+        own = SavedFilterView.objects.create(owner=self.staff, name='Mine', filters={'request_type': 'complaint'})
+        SavedFilterView.objects.create(owner=self.staff, name='Emergencies', filters={'request_type': 'emergency'})
+        SavedFilterView.objects.create(owner=self.other_staff, name='Theirs', filters={'request_type': 'complaint'})
+
+        affected = set(get_affected_saved_views('complaint', [self.staff.pk]))
+        self.assertEqual(affected, {all_types, own})
+
+
+class StaffWorkloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.busy = User.objects.create_user(username='busy', email='busy@example.com', password='pw', is_staff=True)
+        cls.idle = User.objects.create_user(username='idle', email='idle@example.com', password='pw', is_staff=True)
+
+    def get_open_count(self, staff, request_type='complaint'):
+        return StaffWorkload.objects.get(staff=staff, request_type=request_type).open_count
+
+    def test_counters_follow_assignment_and_status(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101', assigned_to=self.busy)
+        self.assertEqual(self.get_open_count(self.busy), 1)
+
+        complaint.assigned_to = self.idle
+        complaint.save()
+        self.assertEqual(self.get_open_count(self.busy), 0)
+        self.assertEqual(self.get_open_count(self.idle), 1)
+
+        complaint.status = 'resolved'
+        complaint.save()
+        self.assertEqual(self.get_open_count(self.idle), 0)
+
+    def test_rebuild_matches_request_tables(self):
+        Complaint.objects.create(subject='A', description='A', assigned_to=self.busy)
+        Complaint.objects.create(subject='B', description='B', assigned_to=self.busy, status='closed')
+        StaffWorkload.objects.all().update(open_count=7)
+
+        rebuild_staff_workload()
+        self.assertEqual(self.get_open_count(self.busy), 1)
+        self.assertEqual(self.get_open_count(self.idle), 0)
+        self.assertEqual(self.get_open_count(self.idle, 'emergency'), 0)
+
+    @override_settings(SUPPORT_DASHBOARD_AUTO_ASSIGN=True)
+    def test_auto_assignee_is_least_loaded_eligible_staff(self):
+        StaffWorkload.objects.create(staff=self.busy, request_type='complaint', open_count=3, auto_assign=True)
+        StaffWorkload.objects.create(staff=self.idle, request_type='complaint', open_count=1, auto_assign=True)
+        StaffWorkload.objects.create(staff=self.idle, request_type='inquiry', open_count=0)
+
+        self.assertEqual(choose_auto_assignee('complaint'), self.idle.pk)
+        self.assertIsNone(choose_auto_assignee('inquiry'))
+
+    def test_auto_assignment_is_off_by_default(self):
+        StaffWorkload.objects.create(staff=self.idle, request_type='complaint', auto_assign=True)
+        self.assertIsNone(choose_auto_assignee('complaint'))
+
+
+class BulkActionTests(TestCase):
+    """
+    bulk_update() skips the save signals, so every side effect of a bulk action is compared with a
+    single save() of the same change.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        cls.previous = User.objects.create_user(username='prev', email='prev@example.com', password='pw', is_staff=True)
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+        SLAPolicy.objects.create(request_type='complaint', priority='urgent', hours=4)
+        resolved_at = timezone.now() - datetime.timedelta(days=2)
+        cls.bulk_complaint, cls.single_complaint = [
+            Complaint.objects.create(
+                subject=subject, description='Room 101', assigned_to=cls.previous, priority='low',
+                status='resolved', resolved_at=resolved_at,
+            )
+            for subject in ('Bulk chair', 'Single chair')
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def run_change(self, change):
+        """
+        Runs change() and its on_commit callbacks with Celery, the status email flush and the live
+        dashboards mocked out. Returns the calls made to them, without the request-specific rows.
+        """
+        with mock.patch('support_dashboard.signals.refresh_saved_filter_view_counts') as refresh_task, \
+                mock.patch('notifications.coalescing.schedule_status_flush'), \
+                mock.patch('support_dashboard.signals.broadcast_request_event') as single_broadcast, \
+                mock.patch('support_dashboard.bulk.broadcast_request_event') as bulk_broadcast, \
+                mock.patch('support_dashboard.signals.invalidate_request_caches') as single_invalidate, \
+                mock.patch('support_dashboard.bulk.invalidate_request_caches') as bulk_invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+        broadcasts = single_broadcast.call_args_list + bulk_broadcast.call_args_list
+        return {
+            'saved_view_refreshes': [
+                (request_type, set(assignee_ids)) for (request_type, assignee_ids), _ in refresh_task.delay.call_args_list
+            ],
+            'broadcasts': [(event, assignee_id, previous_id) for (event, _, assignee_id, previous_id), _ in broadcasts],
+            'invalidated_assignees': [
+                set(args) for args, _ in single_invalidate.call_args_list + bulk_invalidate.call_args_list
+            ],
+        }
+
+    def save_single(self, status=None, assigned_to=None, priority=None):
+        # Same steps as the request detail page
+        complaint = Complaint.objects.get(pk=self.single_complaint.pk)
+        old_status = complaint.status
+        if status:
+            apply_status(complaint, status)
+        if assigned_to:
+            complaint.assigned_to = assigned_to
+        if priority:
+            complaint.priority = priority
+        complaint._event_actor = self.superuser
+        complaint.save()
+        if complaint.status != old_status:
+            queue_status_notification('complaint', complaint.pk, old_status, complaint.status)
+
+    def get_state(self, complaint):
+        complaint.refresh_from_db()
+        index_row = UnifiedRequestIndex.objects.get(request_type='complaint', request_id=complaint.pk)
+        notification = PendingStatusNotification.objects.filter(request_type='complaint', request_id=complaint.pk)
+        return {
+            'request': (complaint.status, complaint.resolved_at, complaint.assigned_to_id, complaint.priority),
+            'sla_hours': (complaint.due_at - complaint.submitted_at) / datetime.timedelta(hours=1),
+            'index': (index_row.status, index_row.resolved_at, index_row.assigned_to_id, index_row.priority),
+            'events': [
+                (event.event_type, event.from_status, event.to_status, event.from_assignee_id, event.to_assignee_id, event.actor_id)
+                for event in get_request_timeline('complaint', complaint.pk) if event.event_type != 'created'
+            ],
+            'notification': list(notification.values_list('from_status', 'to_status')),
+        }
+
+    def test_bulk_action_matches_single_save(self):
+        change = {'status': 'in_progress', 'assigned_to': self.staff, 'priority': 'urgent'}
+
+        bulk_calls = self.run_change(lambda: apply_bulk_action(
+            self.superuser, {'complaint': {self.bulk_complaint.pk}}, **change,
+        ))
+        bulk_dirty_dates = list(RequestDailyStatDirtyDate.objects.values_list('date', flat=True))
+        single_calls = self.run_change(lambda: self.save_single(**change))
+        single_dirty_dates = list(RequestDailyStatDirtyDate.objects.values_list('date', flat=True))[len(bulk_dirty_dates):]
+
+        bulk_state = self.get_state(self.bulk_complaint)
+        self.assertEqual(bulk_state, self.get_state(self.single_complaint))
+        # Reopening clears resolved_at in the request and the index
+        self.assertEqual(bulk_state['request'], ('in_progress', None, self.staff.pk, 'urgent'))
+        self.assertEqual(bulk_state['index'], bulk_state['request'])
+        self.assertEqual(bulk_state['sla_hours'], 4)
+        self.assertEqual([event[0] for event in bulk_state['events']], ['status', 'assignment'])
+        self.assertEqual(bulk_state['notification'], [('resolved', 'in_progress')])
+
+        # The old resolution day is dropped from the rollup
+        self.assertEqual(bulk_dirty_dates, single_dirty_dates)
+        self.assertEqual(len(bulk_dirty_dates), 1)
+
+        # Both reopened requests are open for the new assignee; the previous one had none open
+        self.assertEqual(StaffWorkload.objects.get(staff=self.staff, request_type='complaint').open_count, 2)
+        self.assertFalse(StaffWorkload.objects.filter(staff=self.previous, open_count__gt=0).exists())
+
+        self.assertEqual(bulk_calls, single_calls)
+        self.assertEqual(bulk_calls['invalidated_assignees'], [{self.staff.pk, self.previous.pk}])
+        self.assertEqual(bulk_calls['broadcasts'], [('assigned', self.staff.pk, self.previous.pk)])
+        self.assertEqual(bulk_calls['saved_view_refreshes'], [('complaint', {self.staff.pk, self.previous.pk})])
+
+    def test_bulk_invalidation_bumps_the_cache_versions(self):
+        keys = [GLOBAL_VERSION_KEY, get_assignee_version_key(self.staff.pk), get_assignee_version_key(self.previous.pk)]
+        versions = get_versions(keys)
+        with self.captureOnCommitCallbacks() as callbacks:
+            apply_bulk_action(self.superuser, {'complaint': {self.bulk_complaint.pk}}, assigned_to=self.staff)
+        self.assertEqual(get_versions(keys), versions)
+
+        # Only the invalidation, registered first; the other callbacks queue Celery tasks and live events
+        callbacks[0]()
+        new_versions = get_versions(keys)
+        self.assertTrue(all(new_versions[key] != versions[key] for key in keys))
+
+    def test_unchanged_requests_are_skipped(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = apply_bulk_action(self.superuser, {'complaint': {self.bulk_complaint.pk}}, status='resolved')
+        self.assertEqual((result.updated_count, result.status_changes), (0, []))
+        self.assertEqual(callbacks, [])
+        self.assertFalse(PendingStatusNotification.objects.exists())
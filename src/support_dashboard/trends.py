@@ -0,0 +1,290 @@
+# support_dashboard/trends.py
+import asyncio
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from unified_requests.models import ArchivedRequest
+
+from .caching import ROLLUP_VERSION_KEY, bump_versions
+from .concurrency import gather_per_model, run_in_dashboard_pool
+from .filters import REQUEST_MODEL_MAP, scope_queryset_for_user
+from .models import RequestDailyStat, RequestDailyStatDirtyDate
+
+ROLLUP_WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+
+
+def compute_daily_rollup(start_date, end_date):
+    """
+    Computes RequestDailyStat rows (unsaved) for every day between start_date and end_date inclusive,
+    with one GROUP BY query per model (and the archive) for new requests and one for resolved requests.
+    """
+    buckets = {}
+
+    def bucket(date, request_type, assignee_id):
+        key = (date, request_type, assignee_id)
+        if key not in buckets:
+            buckets[key] = RequestDailyStat(date=date, request_type=request_type, assignee_id=assignee_id)
+        return buckets[key]
+
+    for model_name, model_class in REQUEST_MODEL_MAP.items():
+        new_requests = model_class.objects.filter(
+            submitted_at__date__gte=start_date,
+            submitted_at__date__lte=end_date,
+        ).annotate(day=TruncDate('submitted_at')).values('day', 'assigned_to').annotate(count=Count('pk')).order_by()
+        for entry in new_requests:
+            bucket(entry['day'], model_name, entry['assigned_to']).new_count += entry['count']
+
+        resolved_requests = model_class.objects.filter(
+            status='resolved',
+            resolved_at__date__gte=start_date,
+            resolved_at__date__lte=end_date,
+        ).annotate(day=TruncDate('resolved_at')).values('day', 'assigned_to').annotate(count=Count('pk')).order_by()
+        for entry in resolved_requests:
+            bucket(entry['day'], model_name, entry['assigned_to']).resolved_count += entry['count']
+
+    # Archived requests keep counting in the history, so a backfill doesn't drop them
+    archived = ArchivedRequest.objects.order_by()
+    new_archived = archived.filter(
+        submitted_at__date__gte=start_date,
+        submitted_at__date__lte=end_date,
+    ).annotate(day=TruncDate('submitted_at')).values('day', 'request_type', 'assigned_to').annotate(count=Count('pk'))
+    for entry in new_archived:
+        bucket(entry['day'], entry['request_type'], entry['assigned_to']).new_count += entry['count']
+
+    resolved_archived = archived.filter(
+        status='resolved',
+        resolved_at__date__gte=start_date,
+        resolved_at__date__lte=end_date,
+    ).annotate(day=TruncDate('resolved_at')).values('day', 'request_type', 'assigned_to').annotate(count=Count('pk'))
+    for entry in resolved_archived:
+        bucket(entry['day'], entry['request_type'], entry['assigned_to']).resolved_count += entry['count']
+
+    return list(buckets.values())
+
+
+def refresh_request_daily_stats(start_date, end_date):
+    """
+    Recomputes and replaces the rollup rows of a contiguous date range. Returns the number of rows written.
+    """
+    rows = compute_daily_rollup(start_date, end_date)
+    with transaction.atomic():
+        RequestDailyStat.objects.filter(date__gte=start_date, date__lte=end_date).delete()
+        RequestDailyStat.objects.bulk_create(rows, batch_size=1000)
+    # Cached trends were built on the previous rollup rows
+    bump_versions(ROLLUP_VERSION_KEY)
+    return len(rows)
+
+
+def get_dirty_rollup_dates(since):
+    """
+    Returns the submission and resolution dates of every request changed since the given timestamp.
+    These are the only days whose rollup rows can be stale.
+    """
+    dates = set()
+    for model_class in REQUEST_MODEL_MAP.values():
+        changed = model_class.objects.filter(updated_at__gte=since)
+        dates.update(changed.annotate(day=TruncDate('submitted_at')).values_list('day', flat=True).distinct().order_by())
+        dates.update(
+            changed.filter(resolved_at__isnull=False)
+            .annotate(day=TruncDate('resolved_at')).values_list('day', flat=True).distinct().order_by()
+        )
+    return dates
+
+
+def mark_rollup_dates_dirty(*timestamps):
+    """
+    Records the days of the given submission / resolution timestamps (None is skipped), to be recomputed
+    by the next update_request_daily_stats() run. For counted days that the updated_at scan can't find:
+    those of a deleted request, and the old resolution day of a reopened one. Archived requests keep
+    counting, so archival doesn't call this.
+    """
+    dates = {timezone.localdate(timestamp) for timestamp in timestamps if timestamp}
+    RequestDailyStatDirtyDate.objects.bulk_create([RequestDailyStatDirtyDate(date=date) for date in dates])
+
+
+def update_request_daily_stats(today=None):
+    """
+    Incrementally brings the rollup up to date: yesterday and today are always recomputed, plus
+    every day touched by a request changed since the previous run (the newest rollup row's updated_at)
+    and every day marked dirty by a deleted request.
+    Returns the number of days refreshed.
+    """
+    today = today or datetime.date.today()
+    dates = {today - datetime.timedelta(days=1), today}
+
+    last_run = RequestDailyStat.objects.aggregate(last_run=Max('updated_at'))['last_run']
+    if last_run is not None:
+        # Small overlap so requests saved while the previous run was computing aren't missed
+        dates.update(get_dirty_rollup_dates(last_run - ROLLUP_WATERMARK_OVERLAP))
+    # Only the marks read here are cleared, after the refresh, so deletions committed meanwhile are kept
+    dirty_marks = dict(RequestDailyStatDirtyDate.objects.values_list('pk', 'date'))
+    dates.update(dirty_marks.values())
+
+    # Refresh contiguous runs of days together to keep the number of GROUP BY queries low
+    ranges = []
+    for date in sorted(dates):
+        if ranges and date - ranges[-1][1] == datetime.timedelta(days=1):
+            ranges[-1][1] = date
+        else:
+            ranges.append([date, date])
+    for start_date, end_date in ranges:
+        refresh_request_daily_stats(start_date, end_date)
+    RequestDailyStatDirtyDate.objects.filter(pk__in=dirty_marks).delete()
+    return len(dates)
+
+
+def get_model_today_counts(model_name, user, today):
+    """
+    Counts today's new and resolved requests of one model straight from its table. One small aggregate.
+    """
+    queryset = scope_queryset_for_user(REQUEST_MODEL_MAP[model_name].objects.all(), user)
+    return queryset.aggregate(
+        new=Count('pk', filter=Q(submitted_at__date=today)),
+        resolved=Count('pk', filter=Q(status='resolved', resolved_at__date=today)),
+    )
+
+
+def get_today_counts(user, today, request_types=None):
+    """
+    Counts today's new and resolved requests per type straight from the request tables,
+    so the trend is current even between two rollup runs. One small aggregate per model.
+    """
+    return {
+        model_name: get_model_today_counts(model_name, user, today)
+        for model_name in REQUEST_MODEL_MAP
+        if not request_types or model_name in request_types
+    }
+
+
+def get_trend_rollup_rows(user, start_date, today, type_slugs):
+    """
+    Returns the per-day, per-type sums of the rollup rows before today, scoped to the user. One query.
+    """
+    rollup = RequestDailyStat.objects.filter(date__gte=start_date, date__lt=today, request_type__in=type_slugs)
+    if user.is_staff and not user.is_superuser:
+        rollup = rollup.filter(assignee=user)
+    return list(rollup.values('date', 'request_type').annotate(
+        new=Sum('new_count'),
+        resolved=Sum('resolved_count'),
+    ).order_by())
+
+
+def _get_trend_range(days, today, request_types):
+    start_date = today - datetime.timedelta(days=days - 1)
+    type_slugs = [type_slug for type_slug in REQUEST_MODEL_MAP if not request_types or type_slug in request_types]
+    return start_date, type_slugs
+
+
+def build_trend_data(start_date, days, today, type_slugs, rollup_rows, today_counts):
+    """
+    Assembles the trend entries (one per day, oldest first) from the rollup rows and today's live counts.
+    """
+    daily_trend_data = {}
+    for i in range(days):
+        date = start_date + datetime.timedelta(days=i)
+        entry = {'date': date.isoformat(), 'new': 0, 'resolved': 0}
+        for type_slug in type_slugs:
+            entry[type_slug] = 0
+        daily_trend_data[date] = entry
+
+    for row in rollup_rows:
+        entry = daily_trend_data[row['date']]
+        entry['new'] += row['new']
+        entry['resolved'] += row['resolved']
+        entry[row['request_type']] += row['new']
+
+    for model_name, counts in today_counts.items():
+        entry = daily_trend_data[today]
+        entry['new'] += counts['new']
+        entry['resolved'] += counts['resolved']
+        entry[model_name] += counts['new']
+
+    return list(daily_trend_data.values())
+
+
+def get_request_trend_data(user, days=365, today=None, request_types=None):
+    """
+    Returns the daily new/resolved trend for the last 'days' days (oldest first), with per-type counts.
+    Past days are read from the RequestDailyStat rollup; today is counted live.
+    Respects staff/superuser permissions: staff only see requests assigned to them.
+    'request_types' optionally limits the trend to some request type slugs.
+    """
+    today = today or datetime.date.today()
+    start_date, type_slugs = _get_trend_range(days, today, request_types)
+    rollup_rows = get_trend_rollup_rows(user, start_date, today, type_slugs)
+    today_counts = get_today_counts(user, today, type_slugs)
+    return build_trend_data(start_date, days, today, type_slugs, rollup_rows, today_counts)
+
+
+async def aget_request_trend_data(user, days=365, today=None, request_types=None):
+    """
+    Async variant of get_request_trend_data(): the rollup query and the per-model counts of today
+    run concurrently in the dashboard thread pool.
+    """
+    today = today or datetime.date.today()
+    start_date, type_slugs = _get_trend_range(days, today, request_types)
+    rollup_rows, today_counts = await asyncio.gather(
+        run_in_dashboard_pool(get_trend_rollup_rows, user, start_date, today, type_slugs),
+        gather_per_model(get_model_today_counts, type_slugs, user, today),
+    )
+    return build_trend_data(start_date, days, today, type_slugs, rollup_rows, today_counts)
+
+
+def get_bucket_start(date, granularity):
+    """
+    Returns the first day of the week (Monday), month or year containing the given date.
+    """
+    if granularity == 'week':
+        return date - datetime.timedelta(days=date.weekday())
+    if granularity == 'month':
+        return date.replace(day=1)
+    if granularity == 'year':
+        return date.replace(month=1, day=1)
+    return date
+
+
+def group_trend_data(daily_trend_data, granularity):
+    """
+    Sums daily trend entries into week, month or year buckets, keyed by the bucket's first day.
+    """
+    if granularity == 'day':
+        return daily_trend_data
+
+    buckets = {}
+    for entry in daily_trend_data:
+        bucket_date = get_bucket_start(datetime.date.fromisoformat(entry['date']), granularity).isoformat()
+        if bucket_date not in buckets:
+            buckets[bucket_date] = dict.fromkeys(entry, 0)
+            buckets[bucket_date]['date'] = bucket_date
+        for key, value in entry.items():
+            if key != 'date':
+                buckets[bucket_date][key] += value
+    return list(buckets.values())
+
+
+def encode_trend_columns(trend_data, granularity, delta=False):
+    """
+    Encodes trend entries column-wise for the chart: the first bucket date and the step unit,
+    plus one integer array per series instead of one dict per bucket.
+    With delta=True every array holds differences from the previous value (the first value as is),
+    which keeps the numbers short for long, smooth ranges. Buckets must be contiguous, as
+    produced by get_request_trend_data() and group_trend_data().
+    """
+    series_keys = [key for key in trend_data[0] if key != 'date'] if trend_data else []
+    series = {}
+    for key in series_keys:
+        values = [entry[key] for entry in trend_data]
+        if delta:
+            values = [value - previous for previous, value in zip([0] + values, values)]
+        series[key] = values
+    return {
+        'start': trend_data[0]['date'] if trend_data else None,
+        'step': granularity,
+        'length': len(trend_data),
+        'delta': delta,
+        'series': series,
+    }
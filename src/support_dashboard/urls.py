@@ -1,7 +1,11 @@
 # support_dashboard/urls.py
 from django.urls import path
 from .views import (
-    RequestListView, RequestDetailView,
+    RequestListView, RequestDetailView, RequestExportCSVView, RequestBulkActionView,
+    SavedFilterViewCreateView, SavedFilterViewDeleteView,
+    DashboardStatsJSONView, RequestTrendJSONView,
+    # Async variants for ASGI deployments
+    AsyncRequestListView, AsyncDashboardStatsJSONView, AsyncRequestTrendJSONView,
     # Importing the category management views
     CategoryListView, CategoryCreateView, CategoryUpdateView, CategoryDeleteView,
      # Importing the new user management views
@@ -18,6 +22,21 @@ app_name = 'support_dashboard'
 urlpatterns = [
     # --- Request Management URLs ---
     path('', RequestListView.as_view(), name='request_list'),
+    # JSON data for the dashboard cards and charts, fetched asynchronously by request_list.html
+    # e.g. {% url 'support_dashboard:request_trend_data' %}?days=365&granularity=week&request_type=complaint
+    path('data/stats/', DashboardStatsJSONView.as_view(), name='dashboard_stats_data'),
+    path('data/trend/', RequestTrendJSONView.as_view(), name='request_trend_data'),
+    # CSV download of the list with the same filter parameters, e.g. export/?status=new&request_type=complaint
+    path('export/', RequestExportCSVView.as_view(), name='request_export_csv'),
+    # POST target of the multi-select status/assignment/priority form on the list
+    path('bulk/', RequestBulkActionView.as_view(), name='request_bulk_action'),
+    # Named filter views listed with their counts in the sidebar
+    path('views/add/', SavedFilterViewCreateView.as_view(), name='saved_view_create'),
+    path('views/<int:pk>/delete/', SavedFilterViewDeleteView.as_view(), name='saved_view_delete'),
+    # Same dashboard with async views that query the four request models concurrently (serve under ASGI)
+    path('async/', AsyncRequestListView.as_view(), name='request_list_async'),
+    path('async/data/stats/', AsyncDashboardStatsJSONView.as_view(), name='dashboard_stats_data_async'),
+    path('async/data/trend/', AsyncRequestTrendJSONView.as_view(), name='request_trend_data_async'),
     path('<str:request_type>/<int:pk>/', RequestDetailView.as_view(), name='request_detail'),
     # path('request-trend/', RequestTrendView.as_view(), name='request-trend'),
 
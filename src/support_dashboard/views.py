@@ -4,14 +4,17 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
-from django.db.models import Q, Count # Import Count for Aggregation
-from django.db import models
-from django.http import Http404, HttpResponseRedirect
+from django.db.models import Q, Max
+from django.db import models, transaction
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag, url_has_allowed_host_and_scheme
+from asgiref.sync import sync_to_async
 from django.urls import reverse, reverse_lazy # Import reverse_lazy for success_url in CBVs
 import datetime
+import hashlib
 import traceback
-from collections import OrderedDict # For ordered dict to maintain date order
-from django.db.models.functions import TruncDate
+from functools import partial
 
 # Import Django's generic views
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
@@ -32,18 +35,36 @@ from faqs.models import FAQCategory, FAQItem
 
 # Import forms (including the new ModelForms, CATEGORY_FORMS map, and User/Group Forms)
 from .forms import (
-    RequestStatusUpdateForm, RequestAssignmentUpdateForm, RequestFilterForm,
+    RequestStatusUpdateForm, RequestAssignmentUpdateForm, RequestFilterForm, DashboardChartForm,
+    RequestBulkActionForm, SavedFilterViewForm,
     ComplaintCategoryForm, ServiceTypeForm, InquiryCategoryForm, EmergencyTypeForm, CATEGORY_FORMS,
     UserAdminForm, UserCreateForm, # User forms
     GroupForm, # Group management form
     FAQCategoryForm, FAQItemForm, # Import FAQ forms
 )
 
+# Import request filtering helpers
+from .filters import get_filtered_querysets
+from .pagination import paginate_requests, apaginate_requests
+from .concurrency import run_in_dashboard_pool
+from .caching import get_cached_dashboard_data, aget_cached_dashboard_data, ROLLUP_VERSION_KEY
+from .rows import project_request_rows
+from .export import stream_requests_csv
+from .bulk import apply_bulk_action
+from .statistics import get_dashboard_statistics, aget_dashboard_statistics, get_dashboard_data_version
+from .trends import get_request_trend_data, aget_request_trend_data, group_trend_data, encode_trend_columns
+from .saved_views import count_saved_view
+from .workload import get_workload_table
+from .models import RequestDailyStat, SavedFilterView
+
 # Import notification utilities
-from notifications.utils import send_request_status_update_email, send_request_assignment_email
+from notifications.coalescing import queue_status_notification
+from notifications.tasks import send_bulk_request_notifications, send_request_assignment_notification
 
 # Import STATUS_CHOICES from constants
 from unified_requests.constants import STATUS_CHOICES
+from unified_requests.archiving import get_archived_request_or_404
+from unified_requests.history import get_request_timeline
 
 # For attachments
 from django.contrib.contenttypes.models import ContentType
@@ -124,21 +145,31 @@ class RequestListView(SupportDashboardMixin, View):
         'inquiry': Inquiry,
         'emergency': EmergencyReport,
     }
+    paginate_by = 25 # Rows per page of the unified request list
+    # JSON endpoints the page loads its statistics and trend from
+    stats_data_url_name = 'support_dashboard:dashboard_stats_data'
+    trend_data_url_name = 'support_dashboard:request_trend_data'
 
     def get(self, request, *args, **kwargs):
         filter_form = RequestFilterForm(request.GET)
-        all_requests = self.get_filtered_requests(filter_form)
-        all_requests = sorted(all_requests, key=lambda x: x.submitted_at, reverse=True)
-        dashboard_stats = self.get_dashboard_statistics()
-
-        request_trend_data = self.get_request_trend_data()
+        page = self.get_requests_page(filter_form)
+        return render(request, self.template_name, self.get_list_context(filter_form, page, **kwargs))
 
+    def get_list_context(self, filter_form, page, **kwargs):
+        # Statistics and trend data are fetched asynchronously by the page from the JSON endpoints below
         context = super().get_context_data(**kwargs)
         context.update({
-            'requests': all_requests,
+            'requests': page.object_list,
+            'page': page,
             'filter_form': filter_form,
-            'dashboard_stats': dashboard_stats,
-            'request_trend_data': request_trend_data,
+            'bulk_action_form': RequestBulkActionForm(),
+            # Sidebar badges read the materialized counts; the filters themselves are not run here
+            'saved_views': SavedFilterView.objects.filter(owner=self.request.user),
+            'saved_view_form': SavedFilterViewForm(initial={'query': self.request.GET.urlencode()}),
+            # Open requests per staff member from the workload counters, for balancing assignments
+            'staff_workloads': get_workload_table() if self.request.user.is_superuser else [],
+            'stats_data_url_name': self.stats_data_url_name,
+            'trend_data_url_name': self.trend_data_url_name,
             'request_types_for_chart': {
                 'complaint': 'Complaint',
                 'service': 'Service Request',
@@ -147,183 +178,308 @@ class RequestListView(SupportDashboardMixin, View):
             },
             'status_choices_for_chart': list(STATUS_CHOICES) # Pass STATUS CHOICES for pie chart
         })
-        return render(request, self.template_name, context)
+        return context
 
-    def get_filtered_requests(self, filter_form):
-        combined_objects = []
-        user = self.request.user
+    def get_requests_page(self, filter_form):
+        """
+        Returns one keyset-paginated page of the filtered requests, newest first or by time remaining.
+        Filtering, ordering and limiting happen in SQL for each model; the per-model
+        streams are merged lazily so the cost doesn't grow with the size of the backlog.
+        Rows are slim RequestRow projections (assignee name joined in), one query per model.
+        """
+        def compute_page():
+            # --- Filtering happens in the database; a request_type filter skips the other models entirely
+            querysets = get_filtered_querysets(self.request.user, filter_form)
+            return paginate_requests(
+                querysets,
+                self.paginate_by,
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+                row_factory=project_request_rows,
+                sort=filter_form.cleaned_data.get('sort', ''),
+            )
+
+        # Pages are cached per viewer scope and query string until a visible request changes
+        return get_cached_dashboard_data('list', self.request.user, self.get_cache_params(), compute_page)
+
+    def get_cache_params(self):
+        return {key: self.request.GET.getlist(key) for key in self.request.GET}
+
+# --- Bulk status / assignment / priority actions on the request list ---
+class RequestBulkActionView(SupportDashboardMixin, View):
+    """
+    Applies one status, assignment and/or priority change to the requests selected on the list page,
+    then queues their assignment emails as a single Celery task (status emails are coalesced).
+    """
+    def post(self, request, *args, **kwargs):
+        redirect_to = self.get_redirect_url()
+        form = RequestBulkActionForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return HttpResponseRedirect(redirect_to)
+
+        data = form.cleaned_data
+        result = apply_bulk_action(
+            request.user,
+            data['selected'],
+            status=data['status'] or None,
+            assigned_to=data['assigned_to'],
+            unassign=data['unassign'],
+            priority=data['priority'] or None,
+        )
+
+        if result.assignments:
+            send_bulk_request_notifications.delay(result.assignments)
+
+        if result.updated_count:
+            messages.success(request, f"Updated {result.updated_count} request(s).")
+        else:
+            messages.info(request, "No request needed changes.")
+        if result.skipped_count:
+            messages.warning(request, f"{result.skipped_count} selected request(s) were not found or are not assigned to you.")
+        return HttpResponseRedirect(redirect_to)
+
+    def get_redirect_url(self):
+        # Back to the list with the filters and page the action was made from
+        next_url = self.request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()}):
+            return next_url
+        return reverse('support_dashboard:request_list')
+
+# --- Saved filter views shown in the list sidebar ---
+class SavedFilterViewCreateView(SupportDashboardMixin, View):
+    """
+    Saves the filters of the list page as a named view of the current user and counts it once.
+    Afterwards its count is kept up to date by the request signals (see support_dashboard.saved_views).
+    """
+    def post(self, request, *args, **kwargs):
+        form = SavedFilterViewForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect('support_dashboard:request_list')
 
-        for model_name, model_class in self.model_map.items():
-            queryset = model_class.objects.all()
-
-            # --- Filtering based on assigned_to for non-superusers ---
-            if user.is_staff and not user.is_superuser:
-                # --- Filter to show request assigned to the current user or unassigned requests
-                # queryset = queryset.filter(Q(assigned_to=user))  ## | Q(assigned_to__isnull=True))
-                queryset = queryset.filter(assigned_to=user)
-
-            for obj in queryset: # --- Iterate over the potentially filtered queryset
-                obj.request_type_slug = model_name
-                combined_objects.append(obj)
-
-        if filter_form.is_valid():
-            cleaned_data = filter_form.cleaned_data
-
-            request_type = cleaned_data.get('request_type')
-
-            if request_type:
-                combined_objects = [req for req in combined_objects if req.request_type_slug == request_type]
-
-            q = cleaned_data.get('q')
-            if q:
-                q_lower = q.lower()
-                combined_objects = [
-                    req for req in combined_objects
-                    if str(req.pk) == q or
-                       (hasattr(req, 'subject') and q_lower in req.subject.lower()) or
-                       (hasattr(req, 'description') and q_lower in req.description.lower()) or
-                       (hasattr(req, 'question') and q_lower in req.question.lower())
-                ]
-
-            status = cleaned_data.get('status')
-            if status:
-                combined_objects = [req for req in combined_objects if hasattr(req, 'status') and req.status == status]
-
-            assigned_to = cleaned_data.get('assigned_to')
-            if assigned_to:
-                combined_objects = [req for req in combined_objects if hasattr(req, 'assigned_to') and req.assigned_to == assigned_to]
-
-            show_unassigned = cleaned_data.get('show_unassigned')
-            if show_unassigned:
-                combined_objects = [req for req in combined_objects if hasattr(req, 'assigned_to') and req.assigned_to is None]
-
-            submitted_after = cleaned_data.get('submitted_after')
-            submitted_before = cleaned_data.get('submitted_before')
-
-            if submitted_after:
-                combined_objects = [req for req in combined_objects if req.submitted_at.date() >= submitted_after]
-            if submitted_before:
-                combined_objects = [req for req in combined_objects if req.submitted_at.date() <= submitted_before]
-
-        return combined_objects
-
-    def get_dashboard_statistics(self):
-        stats = {
-            'total_requests': 0,
-            'status_counts': {},
-            'type_counts': {},
-            'new_today': 0,
-            'resolved_today': 0,
-        }
-        today = datetime.date.today()
+        saved_view, created = SavedFilterView.objects.update_or_create(
+            owner=request.user,
+            name=form.cleaned_data['name'],
+            defaults={'filters': form.cleaned_data['query']},
+        )
+        count_saved_view(saved_view)
+        if created:
+            messages.success(request, f"Saved view '{saved_view.name}' created.")
+        else:
+            messages.success(request, f"Saved view '{saved_view.name}' updated.")
+        return HttpResponseRedirect(f"{reverse('support_dashboard:request_list')}?{saved_view.get_query_string()}")
+
+class SavedFilterViewDeleteView(SupportDashboardMixin, View):
+    def post(self, request, pk, *args, **kwargs):
+        saved_view = get_object_or_404(SavedFilterView, pk=pk, owner=request.user)
+        saved_view.delete()
+        messages.success(request, f"Saved view '{saved_view.name}' deleted.")
+        return redirect('support_dashboard:request_list')
+
+# --- Streaming CSV export of the filtered request list ---
+class RequestExportCSVView(SupportDashboardMixin, View):
+    """
+    Exports every request matching the RequestFilterForm parameters of the list view as CSV.
+    Rows are streamed as they are read, so the download starts at once and memory stays flat.
+    """
+    def get(self, request, *args, **kwargs):
+        filter_form = RequestFilterForm(request.GET)
+        querysets = get_filtered_querysets(request.user, filter_form)
+        filename = f"requests-{datetime.date.today().isoformat()}.csv"
+        response = StreamingHttpResponse(stream_requests_csv(querysets), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+# --- Lazy-loaded JSON endpoints for the dashboard statistics and charts ---
+class DashboardChartDataMixin(SupportDashboardMixin):
+    """
+    Shared parameter parsing and cheap revalidation for the dashboard JSON endpoints.
+    Responses carry an ETag and Last-Modified derived from the request index, so a browser
+    that already has the data gets a 304 without any analytics query being run.
+    Views using it set cache_kind and define compute_data(), which returns the JSON payload.
+    """
+    uses_rollup = False # Whether the payload also depends on the RequestDailyStat rollup
+    cache_kind = None # Name of the payload in the dashboard cache keys
+
+    def get(self, request, *args, **kwargs):
+        if not self.parse_params():
+            return self.invalid_params_response()
+
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.build_json_response(self.get_data())
+        return self.add_validators(response, etag, last_modified)
+
+    def parse_params(self):
+        self.params_form = DashboardChartForm(self.request.GET)
+        if not self.params_form.is_valid():
+            return False
+        self.params = self.params_form.cleaned_data
+        self.request_types = [self.params['request_type']] if self.params['request_type'] else None
+        return True
+
+    def invalid_params_response(self):
+        return JsonResponse({'errors': self.params_form.errors}, status=400)
+
+    def build_json_response(self, data):
+        # Compact separators; the trend payload is mostly integer arrays
+        return JsonResponse(data, json_dumps_params={'separators': (',', ':')})
+
+    def add_validators(self, response, etag, last_modified):
+        response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        # Let the browser keep the payload but always revalidate it
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validators(self):
+        """
+        Returns (etag, last_modified timestamp) for the current user, parameters and data version.
+        """
         user = self.request.user
+        last_modified, row_count = get_dashboard_data_version(user, self.request_types)
+        timestamps = [last_modified]
+        if self.uses_rollup:
+            timestamps.append(RequestDailyStat.objects.aggregate(last_run=Max('updated_at'))['last_run'])
+        timestamps = [timestamp for timestamp in timestamps if timestamp]
+        latest = max(timestamps) if timestamps else None
+
+        version = "|".join(str(part) for part in (
+            self.__class__.__name__, user.pk, user.is_superuser, sorted(self.params.items()),
+            datetime.date.today(), latest, row_count,
+        ))
+        etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+        return etag, int(latest.timestamp()) if latest else None
+
+    def get_cache_version_keys(self):
+        # The viewer scope's version is always part of the key; the trend also follows the rollup
+        return [ROLLUP_VERSION_KEY] if self.uses_rollup else []
+
+    def get_data(self):
+        return get_cached_dashboard_data(
+            self.cache_kind, self.request.user, self.params, self.compute_data, self.get_cache_version_keys(),
+        )
+
+
+class DashboardStatsJSONView(DashboardChartDataMixin, View):
+    """
+    Dashboard counters (totals, per status, per type, new/resolved today) as JSON.
+    """
+    cache_kind = 'stats'
 
-        # Initialize status counts
-        for value, display in STATUS_CHOICES:
-            if value:
-                stats['status_counts'][value] = 0
+    def compute_data(self):
+        return get_dashboard_statistics(self.request.user, request_types=self.request_types).as_dict()
 
-        # Initialize type counts
-        for type_slug in self.model_map.keys():
-            stats['type_counts'][type_slug] = 0
 
-        for model_name, model_class in self.model_map.items():
-            queryset = model_class.objects.all()
+class RequestTrendJSONView(DashboardChartDataMixin, View):
+    """
+    New/resolved request trend as JSON, for a range of days, bucketed by day, week, month or year.
+    Series are sent column-wise (optionally delta-encoded), see encode_trend_columns().
+    """
+    uses_rollup = True
+    cache_kind = 'trend'
+
+    def compute_data(self):
+        daily_trend_data = get_request_trend_data(
+            self.request.user,
+            days=self.params['days'],
+            request_types=self.request_types,
+        )
+        return self.build_payload(daily_trend_data)
+
+    def build_payload(self, daily_trend_data):
+        trend_data = group_trend_data(daily_trend_data, self.params['granularity'])
+        # Columnar payload: {start, step, length, delta, series: {name: [int, ...]}}
+        payload = encode_trend_columns(trend_data, self.params['granularity'], delta=self.params['delta'])
+        payload['days'] = self.params['days']
+        return payload
+
+# --- Async (ASGI) variants of the dashboard: the per-model queries run concurrently ---
+class AsyncSupportDashboardMixin(SupportDashboardMixin):
+    """
+    SupportDashboardMixin for views with async handlers. The user is loaded with request.auser()
+    before the staff check, so no lazy database access happens on the event loop.
+    Only worth it under ASGI (config/asgi.py); under WSGI each request still gets its own thread.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not self.test_func():
+            return await sync_to_async(self.handle_no_permission)()
+        return await View.dispatch(self, request, *args, **kwargs)
 
-            # --- Filtering for statistics based on assiged_to for non-superusers (no unassigned) ---
-            if user.is_staff and not user.is_superuser:
-                queryset = queryset.filter(assigned_to=user) # Removed | Q(assigned_to__isnull=True)
 
-            stats['total_requests'] += queryset.count()
+class AsyncRequestListView(AsyncSupportDashboardMixin, RequestListView):
+    """
+    Request list whose per-model page queries run concurrently, so the page costs about as much as
+    the slowest of the four queries instead of their sum.
+    """
+    stats_data_url_name = 'support_dashboard:dashboard_stats_data_async'
+    trend_data_url_name = 'support_dashboard:request_trend_data_async'
 
-            # Count by status
-            for status_value, _ in STATUS_CHOICES:
-                if status_value and hasattr(model_class, 'status'):
-                    stats['status_counts'][status_value] += queryset.filter(status=status_value).count()
+    async def get(self, request, *args, **kwargs):
+        filter_form = RequestFilterForm(request.GET)
+        async def compute_page():
+            # Form validation (assignee lookup) and the full-text search block too, so they run in the pool
+            querysets = await run_in_dashboard_pool(get_filtered_querysets, request.user, filter_form)
+            return await apaginate_requests(
+                querysets,
+                self.paginate_by,
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+                row_factory=project_request_rows,
+                sort=filter_form.cleaned_data.get('sort', ''),
+            )
 
-            # Count by type
-            stats['type_counts'][model_name] += queryset.count()
+        page = await aget_cached_dashboard_data('list', request.user, self.get_cache_params(), compute_page)
+        # The sidebar (workload counters) is read from the database too
+        context = await sync_to_async(self.get_list_context)(filter_form, page, **kwargs)
+        return await sync_to_async(render)(request, self.template_name, context)
 
-            # Count new today
-            if hasattr(model_class, 'submitted_at'):
-                stats['new_today'] += queryset.filter(submitted_at__date=today).count()
 
-            # Count resolved today using 'resolved_at' field
-            if hasattr(model_class, 'status') and hasattr(model_class, 'resolved_at'):
-                # Only count if status is 'resolved' AND resolved_at date is today
-                stats['resolved_today'] += queryset.filter(
-                    status='resolved', 
-                    # submitted_at__date=today
-                    resolved_at__date=today
-                    ).count()
+class AsyncDashboardChartDataMixin(AsyncSupportDashboardMixin, DashboardChartDataMixin):
+    """
+    DashboardChartDataMixin with an async get(): the validators are computed in the dashboard pool
+    and the payload from concurrently run per-model queries (see aget_data()).
+    Views using it define the coroutine acompute_data(), the async counterpart of compute_data().
+    """
+    async def get(self, request, *args, **kwargs):
+        if not self.parse_params():
+            return self.invalid_params_response()
+
+        etag, last_modified = await run_in_dashboard_pool(self.get_validators)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.build_json_response(await self.aget_data())
+        return self.add_validators(response, etag, last_modified)
+
+    async def aget_data(self):
+        return await aget_cached_dashboard_data(
+            self.cache_kind, self.request.user, self.params, self.acompute_data, self.get_cache_version_keys(),
+        )
+
+
+class AsyncDashboardStatsJSONView(AsyncDashboardChartDataMixin, DashboardStatsJSONView):
+    async def acompute_data(self):
+        stats = await aget_dashboard_statistics(self.request.user, request_types=self.request_types)
+        return stats.as_dict()
+
+
+class AsyncRequestTrendJSONView(AsyncDashboardChartDataMixin, RequestTrendJSONView):
+    async def acompute_data(self):
+        daily_trend_data = await aget_request_trend_data(
+            self.request.user,
+            days=self.params['days'],
+            request_types=self.request_types,
+        )
+        return self.build_payload(daily_trend_data)
 
-        return stats
-    
-    def get_request_trend_data(self, days=365): # Fetch data up to 1 year.
-        """
-        Calculates daily trends for new and resolved requests over the last 'days' period.
-        Also aggregates counts for each request type daily.
-        Respects staff/superuser permissions. Returns raw daily counts.
-        """
-        user = self.request.user
-        today = datetime.date.today()
-        start_date = today - datetime.timedelta(days=days -1)
-
-        # --- Initialize data structure fro each day in teh period.
-        # --- Using ORderDirect to maintain insertion order (dates)
-        daily_trend_data = OrderedDict()
-        for i in range(days -1, -1, -1): # -- Iterate from 'days' ago up to today
-            date = today - datetime.timedelta(days=i)
-            date_str = date.strftime('%Y-%m-%d')
-            daily_trend_data[date_str] = {'date': date_str, 'new':0, 'resolved':0}
-            # daily_counts[date.strftime('%Y-%m-%d')] = {'new': 0, 'resolved': 0}
-            for type_slug in self.model_map.keys():
-                daily_trend_data[date_str][type_slug] = 0
-
-        for model_name, model_class in self.model_map.items():
-            queryset = model_class.objects.all()
-
-            # Apply staff/superuser filtering to trend data
-            if user.is_staff and not user.is_superuser:
-                queryset = queryset.filter(assigned_to=user)
-
-            # Filter for the relevant period based on submitted_at
-            queryset_in_period = queryset.filter(submitted_at__date__gte=start_date, submitted_at__date__lte=today)
-
-            # --- Aggregate new requests by submitted_at date and type
-            if hasattr(model_class, 'submitted_at'):
-                new_requests_aggregated = queryset_in_period.values('submitted_at__date').annotate(count=Count('pk'))
-                for entry in new_requests_aggregated:
-                    date_str = entry['submitted_at__date'].strftime('%Y-%m-%d')
-                    if date_str in daily_trend_data:
-                        daily_trend_data[date_str]['new'] += entry['count']
-                        # Also count by specific type
-                        daily_trend_data[date_str][model_name] += entry['count']
-
-            # --- Aggregate new requests by submitted_at date
-            if hasattr(model_class, 'status') and hasattr(model_class, 'resolved_at'):
-                resolved_requests_aggregate = queryset.filter(
-                    status = 'resolved',
-                    # -- Use TruncDate for resolved_at to ensure proper grouping
-                    resolved_at__gte=start_date,
-                    resolved_at__lte=today + datetime.timedelta(days=1, microseconds=-1) # End of today
-                ).annotate(
-                    resolved_day=TruncDate('resolved_at')
-                    # submitted_at__date__gte=start_date,
-                    # submitted_at__date__lte=today
-                ).values('resolved_day').annotate(count=Count('pk'))
-                
-                for entry in resolved_requests_aggregate:
-                    # -- Access the truncated date field
-                    # date_str = entry['resolved_at__date'].strftime('%Y-%m-%d')
-                    date_obj = entry['resolved_day']
-                    date_str = date_obj.strftime('%Y-%m-%d')
-                    if date_str in daily_trend_data:
-                        daily_trend_data[date_str]['resolved'] += entry['count']
-                    
-        # Convert OrderedDict values to a list of dictionaries for JSON serialization
-        return list(daily_trend_data.values())
-    
 # class RequestTrendView(SupportDashboardMixin, View):
 #     template_name = 'support_dashboard/request_trend.html'
 
@@ -353,7 +509,11 @@ class RequestDetailView(SupportDashboardMixin, View):
         if not model:
             raise Http404("Invalid request type.")
         # Use select_related for submitted_by and assigned_to to reduce queries
-        return get_object_or_404(model.objects.select_related('submitted_by', 'assigned_to'), pk=pk)
+        try:
+            return model.objects.select_related('submitted_by', 'assigned_to').get(pk=pk)
+        except model.DoesNotExist:
+            # Finished requests moved to the archive tables are shown read-only
+            return get_archived_request_or_404(request_type, pk)
 
         user = self.request.user
 
@@ -380,7 +540,9 @@ class RequestDetailView(SupportDashboardMixin, View):
 
         # --- Fetch Attachments ---
         attachments = []
-        if request_obj:
+        if getattr(request_obj, 'is_archived', False):
+            attachments = request_obj.archived_attachments
+        elif request_obj:
             content_type = ContentType.objects.get_for_model(request_obj.__class__)
             attachments = RequestAttachment.objects.filter(
                 content_type=content_type,
@@ -393,6 +555,7 @@ class RequestDetailView(SupportDashboardMixin, View):
             'status_form': status_form,
             'assignment_form': assignment_form,
             'attachments': attachments, # Add attachments to the context
+            'timeline': get_request_timeline(request_obj.request_type_slug, request_obj.pk),
         })
         return context
 
@@ -407,6 +570,10 @@ class RequestDetailView(SupportDashboardMixin, View):
         request_obj = self.get_object(request_type, pk)
         request_obj.request_type_slug = request_type # Ensure this is set for context and template
 
+        if getattr(request_obj, 'is_archived', False):
+            messages.error(request, "Archived requests can't be changed.")
+            return redirect('support_dashboard:request_detail', request_type=request_type, pk=pk)
+
         status_form = RequestStatusUpdateForm(request.POST)
         assignment_form = RequestAssignmentUpdateForm(request.POST)
 
@@ -422,9 +589,14 @@ class RequestDetailView(SupportDashboardMixin, View):
                 elif request_obj.status != 'resolved' and request_obj.resolved_at is not None:
                     request_obj.resolved_at = None
 
-                request_obj.save()
+                # The change, its RequestEvent and its pending notification are written together;
+                # changes made within the coalescing window are emailed to the submitter as one
+                request_obj._event_actor = request.user
+                with transaction.atomic():
+                    request_obj.save()
+                    if request_obj.status != old_status:
+                        queue_status_notification(request_type, request_obj.pk, old_status, request_obj.status)
                 messages.success(request, f"Status for {request_type.capitalize()} #{request_obj.pk} updated to {request_obj.get_status_display()}.")
-                send_request_status_update_email(request_obj, old_status, request_obj.status)
                 return redirect('support_dashboard:request_detail', request_type=request_type, pk=pk)
             else:
                 messages.error(request, "Failed to update status.")
@@ -435,11 +607,15 @@ class RequestDetailView(SupportDashboardMixin, View):
 
                 if old_assigned_to != new_assigned_to:
                     request_obj.assigned_to = new_assigned_to
-                    request_obj.save()
+                    request_obj._event_actor = request.user
+                    with transaction.atomic():
+                        request_obj.save()
+                        if request_obj.assigned_to:
+                            transaction.on_commit(partial(
+                                send_request_assignment_notification.delay, request_type, request_obj.pk,
+                            ))
                     assigned_name = request_obj.assigned_to.get_full_name() or request_obj.assigned_to.username if request_obj.assigned_to else "Unassigned"
                     messages.success(request, f"Assignment for {request_type.capitalize()} #{request_obj.pk} updated to {assigned_name}.")
-                    if request_obj.assigned_to:
-                        send_request_assignment_email(request_obj)
                 else:
                     messages.info(request, "Assignment did not change.")
 
@@ -0,0 +1,122 @@
+# support_dashboard/workload.py
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from unified_requests.constants import OPEN_STATUSES
+
+from .filters import REQUEST_MODEL_MAP
+from .models import StaffWorkload
+
+
+def get_workload_changes(old_assignee_id, old_status, new_assignee_id, new_status):
+    """
+    Returns {staff id: +1/-1} for a request that moved from (old assignee, old status)
+    to (new assignee, new status). Unassigned or closed requests count for nobody.
+    """
+    changes = Counter()
+    if old_assignee_id and old_status in OPEN_STATUSES:
+        changes[old_assignee_id] -= 1
+    if new_assignee_id and new_status in OPEN_STATUSES:
+        changes[new_assignee_id] += 1
+    return {staff_id: delta for staff_id, delta in changes.items() if delta}
+
+
+def adjust_staff_workload(request_type, changes):
+    """
+    Applies {staff id: delta} to the open counters of one request type, with one
+    UPDATE ... SET open_count = open_count + delta per staff member, so concurrent changes don't
+    overwrite each other. Missing counter rows are created.
+    """
+    for staff_id, delta in changes.items():
+        updated = StaffWorkload.objects.filter(staff_id=staff_id, request_type=request_type).update(
+            open_count=Greatest(F('open_count') + delta, 0),
+        )
+        if not updated and delta > 0:
+            StaffWorkload.objects.get_or_create(staff_id=staff_id, request_type=request_type)
+            StaffWorkload.objects.filter(staff_id=staff_id, request_type=request_type).update(
+                open_count=F('open_count') + delta,
+            )
+
+
+def choose_auto_assignee(request_type):
+    """
+    Returns the id of the staff member a new request of this type should be assigned to, or None
+    when auto-assignment is turned off (SUPPORT_DASHBOARD_AUTO_ASSIGN) or nobody is eligible.
+
+    The pick reads the first row of the workload index (lowest open count, longest since the last
+    automatic assignment) instead of counting requests. The row stays locked until the caller's
+    transaction commits; concurrent submissions skip it and take the next least-loaded staff member.
+    Must be called inside transaction.atomic(), before the request is created.
+    """
+    if not getattr(settings, 'SUPPORT_DASHBOARD_AUTO_ASSIGN', False):
+        return None
+
+    workload = (
+        StaffWorkload.objects
+        .filter(request_type=request_type, auto_assign=True, staff__is_active=True, staff__is_staff=True)
+        .order_by('open_count', F('last_assigned_at').asc(nulls_first=True), 'pk')
+        .select_for_update(skip_locked=True, of=('self',))
+        .first()
+    )
+    if workload is None:
+        return None
+    # The open count itself is raised by the post_save signal of the created request
+    StaffWorkload.objects.filter(pk=workload.pk).update(last_assigned_at=timezone.now())
+    return workload.staff_id
+
+
+def get_workload_table():
+    """
+    Returns [(staff user, {request type: open count}, total)] for every staff member with
+    a workload row, most loaded first. Two queries, no COUNT over the request tables.
+    """
+    workloads = {}
+    for workload in StaffWorkload.objects.all():
+        workloads.setdefault(workload.staff_id, {})[workload.request_type] = workload.open_count
+
+    staff_users = get_user_model().objects.filter(pk__in=workloads).order_by('first_name', 'last_name', 'username')
+    table = [
+        (staff_user, workloads[staff_user.pk], sum(workloads[staff_user.pk].values()))
+        for staff_user in staff_users
+    ]
+    table.sort(key=lambda row: row[2], reverse=True)
+    return table
+
+
+def rebuild_staff_workload():
+    """
+    Recomputes every open counter from the request tables (one grouped COUNT per request type),
+    keeping the auto_assign settings. Every staff member gets a row for every type, so they can be
+    made eligible for auto-assignment in the admin. Returns the number of counter rows written.
+    """
+    staff_ids = list(get_user_model().objects.filter(is_staff=True).values_list('pk', flat=True))
+    rows = 0
+    with transaction.atomic():
+        for request_type, model_class in REQUEST_MODEL_MAP.items():
+            open_counts = dict(
+                model_class.objects
+                .filter(status__in=OPEN_STATUSES, assigned_to__isnull=False)
+                .order_by()
+                .values_list('assigned_to')
+                .annotate(open_count=Count('pk'))
+            )
+            existing = {
+                workload.staff_id: workload
+                for workload in StaffWorkload.objects.filter(request_type=request_type).select_for_update()
+            }
+            for workload in existing.values():
+                workload.open_count = open_counts.get(workload.staff_id, 0)
+            StaffWorkload.objects.bulk_update(existing.values(), ['open_count'], batch_size=500)
+            StaffWorkload.objects.bulk_create([
+                StaffWorkload(staff_id=staff_id, request_type=request_type, open_count=open_counts.get(staff_id, 0))
+                for staff_id in set(staff_ids) | set(open_counts)
+                if staff_id not in existing
+            ])
+            rows += len(set(existing) | set(staff_ids) | set(open_counts))
+    return rows
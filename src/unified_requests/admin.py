@@ -1,3 +1,73 @@
 from django.contrib import admin
+from .models import UnifiedRequestIndex, ArchivedRequest, ArchivedRequestAttachment, RequestEvent, SLAPolicy
 
-# Register your models here.
+
+@admin.register(UnifiedRequestIndex)
+class UnifiedRequestIndexAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the cross-type request index. Rows are maintained by signals.
+    """
+    list_display = ('request_type', 'request_id', 'subject', 'status', 'assigned_to', 'submitted_at')
+    list_filter = ('request_type', 'status')
+    search_fields = ('subject', 'category_name')
+    date_hierarchy = 'submitted_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ArchivedRequestAttachmentInline(admin.TabularInline):
+    model = ArchivedRequestAttachment
+    extra = 0
+    can_delete = False
+    readonly_fields = ('file', 'uploaded_at', 'uploaded_by')
+
+
+@admin.register(ArchivedRequest)
+class ArchivedRequestAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the archived requests. Rows are written by the archive_requests command / task.
+    """
+    list_display = ('request_type', 'request_id', 'subject', 'status', 'assigned_to', 'submitted_at', 'archived_at')
+    list_filter = ('request_type', 'status')
+    search_fields = ('subject',)
+    date_hierarchy = 'submitted_at'
+    inlines = [ArchivedRequestAttachmentInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RequestEvent)
+class RequestEventAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the append-only request history.
+    """
+    list_display = ('occurred_at', 'request_type', 'request_id', 'event_type', 'from_status', 'to_status', 'to_assignee', 'actor')
+    list_filter = ('request_type', 'event_type')
+    date_hierarchy = 'occurred_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SLAPolicy)
+class SLAPolicyAdmin(admin.ModelAdmin):
+    """
+    Changes apply to requests saved afterwards; run the recompute_sla_due_dates command to update open requests.
+    """
+    list_display = ('request_type', 'priority', 'category_id', 'hours')
+    list_filter = ('request_type', 'priority')
+    list_editable = ('hours',)
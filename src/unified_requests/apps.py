@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UnifiedRequestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'unified_requests'
+
+    def ready(self):
+        # Keep the cross-type UnifiedRequestIndex in sync with the four request models
+        from . import signals  # noqa: F401
@@ -0,0 +1,183 @@
+# unified_requests/archiving.py
+import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+from django.dispatch import Signal
+from django.http import Http404
+from django.utils import timezone
+
+from attachments.models import RequestAttachment
+
+from .indexing import INDEXED_REQUEST_MODELS
+from .models import ArchivedRequest, ArchivedRequestAttachment, UnifiedRequestIndex
+
+# Statuses of requests that may be archived
+ARCHIVABLE_STATUSES = ['resolved', 'closed', 'rejected']
+
+# Sent once per archived chunk with request_type, request_ids and assignee_ids, for the dashboards
+# that would otherwise react to each row's post_delete signal
+requests_archived = Signal()
+
+_archiving = ContextVar('archiving_requests', default=False)
+
+
+def is_archiving():
+    """
+    True while archive_requests() deletes rows from the live tables; per-row delete
+    signal handlers skip their work, which is done once per chunk instead.
+    """
+    return _archiving.get()
+
+
+@contextmanager
+def _archiving_requests():
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+def serialize_request(request_obj):
+    """
+    Returns the JSON-friendly field values (by attname) of a request row.
+    Dates and times are written with isoformat(), as DjangoJSONEncoder would drop their microseconds.
+    """
+    data = {}
+    for field in request_obj._meta.concrete_fields:
+        value = field.value_from_object(request_obj)
+        if isinstance(value, FieldFile):
+            value = value.name or None
+        elif isinstance(value, (datetime.date, datetime.time)):
+            value = value.isoformat()
+        data[field.attname] = value
+    return data
+
+
+def rebuild_request(archived_request):
+    """
+    Returns an unsaved request instance with the archived field values, marked with is_archived = True.
+    Related objects (category, assignee...) are still loaded lazily from their ids.
+    """
+    model, _ = INDEXED_REQUEST_MODELS[archived_request.request_type]
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in archived_request.data:
+            values[field.attname] = field.to_python(archived_request.data[field.attname])
+    request_obj = model(**values)
+    request_obj.is_archived = True
+    request_obj.archived_at = archived_request.archived_at
+    request_obj.archived_attachments = archived_request.attachments.all()
+    return request_obj
+
+
+def get_archived_request_or_404(request_type, pk, **filters):
+    """
+    Looks a request up in the archive, for detail pages whose live lookup found nothing.
+    Extra filters (e.g. submitted_by=user) restrict the lookup like on the live table.
+    """
+    archived_request = ArchivedRequest.objects.filter(
+        request_type=request_type, request_id=pk, **filters,
+    ).first()
+    if archived_request is None:
+        raise Http404("No request matches the given query.")
+    return rebuild_request(archived_request)
+
+
+def archive_request_chunk(request_type, pks):
+    """
+    Moves the given requests of one type, with their attachment rows, into the archive in one
+    transaction: one bulk insert per archive table and one DELETE per live table.
+    Rows that stopped being archivable since they were selected are left alone.
+    Returns the number of archived requests.
+    """
+    model, _ = INDEXED_REQUEST_MODELS[request_type]
+    content_type = ContentType.objects.get_for_model(model)
+
+    with transaction.atomic(), _archiving_requests():
+        request_objs = list(
+            model.objects.filter(pk__in=pks, status__in=ARCHIVABLE_STATUSES).order_by().select_for_update()
+        )
+        if not request_objs:
+            return 0
+        archived_pks = [request_obj.pk for request_obj in request_objs]
+
+        archived_requests = ArchivedRequest.objects.bulk_create([
+            ArchivedRequest(
+                request_type=request_type,
+                request_id=request_obj.pk,
+                status=request_obj.status,
+                assigned_to_id=request_obj.assigned_to_id,
+                submitted_by_id=request_obj.submitted_by_id,
+                subject=request_obj.subject,
+                submitted_at=request_obj.submitted_at,
+                updated_at=request_obj.updated_at,
+                resolved_at=request_obj.resolved_at,
+                data=serialize_request(request_obj),
+            )
+            for request_obj in request_objs
+        ])
+        # bulk_create() only returns primary keys on some databases
+        archived_ids = dict(
+            ArchivedRequest.objects.filter(request_type=request_type, request_id__in=archived_pks)
+            .values_list('request_id', 'pk')
+        )
+
+        attachments = RequestAttachment.objects.filter(content_type=content_type, object_id__in=archived_pks)
+        ArchivedRequestAttachment.objects.bulk_create([
+            ArchivedRequestAttachment(
+                archived_request_id=archived_ids[attachment.object_id],
+                file=attachment.file.name,
+                uploaded_at=attachment.uploaded_at,
+                uploaded_by_id=attachment.uploaded_by_id,
+            )
+            for attachment in attachments
+        ])
+        attachments.delete()
+
+        model.objects.filter(pk__in=archived_pks).delete()
+        UnifiedRequestIndex.objects.filter(request_type=request_type, request_id__in=archived_pks).delete()
+
+        requests_archived.send(
+            sender=model,
+            request_type=request_type,
+            request_ids=archived_pks,
+            assignee_ids={request_obj.assigned_to_id for request_obj in request_objs if request_obj.assigned_to_id},
+        )
+    return len(archived_requests)
+
+
+def archive_requests(older_than_days=None, chunk_size=500, request_types=None, dry_run=False):
+    """
+    Archives the resolved, closed and rejected requests not updated for older_than_days
+    (REQUEST_ARCHIVE_AFTER_DAYS by default), chunk_size rows per transaction so the live tables are
+    never locked for long. Returns a dict of request type -> number of archived (or, with dry_run,
+    archivable) requests.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'REQUEST_ARCHIVE_AFTER_DAYS', 365)
+    cutoff = timezone.now() - datetime.timedelta(days=older_than_days)
+
+    counts = {}
+    for request_type, (model, _) in INDEXED_REQUEST_MODELS.items():
+        if request_types and request_type not in request_types:
+            continue
+        candidates = model.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff).order_by('pk')
+        if dry_run:
+            counts[request_type] = candidates.count()
+            continue
+
+        counts[request_type] = 0
+        last_pk = 0
+        while True:
+            pks = list(candidates.filter(pk__gt=last_pk).values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            counts[request_type] += archive_request_chunk(request_type, pks)
+            last_pk = pks[-1]
+    return counts
@@ -1,3 +1,5 @@
+from django.db.models import Q
+
 # Common Status Choices for all Request Types
 STATUS_CHOICES = [
     ('new', 'New'),
@@ -5,4 +7,24 @@ STATUS_CHOICES = [
     ('resolved', 'Resolved'),
     ('closed', 'Closed'),
     ('rejected', 'Rejected'),
-]
\ No newline at end of file
+]
+
+# Statuses of requests that still need staff action
+OPEN_STATUSES = ['new', 'in_progress']
+# Condition of the partial "open requests" indexes on the four request tables
+OPEN_REQUEST_CONDITION = Q(status__in=OPEN_STATUSES)
+
+# Request type slugs shared by the support dashboard and the cross-type request index
+REQUEST_TYPE_CHOICES = [
+    ('complaint', 'Complaint'),
+    ('service', 'Service Request'),
+    ('inquiry', 'Inquiry'),
+    ('emergency', 'Emergency Report'),
+]
+
+# Kinds of entries in the RequestEvent history
+REQUEST_EVENT_CHOICES = [
+    ('created', 'Created'),
+    ('status', 'Status Changed'),
+    ('assignment', 'Assignment Changed'),
+]
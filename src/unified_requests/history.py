@@ -0,0 +1,135 @@
+# unified_requests/history.py
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+
+from django.utils import timezone
+
+from .constants import OPEN_STATUSES
+from .models import RequestEvent
+
+# Statuses a request is reopened from when it goes back to an open status
+FINISHED_STATUSES = ['resolved', 'closed']
+
+
+def build_request_events(request_type, request_id, old_status, old_assignee_id, new_status, new_assignee_id,
+                         created=False, actor_id=None, occurred_at=None):
+    """
+    Returns the unsaved RequestEvent rows describing one change of a request:
+    a 'created' event for a new request, otherwise a 'status' and/or an 'assignment' event.
+    """
+    common = {
+        'request_type': request_type,
+        'request_id': request_id,
+        'actor_id': actor_id,
+        'occurred_at': occurred_at or timezone.now(),
+    }
+    if created:
+        return [RequestEvent(event_type='created', to_status=new_status, to_assignee_id=new_assignee_id, **common)]
+
+    events = []
+    if old_status != new_status:
+        events.append(RequestEvent(event_type='status', from_status=old_status, to_status=new_status, **common))
+    if old_assignee_id != new_assignee_id:
+        events.append(RequestEvent(
+            event_type='assignment', from_assignee_id=old_assignee_id, to_assignee_id=new_assignee_id, **common,
+        ))
+    return events
+
+
+def record_request_events(*args, **kwargs):
+    """
+    Writes the events of one change (see build_request_events()) with a single INSERT.
+    Call it in the transaction that saves the change.
+    """
+    events = build_request_events(*args, **kwargs)
+    if events:
+        RequestEvent.objects.bulk_create(events)
+    return events
+
+
+def get_request_timeline(request_type, request_id):
+    """
+    Returns the events of one request, oldest first, read from the (request, timestamp) index.
+    """
+    return (
+        RequestEvent.objects
+        .filter(request_type=request_type, request_id=request_id)
+        .select_related('actor', 'from_assignee', 'to_assignee')
+        .order_by('occurred_at', 'pk')
+    )
+
+
+@dataclass
+class ResolutionMetrics:
+    """
+    Resolution metrics of the events in a time range.
+    """
+    created_count: int = 0
+    responded_count: int = 0 # Created requests whose status changed for the first time in the range
+    average_first_response_seconds: float = None
+    resolved_count: int = 0
+    reopened_count: int = 0
+    reopen_rate: float = None # Share of the requests resolved or closed in the range that were reopened in it
+    average_seconds_in_status: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def get_resolution_metrics(since, until=None, request_types=None):
+    """
+    Computes ResolutionMetrics from the events that occurred in [since, until), with one range scan over
+    the event timestamp index; the request tables are not read. Time in a status is counted for the
+    stays that both began and ended in the range.
+    """
+    events = RequestEvent.objects.filter(occurred_at__gte=since).exclude(event_type='assignment')
+    if until is not None:
+        events = events.filter(occurred_at__lt=until)
+    if request_types:
+        events = events.filter(request_type__in=request_types)
+
+    metrics = ResolutionMetrics()
+    created_at = {}
+    responded = set()
+    finished = set()
+    reopened = set()
+    entered_status = {}
+    status_durations = defaultdict(list)
+    first_response_seconds = []
+
+    rows = events.order_by('occurred_at', 'pk').values_list(
+        'request_type', 'request_id', 'event_type', 'from_status', 'to_status', 'occurred_at',
+    )
+    for request_type, request_id, event_type, from_status, to_status, occurred_at in rows.iterator():
+        key = (request_type, request_id)
+        if event_type == 'created':
+            metrics.created_count += 1
+            created_at[key] = occurred_at
+            entered_status[key] = (to_status, occurred_at)
+            continue
+
+        if key in created_at and key not in responded:
+            responded.add(key)
+            first_response_seconds.append((occurred_at - created_at[key]).total_seconds())
+        if key in entered_status:
+            status, entered_at = entered_status[key]
+            status_durations[status].append((occurred_at - entered_at).total_seconds())
+        entered_status[key] = (to_status, occurred_at)
+
+        if to_status == 'resolved':
+            metrics.resolved_count += 1
+        if to_status in FINISHED_STATUSES:
+            finished.add(key)
+        if from_status in FINISHED_STATUSES and to_status in OPEN_STATUSES:
+            metrics.reopened_count += 1
+            reopened.add(key)
+
+    metrics.responded_count = len(responded)
+    if first_response_seconds:
+        metrics.average_first_response_seconds = sum(first_response_seconds) / len(first_response_seconds)
+    if finished:
+        metrics.reopen_rate = len(reopened & finished) / len(finished)
+    metrics.average_seconds_in_status = {
+        status: sum(durations) / len(durations) for status, durations in status_durations.items()
+    }
+    return metrics
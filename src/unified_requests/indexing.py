@@ -0,0 +1,139 @@
+# unified_requests/indexing.py
+from django.db import transaction
+
+from complaints.models import Complaint
+from services.models import ServiceRequest
+from inquiries.models import Inquiry
+from emergencies.models import EmergencyReport
+
+from .models import UnifiedRequestIndex
+
+# Request type slug -> (model, name of its category-like foreign key)
+INDEXED_REQUEST_MODELS = {
+    'complaint': (Complaint, 'category'),
+    'service': (ServiceRequest, 'service_type'),
+    'inquiry': (Inquiry, 'category'),
+    'emergency': (EmergencyReport, 'emergency_type'),
+}
+
+
+def get_request_type_for_model(model_class):
+    """
+    Returns the request type slug for one of the four request models, or None.
+    """
+    for request_type, (model, _) in INDEXED_REQUEST_MODELS.items():
+        if model is model_class:
+            return request_type
+    return None
+
+
+# Text fields copied into the full-text search document, when the request model has them
+SEARCH_DOCUMENT_FIELDS = (
+    'subject', 'description', 'resolution_details', 'answer', 'action_taken', 'location',
+    'full_name', 'email', 'phone_number',
+)
+
+
+# Columns written by build_index_values()
+INDEX_VALUE_FIELDS = [
+    'status', 'priority', 'assigned_to_id', 'submitted_by_id', 'category_name', 'subject',
+    'submitted_at', 'updated_at', 'resolved_at', 'search_document',
+]
+
+
+def build_search_document(request_obj, category=None):
+    """
+    Returns the text indexed for full-text search: subject, description, resolution notes,
+    the anonymous submitter's contact fields and the category name.
+    """
+    parts = [getattr(request_obj, field_name, None) for field_name in SEARCH_DOCUMENT_FIELDS]
+    parts.append(category.name if category else None)
+    return "\n".join(part for part in parts if part)
+
+
+def build_index_values(request_type, request_obj):
+    """
+    Returns the denormalized column values for a request, ready for the index table.
+    """
+    _, category_field = INDEXED_REQUEST_MODELS[request_type]
+    category = getattr(request_obj, category_field)
+    return {
+        'status': request_obj.status,
+        'priority': getattr(request_obj, 'priority', None), # Inquiries and emergencies have no priority
+        'assigned_to_id': request_obj.assigned_to_id,
+        'submitted_by_id': request_obj.submitted_by_id,
+        'category_name': category.name if category else None,
+        'subject': request_obj.subject,
+        'submitted_at': request_obj.submitted_at,
+        'updated_at': request_obj.updated_at,
+        'resolved_at': request_obj.resolved_at,
+        'search_document': build_search_document(request_obj, category),
+    }
+
+
+def sync_request_index(request_type, request_obj):
+    """
+    Creates or refreshes the index row of a single request.
+    """
+    UnifiedRequestIndex.objects.update_or_create(
+        request_type=request_type,
+        request_id=request_obj.pk,
+        defaults=build_index_values(request_type, request_obj),
+    )
+
+
+def bulk_sync_request_index(request_type, request_objs):
+    """
+    Refreshes the index rows of many requests of one type with one bulk_update (plus a bulk_create
+    for requests missing from the index). For writes that skip the save signals, e.g. bulk_update().
+    The category-like foreign key should be select_related on the request objects.
+    """
+    values_by_id = {request_obj.pk: build_index_values(request_type, request_obj) for request_obj in request_objs}
+    if not values_by_id:
+        return
+    entries = list(UnifiedRequestIndex.objects.filter(request_type=request_type, request_id__in=values_by_id))
+    for entry in entries:
+        for field_name, value in values_by_id.pop(entry.request_id).items():
+            setattr(entry, field_name, value)
+    if entries:
+        UnifiedRequestIndex.objects.bulk_update(entries, INDEX_VALUE_FIELDS, batch_size=500)
+    UnifiedRequestIndex.objects.bulk_create([
+        UnifiedRequestIndex(request_type=request_type, request_id=request_id, **values)
+        for request_id, values in values_by_id.items()
+    ])
+
+
+def remove_from_request_index(request_type, request_id):
+    UnifiedRequestIndex.objects.filter(request_type=request_type, request_id=request_id).delete()
+
+
+def rebuild_request_index(request_types=None, batch_size=1000):
+    """
+    Rebuilds the index rows of the given request types (all types by default) from the source tables.
+    Rows are streamed with .iterator() and written with bulk_create, so memory stays bounded.
+    Returns a dict of request type -> number of indexed rows.
+    """
+    counts = {}
+    for request_type, (model, category_field) in INDEXED_REQUEST_MODELS.items():
+        if request_types and request_type not in request_types:
+            continue
+
+        with transaction.atomic():
+            UnifiedRequestIndex.objects.filter(request_type=request_type).delete()
+            batch = []
+            counts[request_type] = 0
+            queryset = model.objects.select_related(category_field).order_by('pk')
+            for request_obj in queryset.iterator(chunk_size=batch_size):
+                batch.append(UnifiedRequestIndex(
+                    request_type=request_type,
+                    request_id=request_obj.pk,
+                    **build_index_values(request_type, request_obj)
+                ))
+                if len(batch) >= batch_size:
+                    UnifiedRequestIndex.objects.bulk_create(batch)
+                    counts[request_type] += len(batch)
+                    batch = []
+            if batch:
+                UnifiedRequestIndex.objects.bulk_create(batch)
+                counts[request_type] += len(batch)
+    return counts
@@ -0,0 +1,47 @@
+# unified_requests/management/commands/archive_requests.py
+from django.core.management.base import BaseCommand
+
+from unified_requests.archiving import archive_requests
+from unified_requests.constants import REQUEST_TYPE_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Moves resolved, closed and rejected requests not updated for a while into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help="Archive requests not updated for this many days (default: REQUEST_ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help="Number of requests moved per transaction (default: 500).",
+        )
+        parser.add_argument(
+            '--type',
+            action='append',
+            dest='request_types',
+            choices=[value for value, _ in REQUEST_TYPE_CHOICES],
+            help="Only archive this request type (can be repeated).",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only count the requests that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        counts = archive_requests(
+            older_than_days=options['days'],
+            chunk_size=options['chunk_size'],
+            request_types=options['request_types'],
+            dry_run=options['dry_run'],
+        )
+        for request_type, count in counts.items():
+            self.stdout.write(f"{request_type}: {count}")
+        verb = "would be archived" if options['dry_run'] else "archived"
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} request(s) {verb}."))
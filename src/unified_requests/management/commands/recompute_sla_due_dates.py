@@ -0,0 +1,39 @@
+# unified_requests/management/commands/recompute_sla_due_dates.py
+from django.core.management.base import BaseCommand
+
+from unified_requests.constants import REQUEST_TYPE_CHOICES
+from unified_requests.sla import recompute_due_dates
+
+
+class Command(BaseCommand):
+    help = "Recomputes the due date of requests from the current SLA policies, e.g. after editing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            action='append',
+            dest='request_types',
+            choices=[value for value, _ in REQUEST_TYPE_CHOICES],
+            help="Only recompute this request type (can be repeated).",
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="Also recompute finished requests (default: open requests only).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of requests updated per query (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        counts = recompute_due_dates(
+            request_types=options['request_types'],
+            open_only=not options['all'],
+            batch_size=options['batch_size'],
+        )
+        for request_type, count in counts.items():
+            self.stdout.write(f"{request_type}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values())} due date(s) updated."))
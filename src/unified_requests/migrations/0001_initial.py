@@ -0,0 +1,41 @@
+# Generated by Django 5.2.2 on 2026-10-16 20:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnifiedRequestIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('request_id', models.PositiveBigIntegerField(help_text='Primary key of the request in its own table.')),
+                ('status', models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed'), ('rejected', 'Rejected')], max_length=20)),
+                ('priority', models.CharField(blank=True, help_text='Priority of the request, for request types that have one.', max_length=20, null=True)),
+                ('category_name', models.CharField(blank=True, help_text='Name of the complaint/inquiry category, service type or emergency type.', max_length=100, null=True)),
+                ('subject', models.CharField(max_length=255)),
+                ('submitted_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('submitted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Unified Request Index Entry',
+                'verbose_name_plural': 'Unified Request Index',
+                'ordering': ['-submitted_at', '-request_id'],
+                'indexes': [models.Index(fields=['-submitted_at', '-request_id'], name='request_index_submitted_idx'), models.Index(fields=['assigned_to', '-submitted_at'], name='request_index_assignee_idx'), models.Index(fields=['submitted_by', '-submitted_at'], name='request_index_submitter_idx'), models.Index(fields=['status', 'resolved_at'], name='request_index_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('request_type', 'request_id'), name='unique_request_index_entry')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-16 20:57
+
+from django.db import migrations, models
+
+from unified_requests.search import create_search_index, drop_search_index
+
+
+def create_search_structures(apps, schema_editor):
+    # GIN tsvector index on PostgreSQL, FTS5 table + triggers on SQLite, nothing elsewhere
+    create_search_index(schema_editor)
+
+
+def drop_search_structures(apps, schema_editor):
+    drop_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unified_requests', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unifiedrequestindex',
+            name='search_document',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:05
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unified_requests', '0002_request_index_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('request_id', models.PositiveBigIntegerField(help_text='Primary key the request had in its own table.')),
+                ('status', models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed'), ('rejected', 'Rejected')], max_length=20)),
+                ('subject', models.CharField(max_length=255)),
+                ('submitted_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Field values of the original request row.')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('submitted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Request',
+                'verbose_name_plural': 'Archived Requests',
+                'ordering': ['-submitted_at', '-request_id'],
+                'indexes': [models.Index(fields=['submitted_by', '-submitted_at'], name='archived_request_submitter_idx'), models.Index(fields=['assigned_to', '-submitted_at'], name='archived_request_assignee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('request_type', 'request_id'), name='unique_archived_request')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedRequestAttachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='attachments/')),
+                ('uploaded_at', models.DateTimeField()),
+                ('archived_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='unified_requests.archivedrequest')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Request Attachment',
+                'verbose_name_plural': 'Archived Request Attachments',
+                'ordering': ['uploaded_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unified_requests', '0003_archivedrequest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('request_id', models.PositiveBigIntegerField(help_text='Primary key of the request in its own table.')),
+                ('event_type', models.CharField(choices=[('created', 'Created'), ('status', 'Status Changed'), ('assignment', 'Assignment Changed')], max_length=20)),
+                ('from_status', models.CharField(blank=True, choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed'), ('rejected', 'Rejected')], max_length=20, null=True)),
+                ('to_status', models.CharField(blank=True, choices=[('new', 'New'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed'), ('rejected', 'Rejected')], max_length=20, null=True)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, help_text='User who made the change, when known.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('from_assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('to_assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Request Event',
+                'verbose_name_plural': 'Request Events',
+                'ordering': ['occurred_at', 'pk'],
+                'indexes': [models.Index(fields=['request_type', 'request_id', 'occurred_at'], name='request_event_timeline_idx'), models.Index(fields=['occurred_at'], name='request_event_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unified_requests', '0004_requestevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SLAPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_type', models.CharField(choices=[('complaint', 'Complaint'), ('service', 'Service Request'), ('inquiry', 'Inquiry'), ('emergency', 'Emergency Report')], max_length=20)),
+                ('priority', models.CharField(blank=True, default='', help_text='Only for requests of this priority (complaints and service requests). Empty for any priority.', max_length=20)),
+                ('category_id', models.PositiveIntegerField(blank=True, help_text='Only for requests in this complaint/inquiry category, service type or emergency type (ID). Empty for any.', null=True)),
+                ('hours', models.PositiveIntegerField(help_text='Hours from submission until the request is overdue.')),
+            ],
+            options={
+                'verbose_name': 'SLA Policy',
+                'verbose_name_plural': 'SLA Policies',
+                'ordering': ['request_type', 'priority', 'category_id'],
+                'constraints': [models.UniqueConstraint(fields=('request_type', 'priority', 'category_id'), name='unique_sla_policy')],
+            },
+        ),
+    ]
@@ -1,3 +1,233 @@
+# unified_requests/models.py
 from django.db import models
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from unified_requests.constants import STATUS_CHOICES, REQUEST_TYPE_CHOICES, REQUEST_EVENT_CHOICES
 
-# Create your models here.
+
+class UnifiedRequestIndex(models.Model):
+    """
+    Denormalized, cross-type index with one row per Complaint, ServiceRequest, Inquiry and EmergencyReport.
+    Kept in sync by the save/delete signals in unified_requests/signals.py and backfilled with
+    the 'rebuild_request_index' management command. Cross-type listing, sorting and counting
+    can query this single table instead of merging four querysets in Python.
+    """
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    request_id = models.PositiveBigIntegerField(help_text="Primary key of the request in its own table.")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    priority = models.CharField(
+        max_length=20,
+        blank=True,
+        null=True,
+        help_text="Priority of the request, for request types that have one."
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    category_name = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True,
+        help_text="Name of the complaint/inquiry category, service type or emergency type."
+    )
+    subject = models.CharField(max_length=255)
+
+    submitted_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField(blank=True, null=True)
+
+    # Full-text search source; indexed by a GIN tsvector index (PostgreSQL) or an FTS5 table (SQLite), see search.py
+    search_document = models.TextField(blank=True, default='')
+
+    class Meta:
+        verbose_name = "Unified Request Index Entry"
+        verbose_name_plural = "Unified Request Index"
+        ordering = ['-submitted_at', '-request_id']
+        constraints = [
+            models.UniqueConstraint(fields=['request_type', 'request_id'], name='unique_request_index_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['-submitted_at', '-request_id'], name='request_index_submitted_idx'),
+            models.Index(fields=['assigned_to', '-submitted_at'], name='request_index_assignee_idx'),
+            models.Index(fields=['submitted_by', '-submitted_at'], name='request_index_submitter_idx'),
+            models.Index(fields=['status', 'resolved_at'], name='request_index_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_request_type_display()} #{self.request_id}: {self.subject} ({self.get_status_display()})"
+
+
+class ArchivedRequest(models.Model):
+    """
+    Cold copy of a finished (resolved, closed or rejected) request moved out of its live table by
+    unified_requests.archiving. The columns needed to find it are copied out; every field of the original
+    row is kept in 'data', from which an unsaved request instance is rebuilt for the read-only detail pages.
+    """
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    request_id = models.PositiveBigIntegerField(help_text="Primary key the request had in its own table.")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    subject = models.CharField(max_length=255)
+
+    submitted_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    data = models.JSONField(encoder=DjangoJSONEncoder, help_text="Field values of the original request row.")
+
+    class Meta:
+        verbose_name = "Archived Request"
+        verbose_name_plural = "Archived Requests"
+        ordering = ['-submitted_at', '-request_id']
+        constraints = [
+            models.UniqueConstraint(fields=['request_type', 'request_id'], name='unique_archived_request'),
+        ]
+        indexes = [
+            models.Index(fields=['submitted_by', '-submitted_at'], name='archived_request_submitter_idx'),
+            models.Index(fields=['assigned_to', '-submitted_at'], name='archived_request_assignee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_request_type_display()} #{self.request_id}: {self.subject} (archived)"
+
+
+class ArchivedRequestAttachment(models.Model):
+    """
+    RequestAttachment of an archived request. The stored file itself is not moved.
+    """
+    archived_request = models.ForeignKey(ArchivedRequest, on_delete=models.CASCADE, related_name='attachments')
+    file = models.FileField(upload_to='attachments/')
+    uploaded_at = models.DateTimeField()
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
+    class Meta:
+        verbose_name = "Archived Request Attachment"
+        verbose_name_plural = "Archived Request Attachments"
+        ordering = ['uploaded_at']
+
+    def __str__(self):
+        return f"Attachment of {self.archived_request} - {self.file.name}"
+
+
+class RequestEvent(models.Model):
+    """
+    Append-only history of the four request types: one row when a request is created and one per
+    status or assignment change, written in the same transaction as the change (see unified_requests.history).
+    Rows are never updated, so resolution metrics can be computed from a time range of events.
+    """
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    request_id = models.PositiveBigIntegerField(help_text="Primary key of the request in its own table.")
+    event_type = models.CharField(max_length=20, choices=REQUEST_EVENT_CHOICES)
+
+    from_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, null=True)
+    to_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, null=True)
+    from_assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    to_assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="User who made the change, when known."
+    )
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Request Event"
+        verbose_name_plural = "Request Events"
+        ordering = ['occurred_at', 'pk']
+        indexes = [
+            models.Index(fields=['request_type', 'request_id', 'occurred_at'], name='request_event_timeline_idx'),
+            models.Index(fields=['occurred_at'], name='request_event_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_request_type_display()} #{self.request_id}: {self.get_event_type_display()} at {self.occurred_at}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Request events are append-only.")
+        super().save(*args, **kwargs)
+
+
+class SLAPolicy(models.Model):
+    """
+    Time allowed to handle a request, for a request type and optionally a priority and/or category.
+    The most specific matching policy sets the request's due_at when it is saved (see unified_requests.sla);
+    requests no policy matches get REQUEST_SLA_DEFAULT_HOURS.
+    """
+    request_type = models.CharField(max_length=20, choices=REQUEST_TYPE_CHOICES)
+    priority = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        help_text="Only for requests of this priority (complaints and service requests). Empty for any priority."
+    )
+    category_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Only for requests in this complaint/inquiry category, service type or emergency type (ID). Empty for any."
+    )
+    hours = models.PositiveIntegerField(help_text="Hours from submission until the request is overdue.")
+
+    class Meta:
+        verbose_name = "SLA Policy"
+        verbose_name_plural = "SLA Policies"
+        ordering = ['request_type', 'priority', 'category_id']
+        constraints = [
+            models.UniqueConstraint(fields=['request_type', 'priority', 'category_id'], name='unique_sla_policy'),
+        ]
+
+    def __str__(self):
+        scope = ", ".join(part for part in (
+            self.priority,
+            f"category #{self.category_id}" if self.category_id else '',
+        ) if part)
+        return f"{self.get_request_type_display()}{f' ({scope})' if scope else ''}: {self.hours}h"
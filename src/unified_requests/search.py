@@ -0,0 +1,140 @@
+# unified_requests/search.py
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from .models import UnifiedRequestIndex
+
+# Name of the FTS5 table shadowing UnifiedRequestIndex.search_document on SQLite
+SQLITE_SEARCH_TABLE = 'unified_requests_search'
+# Name of the GIN expression index on PostgreSQL
+POSTGRES_SEARCH_INDEX = 'request_index_search_idx'
+# PostgreSQL text search configuration; 'simple' doesn't stem, so names, emails and codes match as typed
+POSTGRES_SEARCH_CONFIG = 'simple'
+SEARCH_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+_sqlite_search_available = {}
+
+
+def get_search_terms(query):
+    """
+    Splits a user query into plain word tokens; every operator character is dropped,
+    so user input can never break the MATCH / to_tsquery syntax.
+    """
+    return SEARCH_TERM_RE.findall(query.lower())[:20]
+
+
+# --- Schema (called from the migration, depending on the database vendor)
+def create_search_index(schema_editor):
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(UnifiedRequestIndex._meta.db_table)
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_SEARCH_INDEX} ON {table} "
+            f"USING GIN (to_tsvector('{POSTGRES_SEARCH_CONFIG}', search_document))"
+        )
+    elif connection.vendor == 'sqlite':
+        # External content table: the text lives in the index table only, the triggers keep FTS5 in sync
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} "
+            f"USING fts5(search_document, content={table}, content_rowid='id', tokenize='unicode61')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, search_document) "
+            f"VALUES ('delete', old.id, old.search_document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {SQLITE_SEARCH_TABLE}_au AFTER UPDATE OF search_document ON {table} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, search_document) "
+            f"VALUES ('delete', old.id, old.search_document); "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+        )
+        schema_editor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_SEARCH_INDEX}")
+    elif connection.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}")
+
+
+def has_sqlite_search_table(connection):
+    # FTS5 can be missing from the SQLite build, in which case the migration couldn't create the table
+    if connection.alias not in _sqlite_search_available:
+        _sqlite_search_available[connection.alias] = SQLITE_SEARCH_TABLE in connection.introspection.table_names()
+    return _sqlite_search_available[connection.alias]
+
+
+# --- Queries
+def search_request_index(query, queryset=None):
+    """
+    Full-text search over the request index. Returns the UnifiedRequestIndex queryset (all entries
+    by default) narrowed to the entries matching every word of the query, as a prefix, so results
+    narrow as the user types. The queryset is lazy and unbounded, to be used as a subquery, e.g.
+    pk__in=search_request_index(q).filter(request_type='complaint').values('request_id').
+    PostgreSQL matches the GIN-indexed tsvector, SQLite the FTS5 table;
+    other databases fall back to substring matching on the search document.
+    """
+    if queryset is None:
+        queryset = UnifiedRequestIndex.objects.all()
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return queryset.filter(RawSQL(
+            f"to_tsvector('{POSTGRES_SEARCH_CONFIG}', search_document) @@ to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)",
+            [tsquery], output_field=BooleanField(),
+        ))
+    if connection.vendor == 'sqlite' and has_sqlite_search_table(connection):
+        match = " ".join(f'"{term}"*' for term in terms)
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s", [match],
+        ))
+    for term in terms:
+        queryset = queryset.filter(search_document__icontains=term)
+    return queryset
+
+
+def rank_request_index(query, queryset=None):
+    """
+    Annotates the UnifiedRequestIndex queryset (all entries by default) with search_rank, the relevance of
+    each entry to the query (higher is better): ts_rank over the tsvector on PostgreSQL, the negated FTS5
+    bm25() on SQLite, 0 elsewhere. Meant to be narrowed to one request (e.g. request_id=OuterRef('pk'))
+    in a subquery, alongside search_request_index() for the filtering.
+    """
+    if queryset is None:
+        queryset = UnifiedRequestIndex.objects.all()
+    terms = get_search_terms(query)
+    connection = connections[queryset.db]
+    if terms and connection.vendor == 'postgresql':
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        rank = RawSQL(
+            f"ts_rank(to_tsvector('{POSTGRES_SEARCH_CONFIG}', search_document), "
+            f"to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s))",
+            [tsquery], output_field=FloatField(),
+        )
+    elif terms and connection.vendor == 'sqlite' and has_sqlite_search_table(connection):
+        match = " ".join(f'"{term}"*' for term in terms)
+        # Correlated on the index row's id; bm25() is lower for better matches
+        rank = RawSQL(
+            f"(SELECT -bm25({SQLITE_SEARCH_TABLE}) FROM {SQLITE_SEARCH_TABLE} "
+            f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND {SQLITE_SEARCH_TABLE}.rowid = id)",
+            [match], output_field=FloatField(),
+        )
+    else:
+        rank = Value(0.0, output_field=FloatField())
+    return queryset.annotate(search_rank=rank)
@@ -0,0 +1,113 @@
+# unified_requests/signals.py
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from complaints.models import Complaint, ComplaintCategory
+from services.models import ServiceRequest, ServiceType
+from inquiries.models import Inquiry, InquiryCategory
+from emergencies.models import EmergencyReport, EmergencyType
+
+from .archiving import is_archiving
+from .history import record_request_events
+from .indexing import INDEXED_REQUEST_MODELS, get_request_type_for_model, sync_request_index, remove_from_request_index
+from .models import SLAPolicy, UnifiedRequestIndex
+from .sla import compute_due_at, invalidate_sla_policies
+
+# Category model -> (request type slug, related_name of its requests)
+CATEGORY_MODELS = {
+    ComplaintCategory: ('complaint', 'complaints'),
+    ServiceType: ('service', 'service_requests'),
+    InquiryCategory: ('inquiry', 'inquiries'),
+    EmergencyType: ('emergency', 'emergency_reports'),
+}
+
+
+def get_sla_key(sender, instance):
+    # The fields an SLA policy is picked by; read from __dict__ like the loaded state, so deferred ones cost no query
+    _, category_field = INDEXED_REQUEST_MODELS[get_request_type_for_model(sender)]
+    return instance.__dict__.get('priority'), instance.__dict__.get(f'{category_field}_id')
+
+
+@receiver(post_init, sender=Complaint)
+@receiver(post_init, sender=ServiceRequest)
+@receiver(post_init, sender=Inquiry)
+@receiver(post_init, sender=EmergencyReport)
+def remember_loaded_state(sender, instance, **kwargs):
+    # What the stored row holds, to tell which RequestEvents a save produces
+    instance._history_loaded_status = instance.__dict__.get('status')
+    instance._history_loaded_assignee_id = instance.__dict__.get('assigned_to_id')
+    instance._sla_loaded_key = get_sla_key(sender, instance)
+
+
+@receiver(pre_save, sender=Complaint)
+@receiver(pre_save, sender=ServiceRequest)
+@receiver(pre_save, sender=Inquiry)
+@receiver(pre_save, sender=EmergencyReport)
+def set_request_due_at(sender, instance, raw=False, **kwargs):
+    # Set on creation and when the priority / category changes; the SLA policies are read from the cache.
+    # Other saves keep the due date, so policy edits only reach existing requests through recompute_sla_due_dates
+    if raw:
+        return
+    sla_key = get_sla_key(sender, instance)
+    if instance._state.adding or instance.__dict__.get('due_at') is None or sla_key != instance._sla_loaded_key:
+        instance.due_at = compute_due_at(get_request_type_for_model(sender), instance)
+    instance._sla_loaded_key = sla_key
+
+
+@receiver(post_save, sender=Complaint)
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_save, sender=Inquiry)
+@receiver(post_save, sender=EmergencyReport)
+def update_request_index_on_save(sender, instance, created=False, raw=False, **kwargs):
+    # Fixture loading (raw=True) is covered by the rebuild_request_index command instead
+    if raw:
+        return
+    request_type = get_request_type_for_model(sender)
+    sync_request_index(request_type, instance)
+
+    # Views set _event_actor on the request before saving it; new requests default to their submitter
+    actor = getattr(instance, '_event_actor', None)
+    actor_id = actor.pk if actor is not None else (instance.submitted_by_id if created else None)
+    record_request_events(
+        request_type, instance.pk,
+        instance._history_loaded_status, instance._history_loaded_assignee_id,
+        instance.status, instance.assigned_to_id,
+        created=created, actor_id=actor_id, occurred_at=instance.updated_at,
+    )
+    instance._history_loaded_status = instance.status
+    instance._history_loaded_assignee_id = instance.assigned_to_id
+
+
+@receiver(post_delete, sender=Complaint)
+@receiver(post_delete, sender=ServiceRequest)
+@receiver(post_delete, sender=Inquiry)
+@receiver(post_delete, sender=EmergencyReport)
+def update_request_index_on_delete(sender, instance, **kwargs):
+    # Archived rows are removed from the index in bulk by archive_request_chunk()
+    if is_archiving():
+        return
+    remove_from_request_index(get_request_type_for_model(sender), instance.pk)
+
+
+@receiver(post_save, sender=ComplaintCategory)
+@receiver(post_save, sender=ServiceType)
+@receiver(post_save, sender=InquiryCategory)
+@receiver(post_save, sender=EmergencyType)
+def update_request_index_category_name(sender, instance, created=False, raw=False, **kwargs):
+    # A renamed category is copied to every index row of the requests that use it
+    if created or raw:
+        return
+    request_type, related_name = CATEGORY_MODELS[sender]
+    UnifiedRequestIndex.objects.filter(
+        request_type=request_type,
+        request_id__in=getattr(instance, related_name).values('pk'),
+    ).update(category_name=instance.name)
+
+
+@receiver(post_save, sender=SLAPolicy)
+@receiver(post_delete, sender=SLAPolicy)
+def invalidate_sla_policies_on_change(sender, **kwargs):
+    # Existing requests keep their due_at until the recompute_sla_due_dates command is run.
+    # Dropped once committed, so a concurrent save can't cache the old policies again
+    transaction.on_commit(invalidate_sla_policies)
@@ -0,0 +1,95 @@
+# unified_requests/sla.py
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .constants import OPEN_STATUSES
+from .indexing import INDEXED_REQUEST_MODELS
+from .models import SLAPolicy
+
+SLA_POLICIES_CACHE_KEY = 'unified_requests:sla_policies'
+# Bounded, so processes that don't share the cache (the local memory default) pick up policy edits too
+SLA_POLICIES_CACHE_TIMEOUT = 300
+
+
+def get_sla_policies():
+    """
+    Returns {(request_type, priority, category_id): hours} for every SLA policy.
+    Read from the cache so computing a due date on save costs no query; SLAPolicy changes drop the entry
+    once committed, and other processes see them within SLA_POLICIES_CACHE_TIMEOUT seconds.
+    """
+    policies = cache.get(SLA_POLICIES_CACHE_KEY)
+    if policies is None:
+        policies = {
+            (request_type, priority, category_id): hours
+            for request_type, priority, category_id, hours
+            in SLAPolicy.objects.values_list('request_type', 'priority', 'category_id', 'hours')
+        }
+        cache.set(SLA_POLICIES_CACHE_KEY, policies, timeout=SLA_POLICIES_CACHE_TIMEOUT)
+    return policies
+
+
+def invalidate_sla_policies():
+    cache.delete(SLA_POLICIES_CACHE_KEY)
+
+
+def get_sla_hours(request_type, request_obj, policies=None):
+    """
+    Returns the hours allowed for a request: the policy for its priority and category, else its category,
+    else its priority, else its type, else REQUEST_SLA_DEFAULT_HOURS.
+    """
+    if policies is None:
+        policies = get_sla_policies()
+    _, category_field = INDEXED_REQUEST_MODELS[request_type]
+    priority = getattr(request_obj, 'priority', None) or ''
+    category_id = getattr(request_obj, f'{category_field}_id')
+    for key in (
+        (request_type, priority, category_id),
+        (request_type, '', category_id),
+        (request_type, priority, None),
+        (request_type, '', None),
+    ):
+        if key in policies:
+            return policies[key]
+    return getattr(settings, 'REQUEST_SLA_DEFAULT_HOURS', 48)
+
+
+def compute_due_at(request_type, request_obj, policies=None):
+    """
+    Returns when the request becomes overdue, counted from its submission (now for a request being created).
+    """
+    submitted_at = request_obj.submitted_at or timezone.now()
+    return submitted_at + datetime.timedelta(hours=get_sla_hours(request_type, request_obj, policies))
+
+
+def recompute_due_dates(request_types=None, open_only=True, batch_size=1000):
+    """
+    Recomputes due_at with the current SLA policies, e.g. after they were edited.
+    Only open requests by default. Returns a dict of request type -> number of updated rows.
+    """
+    policies = get_sla_policies()
+    counts = {}
+    for request_type, (model, category_field) in INDEXED_REQUEST_MODELS.items():
+        if request_types and request_type not in request_types:
+            continue
+        sla_fields = [category_field, *(['priority'] if hasattr(model, 'priority') else [])]
+        queryset = model.objects.order_by('pk').only('pk', 'submitted_at', 'due_at', *sla_fields)
+        if open_only:
+            queryset = queryset.filter(status__in=OPEN_STATUSES)
+
+        counts[request_type] = 0
+        batch = []
+        for request_obj in queryset.iterator(chunk_size=batch_size):
+            due_at = compute_due_at(request_type, request_obj, policies)
+            if due_at != request_obj.due_at:
+                request_obj.due_at = due_at
+                batch.append(request_obj)
+            if len(batch) >= batch_size:
+                counts[request_type] += model.objects.bulk_update(batch, ['due_at'])
+                batch = []
+        if batch:
+            counts[request_type] += model.objects.bulk_update(batch, ['due_at'])
+    return counts
+
@@ -0,0 +1,15 @@
+# unified_requests/tasks.py
+from celery import shared_task
+
+from .archiving import archive_requests
+
+
+@shared_task
+def archive_finished_requests():
+    """
+    Moves resolved, closed and rejected requests older than REQUEST_ARCHIVE_AFTER_DAYS into the archive
+    tables, in chunks. Schedule it (e.g. nightly) in the django-celery-beat admin panel.
+    """
+    counts = archive_requests()
+    print(f"Archived requests: {counts}")
+    return counts
@@ -1,3 +1,192 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from attachments.models import RequestAttachment
+from complaints.models import Complaint, ComplaintCategory
+
+from .archiving import archive_requests, get_archived_request_or_404
+from .history import get_request_timeline, get_resolution_metrics
+from .models import ArchivedRequest, RequestEvent, SLAPolicy, UnifiedRequestIndex
+from .sla import recompute_due_dates
+
+User = get_user_model()
+
+
+class RequestArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.submitter = User.objects.create_user(username='student', email='student@example.com', password='pw')
+        cls.old_closed = Complaint.objects.create(
+            subject='Broken chair', description='Room 101', status='closed', submitted_by=cls.submitter,
+        )
+        cls.old_open = Complaint.objects.create(subject='Noisy hallway', description='Floor 2')
+        cls.recent_resolved = Complaint.objects.create(subject='Leak', description='Lab 3', status='resolved')
+        RequestAttachment.objects.create(
+            content_type=ContentType.objects.get_for_model(Complaint),
+            object_id=cls.old_closed.pk,
+            file='attachments/chair.jpg',
+        )
+        cls.long_ago = timezone.now() - datetime.timedelta(days=400)
+        Complaint.objects.filter(pk__in=[cls.old_closed.pk, cls.old_open.pk]).update(updated_at=cls.long_ago)
+
+    def test_dry_run_only_counts(self):
+        self.assertEqual(archive_requests(older_than_days=365, dry_run=True)['complaint'], 1)
+        self.assertFalse(ArchivedRequest.objects.exists())
+
+    def test_moves_old_finished_requests_with_attachments(self):
+        counts = archive_requests(older_than_days=365, chunk_size=1)
+
+        self.assertEqual(counts['complaint'], 1)
+        self.assertFalse(Complaint.objects.filter(pk=self.old_closed.pk).exists())
+        self.assertTrue(Complaint.objects.filter(pk=self.old_open.pk).exists())
+        self.assertTrue(Complaint.objects.filter(pk=self.recent_resolved.pk).exists())
+        self.assertFalse(UnifiedRequestIndex.objects.filter(request_type='complaint', request_id=self.old_closed.pk).exists())
+        self.assertFalse(RequestAttachment.objects.filter(object_id=self.old_closed.pk).exists())
+
+        archived = ArchivedRequest.objects.get(request_type='complaint', request_id=self.old_closed.pk)
+        self.assertEqual(archived.attachments.get().file.name, 'attachments/chair.jpg')
+
+    def test_archived_request_is_rebuilt_for_its_submitter(self):
+        archive_requests(older_than_days=365)
+
+        request_obj = get_archived_request_or_404('complaint', self.old_closed.pk, submitted_by=self.submitter)
+        self.assertIsInstance(request_obj, Complaint)
+        self.assertTrue(request_obj.is_archived)
+        self.assertEqual(request_obj.pk, self.old_closed.pk)
+        self.assertEqual(request_obj.subject, 'Broken chair')
+        self.assertEqual(request_obj.submitted_at, self.old_closed.submitted_at)
+        self.assertEqual(request_obj.updated_at, self.long_ago)
+        self.assertEqual(request_obj.due_at, self.old_closed.due_at)
+
+        other_user = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        with self.assertRaises(Http404):
+            get_archived_request_or_404('complaint', self.old_closed.pk, submitted_by=other_user)
+
+    def test_archived_request_detail_pages(self):
+        archive_requests(older_than_days=365)
+        staff = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        pages = [
+            (self.submitter, reverse('user_dashboard:user_request_detail', kwargs={
+                'request_type_slug': 'complaint', 'pk': self.old_closed.pk,
+            })),
+            (staff, reverse('support_dashboard:request_detail', kwargs={
+                'request_type': 'complaint', 'pk': self.old_closed.pk,
+            })),
+        ]
+        for user, url in pages:
+            self.client.force_login(user)
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            request_obj = response.context['request_obj']
+            self.assertTrue(request_obj.is_archived)
+            self.assertEqual(request_obj.submitted_at, self.old_closed.submitted_at)
+            self.assertEqual(request_obj.updated_at, self.long_ago)
+
+
+class RequestEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='staff', email='staff@example.com', password='pw', is_staff=True)
+
+    def test_changes_are_appended_to_the_timeline(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        complaint.assigned_to = self.staff
+        complaint.status = 'in_progress'
+        complaint._event_actor = self.staff
+        complaint.save()
+        complaint.save() # Nothing changed, nothing recorded
+
+        events = list(get_request_timeline('complaint', complaint.pk))
+        self.assertEqual([event.event_type for event in events], ['created', 'status', 'assignment'])
+        self.assertEqual((events[1].from_status, events[1].to_status), ('new', 'in_progress'))
+        self.assertEqual(events[2].to_assignee, self.staff)
+        self.assertEqual(events[2].actor, self.staff)
+
+    def test_events_are_append_only(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        event = RequestEvent.objects.get(request_type='complaint', request_id=complaint.pk)
+        with self.assertRaises(ValueError):
+            event.save()
+
+    def test_resolution_metrics(self):
+        since = timezone.now()
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        for status in ('in_progress', 'resolved', 'in_progress', 'closed'):
+            complaint.status = status
+            complaint.save()
+        Complaint.objects.create(subject='Noisy hallway', description='Floor 2')
+
+        metrics = get_resolution_metrics(since)
+        self.assertEqual(metrics.created_count, 2)
+        self.assertEqual(metrics.responded_count, 1)
+        self.assertIsNotNone(metrics.average_first_response_seconds)
+        self.assertEqual(metrics.resolved_count, 1)
+        self.assertEqual(metrics.reopened_count, 1)
+        self.assertEqual(metrics.reopen_rate, 1.0)
+        self.assertEqual(set(metrics.average_seconds_in_status), {'new', 'in_progress', 'resolved'})
+
+
+@override_settings(REQUEST_SLA_DEFAULT_HOURS=48)
+class SLAPolicyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ComplaintCategory.objects.create(name='Facilities')
+
+    def setUp(self):
+        # The SLA policies are cached across tests otherwise
+        cache.clear()
+
+    def assertDueAfterHours(self, request_obj, hours):
+        # A new request's due date is computed just before submitted_at is set on insert
+        self.assertAlmostEqual(
+            request_obj.due_at - request_obj.submitted_at, datetime.timedelta(hours=hours),
+            delta=datetime.timedelta(seconds=1),
+        )
+
+    def test_default_hours_without_policy(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        self.assertDueAfterHours(complaint, 48)
+
+    def test_most_specific_policy_wins(self):
+        SLAPolicy.objects.create(request_type='complaint', hours=72)
+        SLAPolicy.objects.create(request_type='complaint', category_id=self.category.pk, hours=24)
+        SLAPolicy.objects.create(request_type='complaint', priority='high', category_id=self.category.pk, hours=4)
+
+        complaint = Complaint.objects.create(subject='Leak', description='Lab 3', category=self.category, priority='high')
+        self.assertDueAfterHours(complaint, 4)
+        complaint.priority = 'low'
+        complaint.save()
+        self.assertDueAfterHours(complaint, 24)
+        other = Complaint.objects.create(subject='Noisy hallway', description='Floor 2', priority='high')
+        self.assertDueAfterHours(other, 72)
+
+    def test_recompute_updates_open_requests(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        closed = Complaint.objects.create(subject='Leak', description='Lab 3', status='closed')
+        with self.captureOnCommitCallbacks(execute=True):
+            SLAPolicy.objects.create(request_type='complaint', hours=8)
+        complaint.status = 'in_progress'
+        complaint.save() # Other edits keep the due date
+        self.assertDueAfterHours(complaint, 48)
+
+        self.assertEqual(recompute_due_dates(request_types=['complaint'])['complaint'], 1)
+        complaint.refresh_from_db()
+        closed.refresh_from_db()
+        self.assertDueAfterHours(complaint, 8)
+        self.assertDueAfterHours(closed, 48)
+
+    def test_overdue_requests_are_a_due_at_range(self):
+        complaint = Complaint.objects.create(subject='Broken chair', description='Room 101')
+        Complaint.objects.filter(pk=complaint.pk).update(due_at=timezone.now() - datetime.timedelta(minutes=1))
+        Complaint.objects.create(subject='Leak', description='Lab 3')
+
+        overdue = Complaint.objects.filter(status__in=['new', 'in_progress'], due_at__lt=timezone.now())
+        self.assertEqual(list(overdue), [complaint])
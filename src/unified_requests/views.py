@@ -1,4 +1,6 @@
 # unified_requests/views.py
+from functools import partial
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import View, TemplateView 
 from django.contrib import messages
@@ -15,8 +17,11 @@ from emergencies.models import EmergencyReport
 # Forms
 from .forms import UnifiedRequestForm
 
-# Notification utility functions
-from notifications.utils import send_new_request_submission_notifications
+# Notification tasks, queued on commit
+from notifications.tasks import send_request_submission_notifications, send_request_assignment_notification
+
+# Least-loaded auto-assignment of new requests
+from support_dashboard.workload import choose_auto_assignee
 
 # For attachments
 from django.contrib.contenttypes.models import ContentType
@@ -76,6 +81,8 @@ class UnifiedRequestSubmitView(View):
                     # The redirect_url will now ALWAYS go to the success page
                     # The success page itself will handle showing user-specific links if logged in
                     redirect_url_args = {'pk':None, 'request_type': request_type} # Prepare args for redirect
+                    # Staff member with the lightest open workload, or None when auto-assignment is off
+                    auto_assignee_id = choose_auto_assignee(request_type)
 
                     # --- Request Object Creation ---
                     if request_type == 'complaint':
@@ -85,6 +92,7 @@ class UnifiedRequestSubmitView(View):
                             email=anonymous_email, # Populated if anonymous, None otherwise
                             phone_number=anonymous_phone,# Populated if anonymous, None otherwise
                             category=form.cleaned_data['complaint_category'],
+                            assigned_to_id=auto_assignee_id,
                             subject=form.cleaned_data['subject'],
                             description=form.cleaned_data['description'],
                         )
@@ -98,6 +106,7 @@ class UnifiedRequestSubmitView(View):
                             submitted_by=submitted_by_user,
                             full_name=anonymous_full_name, email=anonymous_email, phone_number=anonymous_phone,
                             service_type=form.cleaned_data['service_type'],
+                            assigned_to_id=auto_assignee_id,
                             subject=form.cleaned_data['subject'],
                             description=form.cleaned_data['description'],
                         )
@@ -108,6 +117,7 @@ class UnifiedRequestSubmitView(View):
                             submitted_by=submitted_by_user,
                             full_name=anonymous_full_name, email=anonymous_email, phone_number=anonymous_phone,
                             category=form.cleaned_data['inquiry_category'],
+                            assigned_to_id=auto_assignee_id,
                             subject=form.cleaned_data['subject'],
                             # question=form.cleaned_data['question'] # Uses the 'question' field
                             description=form.cleaned_data['description'],
@@ -121,6 +131,7 @@ class UnifiedRequestSubmitView(View):
                             email=anonymous_email, 
                             phone_number=anonymous_phone,
                             emergency_type=form.cleaned_data['emergency_type'],
+                            assigned_to_id=auto_assignee_id,
                             subject=form.cleaned_data['subject'],
                             description=form.cleaned_data['description'],
                             location=form.cleaned_data['location'],
@@ -147,8 +158,15 @@ class UnifiedRequestSubmitView(View):
                         else:
                             messages.success(request, success_message)
 
-                        # Call the generic notification function for initial submission
-                        send_new_request_submission_notifications(created_object)
+                        # The notification emails are sent by Celery once the request is committed,
+                        # so neither the response nor the open transaction waits on the mail server
+                        transaction.on_commit(partial(
+                            send_request_submission_notifications.delay, request_type, created_object.pk,
+                        ))
+                        if created_object.assigned_to_id:
+                            transaction.on_commit(partial(
+                                send_request_assignment_notification.delay, request_type, created_object.pk,
+                            ))
 
                         # Update redirect args with actual PK
                         redirect_url_args['pk'] = created_object.pk
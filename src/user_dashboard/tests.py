@@ -1,3 +1,23 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from complaints.models import Complaint
+
+User = get_user_model()
+
+
+class UserRequestListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.submitter = User.objects.create_user(username='student', email='student@example.com', password='pw')
+        cls.complaint = Complaint.objects.create(
+            subject='Broken chair', description='Wobbly leg in room 101', submitted_by=cls.submitter,
+        )
+        Complaint.objects.create(subject='Leak', description='Lab 3', submitted_by=cls.submitter)
+
+    def test_search_matches_the_description(self):
+        self.client.force_login(self.submitter)
+        response = self.client.get(reverse('user_dashboard:user_request_list'), {'q': 'wobbly'})
+
+        self.assertEqual([row['pk'] for row in response.context['page_obj'].object_list], [self.complaint.pk])
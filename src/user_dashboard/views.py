@@ -1,5 +1,5 @@
 # user_dashboard/views.py
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, redirect
 from django.http import Http404
 from django.contrib.auth.decorators import login_required 
 from django.core.paginator import Paginator 
@@ -19,99 +19,73 @@ from emergencies.models import EmergencyReport
 from django.contrib.contenttypes.models import ContentType
 from attachments.models import RequestAttachment # Import the RequestAttachment model
 
+# Cross-type request index and the archive of finished requests
+from unified_requests.models import UnifiedRequestIndex
+from unified_requests.archiving import get_archived_request_or_404
+
 # Import the ProfileUpdateForm
 from .forms import ProfileUpdateForm
 
+# User dashboard URLs use 'service_request' for service requests; the request index uses 'service'
+INDEX_TYPE_TO_USER_SLUG = {
+    'complaint': 'complaint',
+    'service': 'service_request',
+    'inquiry': 'inquiry',
+    'emergency': 'emergency',
+}
+USER_SLUG_TO_INDEX_TYPE = {user_slug: index_type for index_type, user_slug in INDEX_TYPE_TO_USER_SLUG.items()}
+
 @login_required
 def user_request_list(request):
     template_name = "user_dashboard/user_request_list.html"
     user = request.user
-    all_user_requests = []
-
-    # Query requests from each model submitted by the current user.
-    complaints = Complaint.objects.filter(submitted_by=user).select_related('category')
-    service_requests = ServiceRequest.objects.filter(submitted_by=user).select_related('service_type')
-    inquiries = Inquiry.objects.filter(submitted_by=user).select_related('category')
-    emergencies = EmergencyReport.objects.filter(submitted_by=user).select_related('emergency_type')
-
-    # Combine and standardize common fields for display
-    for req in complaints:
-        all_user_requests.append({
-            'pk': req.pk,
-            'request_type_slug': 'complaint',
-            'subject': req.subject,
-            'description': req.description, 
-            'status': req.status,
-            'submitted_at': req.submitted_at,
-            'display_type': 'Complaint',
-            'specific_field': req.category.name if hasattr(req, 'category') and req.category else 'N/A',
-            'full_object': req, # 
-        })
-
-    for req in service_requests:
-        all_user_requests.append({
-            'pk': req.pk,
-            'request_type_slug': 'service_request',
-            'subject': req.subject,
-            'description': req.description,
-            'status': req.status,
-            'submitted_at': req.submitted_at,
-            'display_type': 'Service Request',
-            'specific_field': req.service_type.name if hasattr(req, 'service_type') and req.service_type else 'N/A',
-            'full_object': req,
-        })
-    
-    for req in inquiries:
-        all_user_requests.append({
-            'pk': req.pk,
-            'request_type_slug': 'inquiry',
-            'subject': req.subject, # Or req.question, adjust as per your model
-            'description': req.description, # Or req.question
-            'status': req.status,
-            'submitted_at': req.submitted_at,
-            'display_type': 'Inquiry',
-            'specific_field': req.category.name if hasattr(req, 'category') and req.category else 'N/A',
-            'full_object': req,
-        })
-
-    for req in emergencies:
-        all_user_requests.append({
-            'pk': req.pk,
-            'request_type_slug': 'emergency',
-            'subject': req.subject,
-            'description': req.description,
-            'status': req.status,
-            'submitted_at': req.submitted_at,
-            'display_type': 'Emergency Report',
-            'specific_field': req.emergency_type.name if hasattr(req, 'emergency_type') and req.emergency_type else 'N/A',
-            'full_object': req,
-        })
-
-    # Sort the combined list by submitted date (newest first)
-    all_user_requests.sort(key=lambda x: x['submitted_at'], reverse=True)
+
+    # Query the cross-type request index: filtering, sorting and counting are one indexed query
+    queryset = UnifiedRequestIndex.objects.filter(submitted_by=user).order_by('-submitted_at', '-request_id')
 
     # --- Filtering and Seach ----
     status_filter = request.GET.get('status')
     if status_filter and status_filter != 'all':
-        all_user_requests = [req for req in all_user_requests if req['status'] == status_filter]
-    
+        queryset = queryset.filter(status=status_filter)
+
     type_filter = request.GET.get('type')
     if type_filter and type_filter != 'all':
-        all_user_requests = [req for req in all_user_requests if req['request_type_slug'] == type_filter]
-    
+        queryset = queryset.filter(request_type=USER_SLUG_TO_INDEX_TYPE.get(type_filter, type_filter))
+
     search_query = request.GET.get('q')
     if search_query:
-        search_query_lower = search_query.lower()
-        all_user_requests = [
-            req for req in all_user_requests
-            if search_query_lower in req['subject'].lower() or search_query_lower in req['description'].lower() or search_query_lower in req['display_type'.lower()]
-        ]
+        # The search document holds the subject, description and resolution notes of the request
+        search_conditions = (
+            Q(subject__icontains=search_query)
+            | Q(category_name__icontains=search_query)
+            | Q(search_document__icontains=search_query)
+        )
+        # Keep matching on the displayed type name (e.g. "emergency")
+        for index_type, display_type in UnifiedRequestIndex._meta.get_field('request_type').choices:
+            if search_query.lower() in display_type.lower():
+                search_conditions |= Q(request_type=index_type)
+        queryset = queryset.filter(search_conditions)
 
     # --- Pagination ---
-    paginator = Paginator(all_user_requests, 10) # Show 10 requests per page
+    paginator = Paginator(queryset, 10) # Show 10 requests per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
+    # Standardize common fields for display (only for the rows on this page)
+    page_obj.object_list = [
+        {
+            'pk': entry.request_id,
+            'request_type_slug': INDEX_TYPE_TO_USER_SLUG[entry.request_type],
+            'subject': entry.subject,
+            'status': entry.status,
+            'status_display': entry.get_status_display(),
+            'submitted_at': entry.submitted_at,
+            'display_type': entry.get_request_type_display(),
+            'specific_field': entry.category_name or 'N/A',
+        }
+        for entry in page_obj.object_list
+    ]
+
     context = {
         'page_obj': page_obj,
         'status_filter': status_filter,
@@ -146,11 +120,17 @@ def user_request_detail(request, request_type_slug, pk):
 
     # Get specific object, ensuring it belongs to the current user
     # This also acts as a security check
-    request_obj = get_object_or_404(model, pk=pk, submitted_by=user)
+    try:
+        request_obj = model.objects.get(pk=pk, submitted_by=user)
+    except model.DoesNotExist:
+        # Finished requests moved to the archive tables are still shown to their submitter
+        request_obj = get_archived_request_or_404(USER_SLUG_TO_INDEX_TYPE[request_type_slug], pk, submitted_by=user)
 
     # --- Fetch Attachments for this request ---
     attachments = []
-    if request_obj:
+    if getattr(request_obj, 'is_archived', False):
+        attachments = request_obj.archived_attachments
+    elif request_obj:
         content_type = ContentType.objects.get_for_model(request_obj.__class__)
         attachments = RequestAttachment.objects.filter(
             content_type=content_type,